@@ -69,7 +69,8 @@ Usage:
 Note:
 - All file operations are restricted to configured directories
 - System uses GPT-4o for both user and assistant roles
-- Supports asynchronous operations for efficient processing
+- Supports asynchronous operations for efficient processing, including
+  document extraction
 """
 
 import asyncio
@@ -85,6 +86,7 @@ from camel.types import ModelPlatformType, ModelType
 from camel.logger import set_log_level
 from camel.toolkits import MCPToolkit
 
+from owl.utils import DocumentProcessingToolkit
 from owl.utils.enhanced_role_playing import OwlRolePlaying, arun_society
 
 import pathlib
@@ -104,7 +106,8 @@ async def construct_society(
 
     Args:
         question (str): The question to ask.
-        tools (List[FunctionTool]): The MCP tools to use.
+        tools (List[FunctionTool]): The MCP tools to use, besides the
+            document processing tools.
     """
     models = {
         "user": ModelFactory.create(
@@ -117,8 +120,20 @@ async def construct_society(
             model_type=ModelType.GPT_4O,
             model_config_dict={"temperature": 0},
         ),
+        "document": ModelFactory.create(
+            model_platform=ModelPlatformType.OPENAI,
+            model_type=ModelType.GPT_4O,
+            model_config_dict={"temperature": 0},
+        ),
     }
 
+    # The async document tools run on the event loop of the society, so
+    # extractions of several tool calls overlap with the MCP calls
+    tools = [
+        *tools,
+        *DocumentProcessingToolkit(model=models["document"]).get_async_tools(),
+    ]
+
     user_agent_kwargs = {"model": models["user"]}
     assistant_agent_kwargs = {
         "model": models["assistant"],
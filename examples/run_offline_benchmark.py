@@ -0,0 +1,100 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+import argparse
+import json
+
+from camel.toolkits import FunctionTool
+from camel.logger import set_log_level
+
+from owl.utils import OwlRolePlaying, ScriptedModelBackend, benchmark_society
+
+set_log_level(level="WARNING")
+
+
+def lookup(query: str) -> str:
+    r"""Look up a query in the offline knowledge base.
+
+    Args:
+        query (str): The query to look up.
+
+    Returns:
+        str: The matching entry.
+    """
+    return f"Entry for {query}: " + "lorem ipsum " * 50
+
+
+def construct_society(rounds: int, latency: float) -> OwlRolePlaying:
+    r"""Construct a society that runs `rounds` rounds on scripted models,
+    with two parallel tool calls per round.
+
+    Args:
+        rounds (int): The number of rounds before the user says `TASK_DONE`.
+        latency (float): The simulated latency of every model call.
+
+    Returns:
+        OwlRolePlaying: A society that runs without network access.
+    """
+    user_script = [
+        f"Instruction: look up item {i}.\nInput: None" for i in range(rounds - 1)
+    ] + ["TASK_DONE"]
+    assistant_script = [
+        {
+            "content": "",
+            "tool_calls": [
+                {"name": "lookup", "arguments": {"query": "first item"}},
+                {"name": "lookup", "arguments": {"query": "second item"}},
+            ],
+        },
+        "Solution: both items were found.\nNext request.",
+    ]
+    # The assistant calls the tools and answers in every round
+    assistant_script = assistant_script * rounds
+
+    models = {
+        "user": ScriptedModelBackend(script=user_script, latency=latency),
+        "assistant": ScriptedModelBackend(script=assistant_script, latency=latency),
+    }
+
+    return OwlRolePlaying(
+        task_prompt="Look up the requested items in the knowledge base.",
+        with_task_specify=False,
+        user_role_name="user",
+        user_agent_kwargs={"model": models["user"]},
+        assistant_role_name="assistant",
+        assistant_agent_kwargs={
+            "model": models["assistant"],
+            "tools": [FunctionTool(lookup)],
+        },
+    )
+
+
+def main():
+    r"""Benchmark the orchestration overhead of a society without API keys."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    summary = benchmark_society(
+        lambda: construct_society(args.rounds, args.latency),
+        round_limit=args.rounds,
+        repeat=args.repeat,
+    )
+    summary.pop("runs")
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
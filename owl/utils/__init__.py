@@ -13,21 +13,104 @@
 # ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
 
 from .common import extract_pattern
+from .enhanced_chat_agent import OwlChatAgent, SocietyTimeoutError
 from .enhanced_role_playing import (
     OwlRolePlaying,
     OwlGAIARolePlaying,
     run_society,
     arun_society,
+    iter_society,
+    aiter_society,
+    resume_society,
+    aresume_society,
+)
+from .budget import SocietyBudget, MODEL_PRICES
+from .rate_limit import RateLimiter, set_rate_limit, get_rate_limiter
+from .token_accounting import TokenAccounting
+from .tracing import (
+    Tracer,
+    Span,
+    SpanSink,
+    InMemorySink,
+    JSONLSink,
+    ChromeTraceSink,
+)
+from .checkpoint import SocietyCheckpoint, save_checkpoint, load_checkpoint
+from .model_cache import CachedModelBackend, ResponseCache
+from .scripted_model import ScriptedModelBackend, replay_model
+from .society_benchmark import benchmark_society, run_society_benchmark
+from .society_events import (
+    SocietyEvent,
+    TokenDeltaEvent,
+    UserMessageEvent,
+    AssistantMessageEvent,
+    ToolCallEvent,
+    RoundEndEvent,
+    SocietyEndEvent,
 )
 from .gaia import GAIABenchmark
+from .gaia_dataset import GAIADataset
+from .gaia_scoring import question_scorer, rescore_file
+from .ensemble import EnsembleResult, arun_ensemble, run_ensemble
+from .result_store import ResultStore
+from .document_index import BM25Index
+from .extraction_cache import DocumentHandle, ExtractionCache
+from .benchmark_report import performance_report, diff_reports, write_report
 from .document_toolkit import DocumentProcessingToolkit
 
 __all__ = [
     "extract_pattern",
+    "OwlChatAgent",
+    "SocietyTimeoutError",
     "OwlRolePlaying",
     "OwlGAIARolePlaying",
     "run_society",
     "arun_society",
+    "iter_society",
+    "aiter_society",
+    "resume_society",
+    "aresume_society",
+    "SocietyBudget",
+    "MODEL_PRICES",
+    "RateLimiter",
+    "set_rate_limit",
+    "get_rate_limiter",
+    "TokenAccounting",
+    "Tracer",
+    "Span",
+    "SpanSink",
+    "InMemorySink",
+    "JSONLSink",
+    "ChromeTraceSink",
+    "SocietyCheckpoint",
+    "save_checkpoint",
+    "load_checkpoint",
+    "CachedModelBackend",
+    "ResponseCache",
+    "ScriptedModelBackend",
+    "replay_model",
+    "benchmark_society",
+    "run_society_benchmark",
+    "SocietyEvent",
+    "TokenDeltaEvent",
+    "UserMessageEvent",
+    "AssistantMessageEvent",
+    "ToolCallEvent",
+    "RoundEndEvent",
+    "SocietyEndEvent",
     "GAIABenchmark",
+    "GAIADataset",
+    "question_scorer",
+    "rescore_file",
+    "EnsembleResult",
+    "arun_ensemble",
+    "run_ensemble",
+    "ResultStore",
+    "ExtractionCache",
+    "DocumentHandle",
+    "BM25Index",
+    "performance_report",
+    "diff_reports",
+    "write_report",
     "DocumentProcessingToolkit",
 ]
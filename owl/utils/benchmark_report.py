@@ -0,0 +1,296 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+r"""Performance reports of benchmark results.
+
+Usage::
+
+    python -m owl.utils.benchmark_report report results.jsonl -o report.csv
+    python -m owl.utils.benchmark_report diff old.jsonl new.jsonl --threshold 0.1
+"""
+
+import argparse
+import csv
+import json
+import math
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from camel.logger import get_logger
+
+from .result_store import load_results
+
+logger = get_logger(__name__)
+
+# The per-task metrics summarized by their distribution
+DISTRIBUTION_METRICS = (
+    "wall_seconds",
+    "rounds",
+    "prompt_tokens",
+    "completion_tokens",
+    "tool_calls",
+    "queue_seconds",
+)
+
+# How a task ended, see `task_metrics`
+OUTCOMES = ("correct", "incorrect", "no_answer", "timeout", "skipped", "failed")
+
+_DIFF_COLUMNS = ("base", "new", "delta", "change")
+
+
+def percentile(values: List[float], q: float) -> float:
+    r"""Return the `q`-th percentile (0-100) of `values`, interpolated
+    linearly between the closest ranks."""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    rank = (len(values) - 1) * q / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+def distribution(values: List[float]) -> Dict[str, float]:
+    r"""Summarize `values` by their count, total, mean, p50, p90, p99 and
+    maximum."""
+    return {
+        "count": len(values),
+        "total": sum(values),
+        "mean": sum(values) / len(values) if values else 0.0,
+        "p50": percentile(values, 50),
+        "p90": percentile(values, 90),
+        "p99": percentile(values, 99),
+        "max": max(values) if values else 0.0,
+    }
+
+
+def task_metrics(result: Dict[str, Any]) -> Dict[str, Any]:
+    r"""Return the performance numbers of one task result. Numbers a result
+    does not record (e.g. of a skipped task) are `None`."""
+    status = result.get("status", "completed")
+    if status in ("skipped", "timeout", "failed"):
+        outcome = status
+    elif result.get("model_answer") is None:
+        outcome = "no_answer"
+    else:
+        outcome = "correct" if result.get("score") else "incorrect"
+
+    token_info = result.get("token_info") or {}
+    usage = token_info.get("usage") or {}
+    history = result.get("history")
+    rounds: Optional[int] = None
+    if history is not None:
+        rounds = len(history)
+    elif "rounds" in usage:
+        rounds = len(usage["rounds"])
+
+    tools: Dict[str, Dict[str, float]] = {}
+    if "tools" in usage:
+        tools = {name: dict(entry) for name, entry in usage["tools"].items()}
+    elif history:
+        # Results saved before tool time was recorded only name their tools
+        for entry in history:
+            for tool_call in entry.get("tool_calls") or []:
+                tool = tools.setdefault(
+                    tool_call.get("tool_name", "unknown"), {"calls": 0, "seconds": 0.0}
+                )
+                tool["calls"] += 1
+    tool_calls = token_info.get("tool_call_count")
+    if tool_calls is None and tools:
+        tool_calls = sum(entry["calls"] for entry in tools.values())
+
+    return {
+        "task_id": result.get("task_id"),
+        "level": result.get("level"),
+        "outcome": outcome,
+        "stop_reason": token_info.get("stop_reason"),
+        "wall_seconds": result.get("duration"),
+        "rounds": rounds,
+        "prompt_tokens": token_info.get("prompt_token_count"),
+        "completion_tokens": token_info.get("completion_token_count"),
+        "tool_calls": tool_calls,
+        "queue_seconds": (usage.get("total") or {}).get("queue_seconds"),
+        "tools": tools,
+    }
+
+
+def _group_report(metrics: List[Dict[str, Any]]) -> Dict[str, Any]:
+    outcomes = dict.fromkeys(OUTCOMES, 0)
+    stop_reasons: Dict[str, int] = {}
+    tools: Dict[str, Dict[str, float]] = {}
+    for task in metrics:
+        outcomes[task["outcome"]] += 1
+        if task["stop_reason"] is not None:
+            stop_reasons[task["stop_reason"]] = (
+                stop_reasons.get(task["stop_reason"], 0) + 1
+            )
+        for name, entry in task["tools"].items():
+            tool = tools.setdefault(name, {"calls": 0, "seconds": 0.0})
+            tool["calls"] += entry.get("calls", 0)
+            tool["seconds"] += entry.get("seconds", 0.0)
+
+    report: Dict[str, Any] = {
+        "tasks": len(metrics),
+        "accuracy": outcomes["correct"] / len(metrics) if metrics else 0.0,
+        "outcomes": outcomes,
+        "stop_reasons": stop_reasons,
+    }
+    for key in DISTRIBUTION_METRICS:
+        report[key] = distribution(
+            [task[key] for task in metrics if task[key] is not None]
+        )
+    report["tools"] = dict(sorted(tools.items()))
+    return report
+
+
+def performance_report(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    r"""Summarize the performance of benchmark results overall and per
+    level.
+
+    Args:
+        results (List[Dict[str, Any]]): The results, as saved by
+            :meth:`GAIABenchmark.run`.
+
+    Returns:
+        Dict[str, Any]: The report with the keys `overall` and `levels`.
+            Each holds the number of tasks, the accuracy, the counts of
+            outcomes and stop reasons, the distributions of
+            :obj:`DISTRIBUTION_METRICS` and the calls and seconds per tool.
+    """
+    metrics = [task_metrics(result) for result in results]
+    levels: Dict[str, List[Dict[str, Any]]] = {}
+    for task in metrics:
+        levels.setdefault(str(task["level"]), []).append(task)
+    return {
+        "overall": _group_report(metrics),
+        "levels": {
+            level: _group_report(tasks) for level, tasks in sorted(levels.items())
+        },
+    }
+
+
+def flatten_report(report: Dict[str, Any]) -> Dict[str, float]:
+    r"""Flatten a report to `{"overall.wall_seconds.p50": ..., ...}`."""
+    flat: Dict[str, float] = {}
+
+    def _flatten(prefix: str, value: Any) -> None:
+        if isinstance(value, dict):
+            for key, item in value.items():
+                _flatten(f"{prefix}.{key}" if prefix else str(key), item)
+        else:
+            flat[prefix] = value
+
+    _flatten("", report)
+    return flat
+
+
+def diff_reports(
+    base: Dict[str, Any], new: Dict[str, Any]
+) -> Dict[str, Dict[str, Optional[float]]]:
+    r"""Compare two reports metric by metric.
+
+    Returns:
+        Dict[str, Dict[str, Optional[float]]]: The `base` and `new` value,
+            the `delta` and the relative `change` of every flattened
+            metric. Metrics missing from one report count as `0`, the
+            change from `0` is `None`.
+    """
+    base_flat, new_flat = flatten_report(base), flatten_report(new)
+    diff = {}
+    for metric in sorted(set(base_flat) | set(new_flat)):
+        old_value = base_flat.get(metric) or 0
+        new_value = new_flat.get(metric) or 0
+        delta = new_value - old_value
+        diff[metric] = {
+            "base": old_value,
+            "new": new_value,
+            "delta": delta,
+            "change": delta / old_value if old_value else None,
+        }
+    return diff
+
+
+def write_report(report: Dict[str, Any], path: Union[str, Path]) -> None:
+    r"""Write a report, or a diff of reports, as JSON or (by the `.csv`
+    suffix) as CSV with one metric per row."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix != ".csv":
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+        return
+
+    # A diff holds one dict of columns per metric
+    is_diff = all(
+        isinstance(columns, dict) and set(columns) == set(_DIFF_COLUMNS)
+        for columns in report.values()
+    )
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        if is_diff:
+            writer.writerow(["metric", *_DIFF_COLUMNS])
+            for metric, columns in report.items():
+                writer.writerow([metric] + [columns[key] for key in _DIFF_COLUMNS])
+        else:
+            writer.writerow(["metric", "value"])
+            writer.writerows(flatten_report(report).items())
+
+
+def main():
+    r"""Report the performance of benchmark results or compare two runs."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    report_parser = subparsers.add_parser(
+        "report", help="Summarize the performance of a result file."
+    )
+    report_parser.add_argument("results")
+    report_parser.add_argument(
+        "-o", "--output", help="A .json or .csv file, printed if omitted."
+    )
+    diff_parser = subparsers.add_parser(
+        "diff", help="Compare the performance of two result files."
+    )
+    diff_parser.add_argument("base")
+    diff_parser.add_argument("new")
+    diff_parser.add_argument(
+        "-o", "--output", help="A .json or .csv file, printed if omitted."
+    )
+    diff_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.0,
+        help="Only keep metrics whose relative change is at least this large.",
+    )
+    args = parser.parse_args()
+
+    if args.command == "report":
+        output = performance_report(load_results(args.results))
+    else:
+        output = diff_reports(
+            performance_report(load_results(args.base)),
+            performance_report(load_results(args.new)),
+        )
+        output = {
+            metric: columns
+            for metric, columns in output.items()
+            if columns["delta"]
+            and (columns["change"] is None or abs(columns["change"]) >= args.threshold)
+        }
+
+    if args.output:
+        write_report(output, args.output)
+    else:
+        print(json.dumps(output, indent=4, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
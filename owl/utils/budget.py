@@ -0,0 +1,122 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from camel.logger import get_logger
+
+logger = get_logger(__name__)
+
+# USD per million (prompt, completion) tokens. Model names not listed here are
+# matched by their longest listed prefix, e.g. `gpt-4o-2024-08-06` by `gpt-4o`.
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4o": (2.5, 10.0),
+    "gpt-4o-mini": (0.15, 0.6),
+    "gpt-4.1": (2.0, 8.0),
+    "gpt-4.1-mini": (0.4, 1.6),
+    "o1": (15.0, 60.0),
+    "o3-mini": (1.1, 4.4),
+    "claude-3-7-sonnet": (3.0, 15.0),
+    "claude-3-5-sonnet": (3.0, 15.0),
+    "deepseek-chat": (0.27, 1.1),
+    "deepseek-reasoner": (0.55, 2.19),
+    "gemini-2.0-flash": (0.1, 0.4),
+}
+
+# The stop reasons reported in `token_info["stop_reason"]` when a budget is
+# exhausted.
+PROMPT_TOKEN_BUDGET = "prompt_token_budget"
+COMPLETION_TOKEN_BUDGET = "completion_token_budget"
+TIME_BUDGET = "time_budget"
+COST_BUDGET = "cost_budget"
+
+
+def new_spend() -> Dict[str, float]:
+    r"""Return an empty spend record, as reported in `token_info["spend"]`."""
+    return {"prompt_tokens": 0, "completion_tokens": 0, "seconds": 0.0, "cost": 0.0}
+
+
+@dataclass
+class SocietyBudget:
+    r"""Limits on what a society run may spend.
+
+    The budgets are checked before every round. Once one is exhausted the
+    assistant is asked for its final answer in one last turn and the run
+    stops, so a round may overrun a budget but the run ends with an answer.
+
+    Args:
+        max_prompt_tokens (int, optional): The maximum number of prompt
+            tokens. (default: :obj:`None`)
+        max_completion_tokens (int, optional): The maximum number of
+            completion tokens. (default: :obj:`None`)
+        max_seconds (float, optional): The maximum wall-clock seconds spent
+            in rounds. (default: :obj:`None`)
+        max_cost (float, optional): The maximum cost in USD, computed from
+            `prices`. (default: :obj:`None`)
+        prices (Dict[str, Tuple[float, float]], optional): USD per million
+            prompt and completion tokens by model name, added to (and
+            overriding) :obj:`MODEL_PRICES`. (default: :obj:`None`)
+    """
+
+    max_prompt_tokens: Optional[int] = None
+    max_completion_tokens: Optional[int] = None
+    max_seconds: Optional[float] = None
+    max_cost: Optional[float] = None
+    prices: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._unpriced_models = set()
+
+    def price(self, model: str) -> Optional[Tuple[float, float]]:
+        r"""Return the (prompt, completion) price of a model, `None` if it
+        is unknown."""
+        prices = {**MODEL_PRICES, **self.prices}
+        if model in prices:
+            return prices[model]
+        prefixes = [name for name in prices if model.startswith(name)]
+        if not prefixes:
+            return None
+        return prices[max(prefixes, key=len)]
+
+    def cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        r"""Return the cost in USD of the given tokens of a model."""
+        price = self.price(model)
+        if price is None:
+            if self.max_cost is not None and model not in self._unpriced_models:
+                self._unpriced_models.add(model)
+                logger.warning(
+                    f"No price known for model {model}, its tokens are not "
+                    "counted against the cost budget."
+                )
+            return 0.0
+        return (prompt_tokens * price[0] + completion_tokens * price[1]) / 1e6
+
+    def exceeded(self, spend: Dict[str, float]) -> Optional[str]:
+        r"""Return the stop reason of the first exhausted budget, or `None`."""
+        if (
+            self.max_prompt_tokens is not None
+            and spend["prompt_tokens"] >= self.max_prompt_tokens
+        ):
+            return PROMPT_TOKEN_BUDGET
+        if (
+            self.max_completion_tokens is not None
+            and spend["completion_tokens"] >= self.max_completion_tokens
+        ):
+            return COMPLETION_TOKEN_BUDGET
+        if self.max_seconds is not None and spend["seconds"] >= self.max_seconds:
+            return TIME_BUDGET
+        if self.max_cost is not None and spend["cost"] >= self.max_cost:
+            return COST_BUDGET
+        return None
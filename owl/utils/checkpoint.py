@@ -0,0 +1,253 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import base64
+import io
+import json
+import os
+import sqlite3
+import time
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from camel.agents import ChatAgent
+from camel.memories import MemoryRecord
+from camel.messages import BaseMessage
+from camel.storages.key_value_storages.json import CamelJSONEncoder
+from camel.logger import get_logger
+from PIL import Image
+from pydantic import BaseModel
+
+logger = get_logger(__name__)
+
+# Checkpoints written to files with these suffixes go to SQLite, everything
+# else is written as a single JSON document.
+SQLITE_SUFFIXES = {".db", ".sqlite", ".sqlite3"}
+
+
+class _CheckpointJSONEncoder(CamelJSONEncoder):
+    r"""Encodes camel enums like :obj:`JsonStorage` does and falls back to
+    `str` for values that are not JSON serializable (e.g. tool results)."""
+
+    def default(self, obj) -> Any:
+        try:
+            return super().default(obj)
+        except TypeError:
+            return str(obj)
+
+
+def _json_object_hook(d: Dict[str, Any]) -> Any:
+    if "__enum__" in d:
+        name, member = d["__enum__"].split(".")
+        return getattr(CamelJSONEncoder.CAMEL_ENUMS[name], member)
+    return d
+
+
+def _dump_image(image: Image.Image) -> Dict[str, str]:
+    buffer = io.BytesIO()
+    image.save(buffer, format=image.format or "PNG")
+    return {
+        "format": image.format or "PNG",
+        "data": base64.b64encode(buffer.getvalue()).decode(),
+    }
+
+
+def _load_image(data: Dict[str, str]) -> Image.Image:
+    image = Image.open(io.BytesIO(base64.b64decode(data["data"])))
+    image.load()
+    return image
+
+
+def _dump_message(message: BaseMessage) -> Dict[str, Any]:
+    r"""Serialize every field of a message (or of a subclass such as
+    :obj:`FunctionCallingMessage`), encoding images and videos as base64."""
+    data = {f.name: getattr(message, f.name) for f in fields(message)}
+    if message.image_list:
+        data["image_list"] = [_dump_image(image) for image in message.image_list]
+    if message.video_bytes is not None:
+        data["video_bytes"] = base64.b64encode(message.video_bytes).decode()
+    # A parsed response is restored as the dict of its fields
+    if isinstance(message.parsed, BaseModel):
+        data["parsed"] = message.parsed.model_dump()
+    elif not isinstance(message.parsed, dict):
+        data["parsed"] = None
+    return data
+
+
+def _load_message_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+    data = dict(data)
+    if data.get("image_list"):
+        data["image_list"] = [_load_image(image) for image in data["image_list"]]
+    if data.get("video_bytes") is not None:
+        data["video_bytes"] = base64.b64decode(data["video_bytes"])
+    return data
+
+
+def _dump_memory(agent: ChatAgent) -> List[Dict[str, Any]]:
+    records = []
+    for context_record in agent.memory.retrieve():
+        record = context_record.memory_record
+        records.append(
+            {
+                **record.to_dict(),
+                "message": {
+                    "__class__": type(record.message).__name__,
+                    **_dump_message(record.message),
+                },
+            }
+        )
+    return records
+
+
+def _load_memory(agent: ChatAgent, records: List[Dict[str, Any]]) -> None:
+    agent.memory.clear()
+    agent.memory.write_records(
+        [
+            MemoryRecord.from_dict(
+                {**record, "message": _load_message_fields(record["message"])}
+            )
+            for record in records
+        ]
+    )
+
+
+@dataclass
+class SocietyCheckpoint:
+    r"""The state of a society run after a finished round.
+
+    Args:
+        next_round (int): The index of the round to run next.
+        round_limit (int): The round limit of the run.
+        chat_history (List[dict]): The chat history so far.
+        token_counters (Dict[str, Any]): The token counters so far.
+        next_input (Dict[str, Any], optional): The message passed to the
+            next `step`, `None` if the run has finished.
+        user_memory (List[Dict[str, Any]]): The memory records of the user
+            agent.
+        assistant_memory (List[Dict[str, Any]]): The memory records of the
+            assistant agent.
+        finished (bool): Whether the run has terminated.
+        task_prompt (str): The task of the society, used to detect resuming
+            into a different task.
+        saved_prompt_token_count (int): The prompt tokens the compact prompt
+            layout saved so far.
+        saved_tokens_in_history (Dict[str, int]): The tokens the compact
+            suffixes save on every later call of each agent.
+    """
+
+    next_round: int
+    round_limit: int
+    chat_history: List[dict]
+    token_counters: Dict[str, Any]
+    next_input: Optional[Dict[str, Any]]
+    user_memory: List[Dict[str, Any]] = field(default_factory=list)
+    assistant_memory: List[Dict[str, Any]] = field(default_factory=list)
+    finished: bool = False
+    task_prompt: str = ""
+    saved_prompt_token_count: int = 0
+    saved_tokens_in_history: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def capture(
+        cls,
+        society,
+        next_round: int,
+        round_limit: int,
+        chat_history: List[dict],
+        token_counters: Dict[str, Any],
+        next_input: Optional[BaseMessage],
+        finished: bool = False,
+    ) -> "SocietyCheckpoint":
+        r"""Snapshot the state of `society` after a round."""
+        return cls(
+            next_round=next_round,
+            round_limit=round_limit,
+            chat_history=list(chat_history),
+            token_counters=dict(token_counters),
+            next_input=_dump_message(next_input) if next_input is not None else None,
+            user_memory=_dump_memory(society.user_agent),
+            assistant_memory=_dump_memory(society.assistant_agent),
+            finished=finished,
+            task_prompt=society.task_prompt,
+            saved_prompt_token_count=society.saved_prompt_token_count,
+            saved_tokens_in_history=dict(society._saved_tokens_in_history),
+        )
+
+    def restore(self, society) -> Optional[BaseMessage]:
+        r"""Load the agent memories into `society` and return the message to
+        continue with."""
+        if self.task_prompt and self.task_prompt != society.task_prompt:
+            logger.warning(
+                "Resuming a checkpoint whose task differs from the society's task."
+            )
+        _load_memory(society.user_agent, self.user_memory)
+        _load_memory(society.assistant_agent, self.assistant_memory)
+        society.saved_prompt_token_count = self.saved_prompt_token_count
+        society._saved_tokens_in_history = {
+            "user": 0,
+            "assistant": 0,
+            **self.saved_tokens_in_history,
+        }
+        if self.next_input is None:
+            return None
+        return BaseMessage(**_load_message_fields(self.next_input))
+
+
+def save_checkpoint(checkpoint: SocietyCheckpoint, path: Union[str, Path]) -> None:
+    r"""Write a checkpoint to a JSON file (replaced atomically) or append it
+    to a SQLite database, depending on the suffix of `path`."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = json.dumps(
+        asdict(checkpoint), cls=_CheckpointJSONEncoder, ensure_ascii=False
+    )
+
+    if path.suffix in SQLITE_SUFFIXES:
+        with sqlite3.connect(path) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS society_checkpoints ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, next_round INTEGER, "
+                "created_at REAL, data TEXT)"
+            )
+            conn.execute(
+                "INSERT INTO society_checkpoints (next_round, created_at, data) "
+                "VALUES (?, ?, ?)",
+                (checkpoint.next_round, time.time(), data),
+            )
+        conn.close()
+    else:
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    logger.debug(f"Saved checkpoint of round {checkpoint.next_round - 1} to {path}")
+
+
+def load_checkpoint(path: Union[str, Path]) -> SocietyCheckpoint:
+    r"""Load the latest checkpoint written by :func:`save_checkpoint`."""
+    path = Path(path)
+    if path.suffix in SQLITE_SUFFIXES:
+        with sqlite3.connect(path) as conn:
+            row = conn.execute(
+                "SELECT data FROM society_checkpoints ORDER BY id DESC LIMIT 1"
+            ).fetchone()
+        conn.close()
+        if row is None:
+            raise ValueError(f"No checkpoint found in {path}")
+        data = row[0]
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = f.read()
+    return SocietyCheckpoint(**json.loads(data, object_hook=_json_object_hook))
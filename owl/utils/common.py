@@ -16,16 +16,21 @@ import sys
 sys.path.append("../")
 
 import re
+from functools import lru_cache
 from typing import Optional
 from camel.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _tag_regex(pattern: str) -> "re.Pattern[str]":
+    return re.compile(rf"<{pattern}>(.*?)</{pattern}>", re.DOTALL)
+
+
 def extract_pattern(content: str, pattern: str) -> Optional[str]:
     try:
-        _pattern = rf"<{pattern}>(.*?)</{pattern}>"
-        match = re.search(_pattern, content, re.DOTALL)
+        match = _tag_regex(pattern).search(content)
         if match:
             text = match.group(1)
             return text.strip()
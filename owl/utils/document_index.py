@@ -0,0 +1,179 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import json
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from camel.logger import get_logger
+
+from .extraction_cache import DocumentHandle
+
+logger = get_logger(__name__)
+
+# Bump when the passages or the tokenization change, to rebuild indexes
+INDEX_VERSION = "1"
+
+_TOKEN = re.compile(r"\w+")
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+
+
+def tokenize(text: str) -> List[str]:
+    r"""Split a text into lowercase words and numbers."""
+    return _TOKEN.findall(text.lower())
+
+
+def _passages(
+    content: str, boundaries: List[int], passage_chars: int
+) -> List[Tuple[int, int]]:
+    r"""Split `content` into passages `(start, stop)` of about
+    `passage_chars` characters. Passages never cross a boundary (a page or
+    section start) and end at paragraph breaks where possible."""
+    passages: List[Tuple[int, int]] = []
+    edges = sorted({0, *boundaries, len(content)})
+    for section_start, section_stop in zip(edges, edges[1:]):
+        start = section_start
+        while start < section_stop:
+            stop = min(start + passage_chars, section_stop)
+            if stop < section_stop:
+                # End at the last paragraph break of the passage, or at the
+                # last whitespace, rather than within a word
+                breaks = list(_PARAGRAPH_BREAK.finditer(content, start, stop))
+                if breaks and breaks[-1].end() > start + passage_chars // 2:
+                    stop = breaks[-1].end()
+                else:
+                    space = content.rfind(" ", start + passage_chars // 2, stop)
+                    if space > 0:
+                        stop = space + 1
+            if content[start:stop].strip():
+                passages.append((start, stop))
+            start = stop
+    return passages
+
+
+class BM25Index:
+    r"""An inverted index over the passages of one extracted document,
+    ranking passages by BM25.
+
+    Args:
+        passages (List[Tuple[int, int]]): The character range of every
+            passage.
+        postings (Dict[str, List[Tuple[int, int]]]): For every term, the
+            passages containing it and its frequency in each.
+        lengths (List[int]): The number of terms of every passage.
+        passage_chars (int): The target length the passages were cut to.
+        k1 (float, optional): The term frequency saturation.
+            (default: :obj:`1.5`)
+        b (float, optional): The passage length normalization.
+            (default: :obj:`0.75`)
+    """
+
+    def __init__(
+        self,
+        passages: List[Tuple[int, int]],
+        postings: Dict[str, List[Tuple[int, int]]],
+        lengths: List[int],
+        passage_chars: int,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ):
+        self.passages = passages
+        self.postings = postings
+        self.lengths = lengths
+        self.passage_chars = passage_chars
+        self.k1 = k1
+        self.b = b
+        self._average_length = sum(lengths) / len(lengths) if lengths else 0.0
+
+    @classmethod
+    def build(cls, handle: DocumentHandle, passage_chars: int = 1000) -> "BM25Index":
+        r"""Index a document, split into passages within its pages and
+        outline sections.
+
+        Args:
+            handle (DocumentHandle): The document.
+            passage_chars (int, optional): The target length of a passage.
+                (default: :obj:`1000`)
+        """
+        content = handle.read()
+        boundaries = handle.page_chars + [entry["char"] for entry in handle.outline]
+        passages = _passages(content, boundaries, passage_chars)
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        lengths = []
+        for i, (start, stop) in enumerate(passages):
+            terms = Counter(tokenize(content[start:stop]))
+            lengths.append(sum(terms.values()))
+            for term, count in terms.items():
+                postings.setdefault(term, []).append((i, count))
+        return cls(passages, postings, lengths, passage_chars)
+
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[int, float]]:
+        r"""Return the `(passage index, score)` of the `top_k` passages
+        best matching `query`, best first. Passages sharing no term with
+        the query are never returned."""
+        num_passages = len(self.passages)
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(
+                1 + (num_passages - len(postings) + 0.5) / (len(postings) + 0.5)
+            )
+            for i, count in postings:
+                norm = 1 - self.b + self.b * self.lengths[i] / self._average_length
+                scores[i] = scores.get(i, 0.0) + idf * count * (self.k1 + 1) / (
+                    count + self.k1 * norm
+                )
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:top_k]
+
+    def dumps(self) -> str:
+        r"""Serialize the index to JSON."""
+        return json.dumps(
+            {
+                "version": INDEX_VERSION,
+                "passage_chars": self.passage_chars,
+                "passages": self.passages,
+                "lengths": self.lengths,
+                "postings": self.postings,
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def loads(
+        cls, data: str, passage_chars: Optional[int] = None
+    ) -> Optional["BM25Index"]:
+        r"""Deserialize an index, `None` if it is corrupt, of an older
+        version or was cut to another passage length."""
+        try:
+            state: Dict[str, Any] = json.loads(data)
+        except json.JSONDecodeError:
+            return None
+        if state.get("version") != INDEX_VERSION or (
+            passage_chars is not None and state["passage_chars"] != passage_chars
+        ):
+            return None
+        return cls(
+            [tuple(passage) for passage in state["passages"]],
+            {
+                term: [tuple(posting) for posting in postings]
+                for term, postings in state["postings"].items()
+            },
+            state["lengths"],
+            state["passage_chars"],
+        )
@@ -15,34 +15,396 @@
 from camel.toolkits.base import BaseToolkit
 from camel.toolkits.function_tool import FunctionTool
 from camel.toolkits import ImageAnalysisToolkit, ExcelToolkit
-from camel.utils import retry_on_error
 from camel.logger import get_logger
 from camel.models import BaseModelBackend
 from docx2markdown._docx_to_markdown import docx_to_markdown
-from chunkr_ai import Chunkr
-import requests
+import httpx
 import mimetypes
 import json
-from typing import List, Optional, Tuple, Literal
+import asyncio
+import base64
+import functools
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Literal,
+    TypeVar,
+)
 from urllib.parse import urlparse
 import os
+import re
 import subprocess
 import xmltodict
-import nest_asyncio
 
-nest_asyncio.apply()
+from .document_index import BM25Index
+from .extraction_cache import DocumentHandle, ExtractionCache
+from .token_accounting import model_name
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
+# Bump when the extraction changes, to invalidate cached extractions
+EXTRACTOR_VERSION = "2"
+
+# Extracting these has side effects the cache cannot replay, e.g. unzipping
+_UNCACHED_EXTENSIONS = ("zip",)
+
+# Images are extracted by captioning them with the model of the toolkit
+_IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+# PDFs with fewer pages are extracted in-process, a pool does not pay off
+_PDF_PARALLEL_MIN_PAGES = 16
+
+# Separates the pages of an extracted PDF
+PDF_PAGE_SEPARATOR = "\n\n"
+
+_MARKDOWN_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$", re.MULTILINE)
+
+# The most outline entries listed by `get_document_outline`
+_MAX_OUTLINE_ENTRIES = 200
+
+# The search indexes kept in memory, on top of the ones persisted in the
+# extraction cache
+_MAX_LOADED_INDEXES = 16
+
+
+class _PagedText(str):
+    r"""Extracted text that remembers the character offset of every page
+    and the outline of its document."""
+
+    page_chars: List[int]
+    outline: List[Dict[str, Any]]
+
+
+def _join_pages(
+    pages: List[str], outline: Optional[List[Dict[str, Any]]] = None
+) -> _PagedText:
+    r"""Join the pages of a document, keeping their offsets. Outline
+    entries given with their 0-based `page` get the character offset of
+    that page."""
+    text = _PagedText(PDF_PAGE_SEPARATOR.join(pages))
+    text.page_chars = []
+    position = 0
+    for page in pages:
+        text.page_chars.append(position)
+        position += len(page) + len(PDF_PAGE_SEPARATOR)
+    text.outline = [
+        {
+            "title": entry["title"],
+            "level": entry["level"],
+            "char": text.page_chars[min(entry["page"], len(pages) - 1)],
+        }
+        for entry in outline or []
+        if pages
+    ]
+    return text
+
+
+def _pdf_outline(path: str) -> List[Dict[str, Any]]:
+    r"""Return the bookmarks of a PDF with their `title`, `level` and
+    0-based `page`, empty if it has none or they cannot be read."""
+    from PyPDF2 import PdfReader
+
+    outline: List[Dict[str, Any]] = []
+
+    def _walk(items: List[Any], level: int) -> None:
+        for item in items:
+            if isinstance(item, list):
+                _walk(item, level + 1)
+                continue
+            try:
+                page = reader.get_destination_page_number(item)
+            except Exception:
+                continue
+            if page is not None and page >= 0:
+                outline.append({"title": item.title, "level": level, "page": page})
+
+    try:
+        reader = PdfReader(path)
+        _walk(reader.outline, 1)
+    except Exception as e:
+        logger.debug(f"Cannot read the outline of {path}: {e}")
+    return outline
+
+
+def _markdown_outline(text: str) -> List[Dict[str, Any]]:
+    r"""Return the markdown headings of a text, e.g. of a converted docx
+    file or webpage."""
+    return [
+        {"title": match.group(2), "level": len(match.group(1)), "char": match.start()}
+        for match in _MARKDOWN_HEADING.finditer(text)
+    ]
+
+
+def _parse_range(value: str) -> Tuple[int, Optional[int]]:
+    r"""Parse a range such as `"3-5"`, `"7"` or `"10-"`.
+
+    Raises:
+        ValueError: If the range is malformed.
+    """
+    start, sep, stop = value.strip().partition("-")
+    try:
+        first = int(start)
+        if not sep:
+            return first, first
+        return first, int(stop) if stop.strip() else None
+    except ValueError:
+        raise ValueError(
+            f"Invalid range: {value!r}, expected e.g. '3-5', '7' or '10-'."
+        )
+
+
+# An httpx client is bound to the event loop it was first used on, so every
+# loop gets its own, shared by all toolkits running on it
+_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+# Seconds between two status requests of a Chunkr task, and the seconds a
+# task may take before it is given up
+_CHUNKR_POLL_INTERVAL = 1.0
+_CHUNKR_MAX_WAIT = 600.0
+
+
+def get_http_client() -> httpx.AsyncClient:
+    r"""Return the HTTP client of the running event loop, which pools the
+    connections to Chunkr, Firecrawl and download hosts."""
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(timeout=_HTTP_TIMEOUT, follow_redirects=True)
+        _http_clients[loop] = client
+    return client
+
+
+async def aclose_http_client() -> None:
+    r"""Close the HTTP client of the running event loop, if any."""
+    client = _http_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+# The number of async runs using the HTTP client of each event loop
+_http_client_users: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, int]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+@asynccontextmanager
+async def http_client_scope() -> AsyncIterator[None]:
+    r"""Close the HTTP client of the running event loop when the last of
+    the runs sharing it on the loop, e.g. the societies of an ensemble,
+    exits its scope."""
+    loop = asyncio.get_running_loop()
+    _http_client_users[loop] = _http_client_users.get(loop, 0) + 1
+    try:
+        yield
+    finally:
+        _http_client_users[loop] -= 1
+        if not _http_client_users[loop]:
+            del _http_client_users[loop]
+            await aclose_http_client()
+
+
+def _run_sync(coro: Awaitable[T]) -> T:
+    r"""Run a coroutine of the toolkit from synchronous code. Called from
+    within a running event loop, e.g. as a synchronous tool of an async
+    society, it runs on a new loop in a helper thread instead of blocking
+    or patching the running one."""
+
+    async def _main() -> T:
+        try:
+            return await coro
+        finally:
+            await aclose_http_client()
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_main())
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, _main()).result()
+
+
+def _aretry_on_error(
+    max_retries: int = 3, initial_delay: float = 1.0
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    r"""Asynchronous version of :func:`camel.utils.retry_on_error`, which
+    waits without blocking the event loop."""
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs) -> T:
+            delay = initial_delay
+            for attempt in range(max_retries + 1):
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    if attempt == max_retries:
+                        logger.error(f"Failed after {max_retries} retries: {e!s}")
+                        raise
+                    logger.warning(
+                        f"Attempt {attempt + 1} failed: {e!s}. "
+                        f"Retrying in {delay:.1f}s..."
+                    )
+                    await asyncio.sleep(delay)
+                    delay *= 2
+            raise AssertionError("unreachable")
+
+        return wrapper
+
+    return decorator
+
+
+def _async_tool(method: Callable[..., Awaitable[Any]]) -> FunctionTool:
+    r"""Return a tool of an async toolkit method. :obj:`BaseToolkit` wraps
+    every method in a synchronous timeout wrapper, which hides from
+    :obj:`FunctionTool` that the method must be awaited."""
+
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        return await method(*args, **kwargs)
+
+    return FunctionTool(wrapper)
+
+
+def _chunkr_upload_data(document_path: str) -> Dict[str, Any]:
+    r"""Return the body of a Chunkr parse task of a local file or URL."""
+    if document_path.startswith(("http://", "https://")):
+        return {"file": document_path}
+    with open(document_path, "rb") as f:
+        content = base64.b64encode(f.read()).decode()
+    return {"file": content, "file_name": os.path.basename(document_path)}
+
+
+def _chunkr_markdown(task: Dict[str, Any]) -> str:
+    r"""Join the markdown of all segments of a finished Chunkr task."""
+    output = task.get("output") or {}
+    return "\n\n".join(
+        segment["markdown"]
+        for chunk in output.get("chunks") or []
+        for segment in chunk.get("segments") or []
+        if segment.get("markdown")
+    )
+
+
+def _extract_pdf_page_range(path: str, start: int, stop: int) -> List[str]:
+    r"""Extract the text of pages `[start, stop)`. Runs in worker
+    processes, which parse the PDF themselves."""
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def iter_pdf_pages(
+    path: str, max_workers: Optional[int] = None, pages_per_task: int = 8
+) -> Iterator[Tuple[int, str]]:
+    r"""Extract the text of a PDF locally, page batches in parallel across a
+    process pool, yielding `(page index, text)` as the batches finish, so
+    not in page order.
+
+    Args:
+        path (str): The local path of the PDF.
+        max_workers (int, optional): The number of worker processes.
+            (default: :obj:`None`, the number of CPUs)
+        pages_per_task (int, optional): The pages extracted by one task.
+            (default: :obj:`8`)
+    """
+    from PyPDF2 import PdfReader
+
+    num_pages = len(PdfReader(path).pages)
+    if num_pages < _PDF_PARALLEL_MIN_PAGES or max_workers == 1:
+        for i, text in enumerate(_extract_pdf_page_range(path, 0, num_pages)):
+            yield i, text
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(
+                _extract_pdf_page_range,
+                path,
+                start,
+                min(start + pages_per_task, num_pages),
+            ): start
+            for start in range(0, num_pages, pages_per_task)
+        }
+        for future in as_completed(futures):
+            for offset, text in enumerate(future.result()):
+                yield futures[future] + offset, text
+
+
+def extract_pdf_text(path: str, max_workers: Optional[int] = None) -> List[str]:
+    r"""Return the text of every page of a PDF, in page order, see
+    :func:`iter_pdf_pages`."""
+    pages: List[str] = []
+    for i, text in iter_pdf_pages(path, max_workers):
+        pages.extend([""] * (i + 1 - len(pages)))
+        pages[i] = text
+    return pages
+
 
 class DocumentProcessingToolkit(BaseToolkit):
     r"""A class representing a toolkit for processing document and return the content of the document.
 
     This class provides method for processing docx, pdf, pptx, etc. It cannot process excel files.
+
+    Successful extractions are cached in `<cache_dir>/extractions`, keyed by
+    the hash of the file, or by URL and ETag/Last-Modified for remote
+    documents, so repeated extractions cost no external API calls.
+
+    Every tool is async-native, with a synchronous wrapper of the same name
+    without the `a` prefix. Network requests go through one pooled HTTP
+    client per event loop, see :func:`get_http_client`.
+
+    Args:
+        cache_dir (str, optional): The directory for downloads, unzipped
+            files and the extraction cache. (default: :obj:`None`, `tmp/`)
+        model (BaseModelBackend, optional): The model describing images.
+            (default: :obj:`None`)
+        use_cache (bool, optional): Whether to cache extractions.
+            (default: :obj:`True`)
+        cache_max_bytes (int, optional): The size limit of the extraction
+            cache, the least recently used extractions are removed beyond
+            it. (default: :obj:`None`, unlimited)
+        local_pdf (bool, optional): Whether to extract the text of PDFs
+            locally, without uploading them to Chunkr, which is then only
+            used for PDFs without a text layer (e.g. scans).
+            (default: :obj:`True`)
+        pdf_workers (int, optional): The number of processes extracting PDF
+            pages. (default: :obj:`None`, the number of CPUs)
+        max_content_chars (int, optional): The most characters
+            :meth:`extract_document_content` returns for a whole document.
+            Longer documents are cut with a note to read them by range.
+            (default: :obj:`None`, unlimited)
+        search_passage_chars (int, optional): The length of the passages
+            :meth:`search_document` ranks. (default: :obj:`1000`)
     """
 
     def __init__(
-        self, cache_dir: Optional[str] = None, model: Optional[BaseModelBackend] = None
+        self,
+        cache_dir: Optional[str] = None,
+        model: Optional[BaseModelBackend] = None,
+        use_cache: bool = True,
+        cache_max_bytes: Optional[int] = None,
+        local_pdf: bool = True,
+        pdf_workers: Optional[int] = None,
+        max_content_chars: Optional[int] = None,
+        search_passage_chars: int = 1000,
     ):
         self.image_tool = ImageAnalysisToolkit(model=model)
         # self.audio_tool = AudioAnalysisToolkit()
@@ -52,26 +414,351 @@ class DocumentProcessingToolkit(BaseToolkit):
         if cache_dir:
             self.cache_dir = cache_dir
 
-    @retry_on_error()
-    def extract_document_content(self, document_path: str) -> Tuple[bool, str]:
+        self.local_pdf = local_pdf
+        self.pdf_workers = pdf_workers
+        self.max_content_chars = max_content_chars
+        self.search_passage_chars = search_passage_chars
+        self._indexes: "OrderedDict[str, BM25Index]" = OrderedDict()
+        self._indexes_lock = threading.Lock()
+
+        self.extraction_cache: Optional[ExtractionCache] = None
+        if use_cache:
+            self.extraction_cache = ExtractionCache(
+                os.path.join(self.cache_dir, "extractions"),
+                max_bytes=cache_max_bytes,
+                version=EXTRACTOR_VERSION,
+            )
+
+    def extract_document_content(
+        self,
+        document_path: str,
+        page_range: Optional[str] = None,
+        char_range: Optional[str] = None,
+    ) -> Tuple[bool, str]:
         r"""Extract the content of a given document (or url) and return the processed text.
         It may filter out some information, resulting in inaccurate content.
+        For long documents, call `get_document_outline` first and read only the relevant pages.
 
         Args:
             document_path (str): The path of the document to be processed, either a local path or a URL. It can process image, audio files, zip files and webpages, etc.
+            page_range (str, optional): The pages to return, 1-based and inclusive, e.g. "3-5", "7" or "10-". Documents without pages of their own are split into pages of 4000 characters. (default: :obj:`None`, the whole document)
+            char_range (str, optional): The characters to return, 0-based with the end excluded, e.g. "0-5000". Ignored if `page_range` is given. (default: :obj:`None`, the whole document)
 
         Returns:
             Tuple[bool, str]: A tuple containing a boolean indicating whether the document was processed successfully, and the content of the document (if success).
         """
-        import asyncio
+        return _run_sync(
+            self.aextract_document_content(document_path, page_range, char_range)
+        )
+
+    @_aretry_on_error()
+    async def aextract_document_content(
+        self,
+        document_path: str,
+        page_range: Optional[str] = None,
+        char_range: Optional[str] = None,
+    ) -> Tuple[bool, str]:
+        r"""Extract the content of a given document (or url) and return the processed text.
+        It may filter out some information, resulting in inaccurate content.
+        For long documents, call `aget_document_outline` first and read only the relevant pages.
+
+        Args:
+            document_path (str): The path of the document to be processed, either a local path or a URL. It can process image, audio files, zip files and webpages, etc.
+            page_range (str, optional): The pages to return, 1-based and inclusive, e.g. "3-5", "7" or "10-". Documents without pages of their own are split into pages of 4000 characters. (default: :obj:`None`, the whole document)
+            char_range (str, optional): The characters to return, 0-based with the end excluded, e.g. "0-5000". Ignored if `page_range` is given. (default: :obj:`None`, the whole document)
+
+        Returns:
+            Tuple[bool, str]: A tuple containing a boolean indicating whether the document was processed successfully, and the content of the document (if success).
+        """
+        return await self._awith_document(
+            document_path,
+            lambda handle: self._read_document(handle, page_range, char_range),
+        )
+
+    def _read_document(
+        self,
+        handle: DocumentHandle,
+        page_range: Optional[str],
+        char_range: Optional[str],
+    ) -> Tuple[bool, str]:
+        try:
+            if page_range is not None:
+                first, last = _parse_range(page_range)
+                last = handle.num_pages if last is None else min(last, handle.num_pages)
+                if not 1 <= first <= last:
+                    return False, (
+                        f"Invalid page range: {page_range!r}, the document has "
+                        f"{handle.num_pages} pages."
+                    )
+                content = handle.read_pages(first - 1, last)
+                pages = f"Page {first}" if first == last else f"Pages {first}-{last}"
+                return True, f"[{pages} of {handle.num_pages}]\n{content}"
+            if char_range is not None:
+                start, stop = _parse_range(char_range)
+                stop = handle.num_chars if stop is None else min(stop, handle.num_chars)
+                if not 0 <= start < stop:
+                    return False, (
+                        f"Invalid character range: {char_range!r}, the document "
+                        f"has {handle.num_chars} characters."
+                    )
+                content = handle.read_chars(start, stop)
+                return True, (
+                    f"[Characters {start}-{stop} of {handle.num_chars}]\n{content}"
+                )
+        except ValueError as e:
+            return False, str(e)
+
+        if (
+            self.max_content_chars is not None
+            and handle.num_chars > self.max_content_chars
+        ):
+            content = handle.read_chars(0, self.max_content_chars)
+            return True, (
+                f"{content}\n\n[Truncated after {self.max_content_chars} of "
+                f"{handle.num_chars} characters ({handle.num_pages} pages). Call "
+                f"`get_document_outline` and read the rest with `page_range` or "
+                f"`char_range`.]"
+            )
+        return True, handle.read()
+
+    def get_document_outline(self, document_path: str) -> Tuple[bool, str]:
+        r"""Get the size and the outline (headings or bookmarks, with their page numbers) of a document (or url), to read only the relevant pages of a long document with `extract_document_content`.
+
+        Args:
+            document_path (str): The path of the document, either a local path or a URL.
+
+        Returns:
+            Tuple[bool, str]: A tuple containing a boolean indicating whether the document was processed successfully, and the outline of the document (if success).
+        """
+        return _run_sync(self.aget_document_outline(document_path))
+
+    async def aget_document_outline(self, document_path: str) -> Tuple[bool, str]:
+        r"""Get the size and the outline (headings or bookmarks, with their page numbers) of a document (or url), to read only the relevant pages of a long document with `aextract_document_content`.
+
+        Args:
+            document_path (str): The path of the document, either a local path or a URL.
+
+        Returns:
+            Tuple[bool, str]: A tuple containing a boolean indicating whether the document was processed successfully, and the outline of the document (if success).
+        """
+        return await self._awith_document(
+            document_path, lambda handle: self._document_outline(document_path, handle)
+        )
+
+    def _document_outline(
+        self, document_path: str, handle: DocumentHandle
+    ) -> Tuple[bool, str]:
+        unit = "pages" if handle.paged else "pages of 4000 characters"
+        lines = [
+            f"{document_path}: {handle.num_pages} {unit}, "
+            f"{handle.num_chars} characters."
+        ]
+        if handle.outline:
+            lines.append("Outline:")
+            for entry in handle.outline[:_MAX_OUTLINE_ENTRIES]:
+                indent = "  " * (entry["level"] - 1)
+                page = handle.page_of(entry["char"]) + 1
+                lines.append(f"{indent}- {entry['title']} (page {page})")
+        else:
+            lines.append("No headings found. The first line of every page:")
+            for i in range(min(handle.num_pages, _MAX_OUTLINE_ENTRIES)):
+                first_line = next(
+                    (
+                        line.strip()
+                        for line in handle.read_pages(i, i + 1).splitlines()
+                        if line.strip()
+                    ),
+                    "",
+                )
+                lines.append(f"- page {i + 1}: {first_line[:100]}")
+        if len(handle.outline or range(handle.num_pages)) > _MAX_OUTLINE_ENTRIES:
+            lines.append(f"... (first {_MAX_OUTLINE_ENTRIES} entries shown)")
+        return True, "\n".join(lines)
+
+    def search_document(
+        self, document_path: str, query: str, top_k: int = 5
+    ) -> Tuple[bool, str]:
+        r"""Search a document (or url) for the passages most relevant to a keyword query, ranked by BM25, with their page numbers. Much cheaper than reading a long document as a whole; read around a hit with `extract_document_content` and `page_range`.
+
+        Args:
+            document_path (str): The path of the document, either a local path or a URL.
+            query (str): The keywords to search for, e.g. "net revenue 2023".
+            top_k (int, optional): The number of passages to return. (default: :obj:`5`)
+
+        Returns:
+            Tuple[bool, str]: A tuple containing a boolean indicating whether the document was searched successfully, and the ranked passages (if success).
+        """
+        return _run_sync(self.asearch_document(document_path, query, top_k))
+
+    async def asearch_document(
+        self, document_path: str, query: str, top_k: int = 5
+    ) -> Tuple[bool, str]:
+        r"""Search a document (or url) for the passages most relevant to a keyword query, ranked by BM25, with their page numbers. Much cheaper than reading a long document as a whole; read around a hit with `aextract_document_content` and `page_range`.
 
+        Args:
+            document_path (str): The path of the document, either a local path or a URL.
+            query (str): The keywords to search for, e.g. "net revenue 2023".
+            top_k (int, optional): The number of passages to return. (default: :obj:`5`)
+
+        Returns:
+            Tuple[bool, str]: A tuple containing a boolean indicating whether the document was searched successfully, and the ranked passages (if success).
+        """
+        return await self._awith_document(
+            document_path,
+            lambda handle: self._search_document(document_path, handle, query, top_k),
+        )
+
+    def _search_document(
+        self, document_path: str, handle: DocumentHandle, query: str, top_k: int
+    ) -> Tuple[bool, str]:
+        index = self._search_index(handle)
+        hits = index.search(query, top_k)
+        if not hits:
+            return True, f"No passage of {document_path} matches {query!r}."
+        lines = [f"The {len(hits)} best passages of {document_path} for {query!r}:"]
+        for rank, (i, score) in enumerate(hits, 1):
+            start, stop = index.passages[i]
+            lines.append(
+                f"\n[{rank}] page {handle.page_of(start) + 1}, characters "
+                f"{start}-{stop}, score {score:.2f}:\n"
+                f"{handle.read_chars(start, stop).strip()}"
+            )
+        return True, "\n".join(lines)
+
+    def _search_index(self, handle: DocumentHandle) -> BM25Index:
+        r"""Return the search index of a document from memory or the
+        extraction cache, building and persisting it on a miss."""
+        key = handle.key
+        if key is None:
+            return BM25Index.build(handle, self.search_passage_chars)
+        with self._indexes_lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                self._indexes.move_to_end(key)
+                return index
+
+        data = self.extraction_cache.get_index(key)
+        if data is not None:
+            index = BM25Index.loads(data, self.search_passage_chars)
+        if index is None:
+            index = BM25Index.build(handle, self.search_passage_chars)
+            self.extraction_cache.put_index(key, index.dumps())
+        with self._indexes_lock:
+            self._indexes[key] = index
+            if len(self._indexes) > _MAX_LOADED_INDEXES:
+                self._indexes.popitem(last=False)
+        return index
+
+    async def _awith_document(
+        self, document_path: str, read: Callable[[DocumentHandle], Tuple[bool, str]]
+    ) -> Tuple[bool, str]:
+        r"""Open a document and return `read(handle)`, run in a worker thread
+        since it reads (and may index) the extraction. An extraction the
+        cache evicts while it is read is extracted again."""
+        handle, error = await self._aopen_document(document_path)
+        if handle is None:
+            return False, error
+        try:
+            return await asyncio.to_thread(read, handle)
+        except OSError as e:
+            logger.info(
+                f"The cached extraction of {document_path} is gone, "
+                f"extracting it again: {e}"
+            )
+        handle, error = await self._aopen_document(document_path, use_cache=False)
+        if handle is None:
+            return False, error
+        return await asyncio.to_thread(read, handle)
+
+    async def _aopen_document(
+        self, document_path: str, use_cache: bool = True
+    ) -> Tuple[Optional[DocumentHandle], str]:
+        r"""Return a :obj:`DocumentHandle` of the cached extraction of a
+        document, extracting it on a miss (or if `use_cache` is `False`),
+        or `None` and the error message. Fresh extractions are returned in
+        memory."""
+        key, head = await self._acache_key(document_path)
+        if key is not None and use_cache:
+            handle = self.extraction_cache.open(key)
+            if handle is not None:
+                logger.debug(f"Using the cached extraction of {document_path}")
+                return handle, ""
+
+        success, content = await self._aextract_document_content(document_path, head)
+        if not success:
+            return None, content
+        page_chars = getattr(content, "page_chars", None)
+        outline = getattr(content, "outline", None)
+        if not isinstance(content, str):
+            content = json.dumps(content, ensure_ascii=False, default=str)
+        content = str(content)
+        if outline is None and not document_path.endswith(".py"):
+            # Comments of Python files would pass for headings
+            outline = _markdown_outline(content)
+        if key is not None:
+            await asyncio.to_thread(
+                self.extraction_cache.put,
+                key,
+                content,
+                page_chars=page_chars,
+                outline=outline,
+                source=document_path,
+            )
+        return DocumentHandle.from_text(content, page_chars, outline, key), ""
+
+    async def _acache_key(
+        self, document_path: str
+    ) -> Tuple[Optional[str], Optional[httpx.Response]]:
+        r"""Return the extraction cache key of a document, `None` if it is
+        not cached, and the response to the HEAD request its key was taken
+        from, if any, to be reused when the document is extracted."""
+        if self.extraction_cache is None or document_path.endswith(
+            _UNCACHED_EXTENSIONS
+        ):
+            return None, None
+        parsed_url = urlparse(document_path)
+        if not all([parsed_url.scheme, parsed_url.netloc]):
+            if not os.path.isfile(document_path):
+                return None, None
+            key = await asyncio.to_thread(
+                self.extraction_cache.key,
+                document_path,
+                self.cache_variant(document_path),
+            )
+            return key, None
+        try:
+            response = await get_http_client().head(document_path, timeout=10)
+        except httpx.HTTPError as e:
+            logger.debug(f"Not caching {document_path}: {e}")
+            return None, None
+        key = self.extraction_cache.url_key(
+            document_path,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+            self.cache_variant(document_path),
+        )
+        return key, response
+
+    def cache_variant(self, document_path: str) -> str:
+        r"""Return what the extraction of a document depends on besides its
+        content, to be part of its cache key: the captioning model for
+        images, nothing for other documents."""
+        if document_path.endswith(_IMAGE_EXTENSIONS):
+            return model_name(self.image_tool.model.model_type)
+        return ""
+
+    async def _aextract_document_content(
+        self, document_path: str, head: Optional[httpx.Response] = None
+    ) -> Tuple[bool, str]:
         logger.debug(
             f"Calling extract_document_content function with document_path=`{document_path}`"
         )
 
-        if any(document_path.endswith(ext) for ext in [".jpg", ".jpeg", ".png"]):
-            res = self.image_tool.ask_question_about_image(
-                document_path, "Please make a detailed caption about the image."
+        if document_path.endswith(_IMAGE_EXTENSIONS):
+            res = await asyncio.to_thread(
+                self.image_tool.ask_question_about_image,
+                document_path,
+                "Please make a detailed caption about the image.",
             )
             return True, res
 
@@ -80,11 +767,13 @@ class DocumentProcessingToolkit(BaseToolkit):
         #     return True, res
 
         if any(document_path.endswith(ext) for ext in ["xls", "xlsx"]):
-            res = self.excel_tool.extract_excel_content(document_path)
+            res = await asyncio.to_thread(
+                self.excel_tool.extract_excel_content, document_path
+            )
             return True, res
 
         if any(document_path.endswith(ext) for ext in ["zip"]):
-            extracted_files = self._unzip_file(document_path)
+            extracted_files = await asyncio.to_thread(self._unzip_file, document_path)
             return True, f"The extracted files are: {extracted_files}"
 
         if any(document_path.endswith(ext) for ext in ["json", "jsonl", "jsonld"]):
@@ -114,8 +803,8 @@ class DocumentProcessingToolkit(BaseToolkit):
                 logger.debug(f"The raw xml data is: {content}")
                 return True, content
 
-        if self._is_webpage(document_path):
-            extracted_text = self._extract_webpage_content(document_path)
+        if await self._ais_webpage(document_path, head):
+            extracted_text = await self._aextract_webpage_content(document_path)
             return True, extracted_text
 
         else:
@@ -129,45 +818,43 @@ class DocumentProcessingToolkit(BaseToolkit):
             # if is docx file, use docx2markdown to convert it
             if document_path.endswith(".docx"):
                 if is_url:
-                    tmp_path = self._download_file(document_path)
+                    tmp_path = await self._adownload_file(document_path)
                 else:
                     tmp_path = document_path
 
                 file_name = os.path.basename(tmp_path)
                 md_file_path = f"{file_name}.md"
-                docx_to_markdown(tmp_path, md_file_path)
+                await asyncio.to_thread(docx_to_markdown, tmp_path, md_file_path)
 
                 # load content of md file
                 with open(md_file_path, "r") as f:
                     extracted_text = f.read()
                 f.close()
                 return True, extracted_text
+
+            if document_path.endswith(".pdf") and self.local_pdf:
+                extracted_text = await self._aextract_pdf_locally(document_path, is_url)
+                if extracted_text:
+                    return True, extracted_text
+                logger.info(f"No text layer found in {document_path}, trying Chunkr.")
             try:
-                result = asyncio.run(self._extract_content_with_chunkr(document_path))
+                result = await self._extract_content_with_chunkr(document_path)
                 return True, result
 
             except Exception as e:
                 logger.warning(
                     f"Error occurred while using Chunkr to process document: {e}"
                 )
-                if document_path.endswith(".pdf"):
+                if document_path.endswith(".pdf") and not self.local_pdf:
                     # try using pypdf to extract text from pdf
                     try:
-                        from PyPDF2 import PdfReader
-
                         if is_url:
-                            tmp_path = self._download_file(document_path)
+                            tmp_path = await self._adownload_file(document_path)
                             document_path = tmp_path
 
-                        # Open file in binary mode for PdfReader
-                        f = open(document_path, "rb")
-                        reader = PdfReader(f)
-                        extracted_text = ""
-                        for page in reader.pages:
-                            extracted_text += page.extract_text()
-                        f.close()
-
-                        return True, extracted_text
+                        return True, await asyncio.to_thread(
+                            self._read_pdf, document_path
+                        )
 
                     except Exception as pdf_error:
                         logger.error(
@@ -182,8 +869,32 @@ class DocumentProcessingToolkit(BaseToolkit):
                 logger.error(f"Error occurred while processing document: {e}")
                 return False, f"Error occurred while processing document: {e}"
 
-    def _is_webpage(self, url: str) -> bool:
-        r"""Judge whether the given URL is a webpage."""
+    def _read_pdf(self, document_path: str) -> str:
+        r"""Return the text of a local PDF with its page offsets and
+        bookmarks."""
+        pages = extract_pdf_text(document_path, self.pdf_workers)
+        return _join_pages(pages, _pdf_outline(document_path))
+
+    async def _aextract_pdf_locally(self, document_path: str, is_url: bool) -> str:
+        r"""Return the text of a PDF extracted with PyPDF2, with its page
+        offsets and bookmarks, `""` if it has no text layer or cannot be
+        read."""
+        try:
+            if is_url:
+                document_path = await self._adownload_file(document_path)
+            text = await asyncio.to_thread(self._read_pdf, document_path)
+        except Exception as e:
+            logger.warning(f"Error occurred while processing pdf locally: {e}")
+            return ""
+        if not text.strip():
+            return ""
+        return text
+
+    async def _ais_webpage(
+        self, url: str, head: Optional[httpx.Response] = None
+    ) -> bool:
+        r"""Judge whether the given URL is a webpage, from the response to a
+        HEAD request of it that was already made if given."""
         try:
             parsed_url = urlparse(url)
             is_url = all([parsed_url.scheme, parsed_url.netloc])
@@ -195,7 +906,11 @@ class DocumentProcessingToolkit(BaseToolkit):
             if file_type is not None and "text/html" in file_type:
                 return True
 
-            response = requests.head(url, allow_redirects=True, timeout=10)
+            response = (
+                head
+                if head is not None
+                else await get_http_client().head(url, timeout=10)
+            )
             content_type = response.headers.get("Content-Type", "").lower()
 
             if "text/html" in content_type:
@@ -203,7 +918,7 @@ class DocumentProcessingToolkit(BaseToolkit):
             else:
                 return False
 
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             # raise RuntimeError(f"Error while checking the URL: {e}")
             logger.warning(f"Error while checking the URL: {e}")
             return False
@@ -211,80 +926,96 @@ class DocumentProcessingToolkit(BaseToolkit):
         except TypeError:
             return True
 
-    @retry_on_error()
     async def _extract_content_with_chunkr(
         self,
         document_path: str,
         output_format: Literal["json", "markdown"] = "markdown",
     ) -> str:
-        chunkr = Chunkr(api_key=os.getenv("CHUNKR_API_KEY"))
-
-        result = await chunkr.upload(document_path)
-
-        # result = chunkr.upload(document_path)
+        # The Chunkr REST API is called directly: the async methods of the
+        # chunkr_ai client patch the running event loop with nest_asyncio on
+        # every call and open a connection pool per client
+        api_key = os.getenv("CHUNKR_API_KEY")
+        if not api_key:
+            raise ValueError("CHUNKR_API_KEY is not set.")
+        api_url = os.getenv("CHUNKR_URL", "https://api.chunkr.ai").rstrip("/")
+        headers = {"Authorization": api_key}
+        client = get_http_client()
+
+        response = await client.post(
+            f"{api_url}/task/parse",
+            json=await asyncio.to_thread(_chunkr_upload_data, document_path),
+            headers=headers,
+        )
+        response.raise_for_status()
+        task = response.json()
+        deadline = time.monotonic() + _CHUNKR_MAX_WAIT
+        while task["status"] in ("Starting", "Processing"):
+            if time.monotonic() >= deadline:
+                logger.error(
+                    f"Chunkr task {task['task_id']} of {document_path} did not "
+                    f"finish within {_CHUNKR_MAX_WAIT:.0f}s."
+                )
+                return (
+                    "Error while processing document: Chunkr did not finish "
+                    f"within {_CHUNKR_MAX_WAIT:.0f} seconds."
+                )
+            await asyncio.sleep(_CHUNKR_POLL_INTERVAL)
+            response = await client.get(
+                f"{api_url}/task/{task['task_id']}", headers=headers
+            )
+            response.raise_for_status()
+            task = response.json()
 
-        if result.status == "Failed":
+        if task["status"] == "Failed":
             logger.error(
-                f"Error while processing document {document_path}: {result.message} using Chunkr."
+                f"Error while processing document {document_path}: {task.get('message')} using Chunkr."
             )
-            return f"Error while processing document: {result.message}"
-
-        # extract document name
-        document_name = os.path.basename(document_path)
-        output_file_path: str
+            return f"Error while processing document: {task.get('message')}"
 
         if output_format == "json":
-            output_file_path = f"{document_name}.json"
-            result.json(output_file_path)
-
+            return json.dumps(task, indent=2, ensure_ascii=False)
         elif output_format == "markdown":
-            output_file_path = f"{document_name}.md"
-            result.markdown(output_file_path)
-
+            return _chunkr_markdown(task)
         else:
             return "Invalid output format."
 
-        with open(output_file_path, "r") as f:
-            extracted_text = f.read()
-        f.close()
-        return extracted_text
-
-    @retry_on_error()
-    def _extract_webpage_content(self, url: str) -> str:
+    @_aretry_on_error()
+    async def _aextract_webpage_content(self, url: str) -> str:
         api_key = os.getenv("FIRECRAWL_API_KEY")
-        from firecrawl import FirecrawlApp
-
-        # Initialize the FirecrawlApp with your API key
-        app = FirecrawlApp(api_key=api_key)
+        api_url = os.getenv("FIRECRAWL_API_URL", "https://api.firecrawl.dev")
 
-        data = app.crawl_url(
-            url, params={"limit": 1, "scrapeOptions": {"formats": ["markdown"]}}
+        response = await get_http_client().post(
+            f"{api_url.rstrip('/')}/v1/scrape",
+            json={"url": url, "formats": ["markdown"]},
+            headers={"Authorization": f"Bearer {api_key}"} if api_key else None,
         )
+        response.raise_for_status()
+        data = response.json()
         logger.debug(f"Extractred data from {url}: {data}")
-        if len(data["data"]) == 0:
-            if data["success"]:
-                return "No content found on the webpage."
-            else:
-                return "Error while crawling the webpage."
+        if not data.get("success"):
+            return "Error while crawling the webpage."
+        markdown = (data.get("data") or {}).get("markdown")
+        if not markdown:
+            return "No content found on the webpage."
 
-        return str(data["data"][0]["markdown"])
+        return str(markdown)
 
-    def _download_file(self, url: str):
+    async def _adownload_file(self, url: str):
         r"""Download a file from a URL and save it to the cache directory."""
         try:
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
             file_name = url.split("/")[-1]
 
             file_path = os.path.join(self.cache_dir, file_name)
 
-            with open(file_path, "wb") as file:
-                for chunk in response.iter_content(chunk_size=8192):
-                    file.write(chunk)
+            async with get_http_client().stream("GET", url) as response:
+                response.raise_for_status()
+                with open(file_path, "wb") as file:
+                    async for chunk in response.aiter_bytes(chunk_size=8192):
+                        file.write(chunk)
 
             return file_path
 
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"Error downloading the file: {e}")
 
     def _get_formatted_time(self) -> str:
@@ -320,4 +1051,20 @@ class DocumentProcessingToolkit(BaseToolkit):
         """
         return [
             FunctionTool(self.extract_document_content),
+            FunctionTool(self.get_document_outline),
+            FunctionTool(self.search_document),
         ]  # Added closing triple quotes here
+
+    def get_async_tools(self) -> List[FunctionTool]:
+        r"""Returns the asynchronous versions of :meth:`get_tools`, which
+        async societies (e.g. :func:`arun_society` or MCP runs) await on
+        their event loop, so extractions of several tool calls overlap.
+
+        Returns:
+            List[FunctionTool]: A list of FunctionTool objects representing the functions in the toolkit.
+        """
+        return [
+            _async_tool(self.aextract_document_content),
+            _async_tool(self.aget_document_outline),
+            _async_tool(self.asearch_document),
+        ]
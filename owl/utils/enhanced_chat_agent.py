@@ -0,0 +1,355 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from camel.agents import ChatAgent
+from camel.agents._types import ModelResponse, ToolCallRequest
+from camel.responses import ChatAgentResponse
+from camel.toolkits import FunctionTool
+from camel.types.agents import ToolCallingRecord
+from camel.logger import get_logger
+
+from .rate_limit import get_rate_limiter
+from .token_accounting import add_usage, model_name, new_usage, usage_from_response
+from .tracing import Tracer, maybe_span
+
+logger = get_logger(__name__)
+
+
+# Toolkits whose state is bound to the thread that created it (e.g. the sync
+# playwright API used by the browser toolkit). Their tools always run on the
+# calling thread, in addition to any toolkit that sets `thread_safe = False`.
+THREAD_UNSAFE_TOOLKITS = {"BrowserToolkit"}
+
+
+class SocietyTimeoutError(TimeoutError):
+    r"""Raised when an agent reaches the deadline of its society run."""
+
+
+def is_thread_safe_tool(tool: FunctionTool) -> bool:
+    r"""Judge whether a tool may run concurrently with other tool calls.
+
+    A toolkit opts out by defining a class attribute `thread_safe = False`.
+    Plain functions (not bound to a toolkit) are considered thread-safe.
+    """
+    toolkit = getattr(tool.func, "__self__", None)
+    if toolkit is None:
+        return getattr(tool.func, "thread_safe", True)
+    if type(toolkit).__name__ in THREAD_UNSAFE_TOOLKITS:
+        return False
+    return getattr(toolkit, "thread_safe", True)
+
+
+class OwlChatAgent(ChatAgent):
+    r"""A :obj:`ChatAgent` that executes the independent tool calls of one
+    model response concurrently.
+
+    Sync tools run on a bounded thread pool and async tools are awaited
+    together. The results are still recorded into memory in call order, so
+    the conversation seen by the model is the same as with serial execution.
+
+    When the model backend streams, every piece of generated text is passed
+    to :attr:`token_callback` as soon as it arrives.
+
+    The usage of every model call of a step, not only the last one, is
+    reported per model in `info["usage_by_model"]` of the step's response,
+    and the number and wall-clock seconds of its tool calls per tool name in
+    `info["tool_time"]`.
+
+    Model calls wait for the :obj:`RateLimiter` registered for their model,
+    see :func:`set_rate_limit`. The wait is reported as `queue_seconds`.
+
+    Args:
+        max_tool_workers (int, optional): The maximum number of tool calls
+            running at the same time. Set to `1` to execute tool calls
+            serially. (default: :obj:`8`)
+        tracer (Tracer, optional): Records a span for every model call and
+            tool call. (default: :obj:`None`)
+        *args, **kwargs: Passed to :obj:`ChatAgent`.
+    """
+
+    def __init__(
+        self,
+        *args,
+        max_tool_workers: int = 8,
+        tracer: Optional[Tracer] = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.max_tool_workers = max_tool_workers
+        self.tracer = tracer
+        self.token_callback: Optional[Callable[[str], None]] = None
+        # A `time.perf_counter` value after which no model or tool call is
+        # started any more
+        self.deadline: Optional[float] = None
+        self._first_chunk_time: Optional[float] = None
+        # Wall-clock seconds of the latest `step`/`astep`
+        self.last_step_seconds: float = 0.0
+        self._prefetched_tool_results: Dict[str, Any] = {}
+        self._step_usage: Dict[str, Dict[str, int]] = {}
+        self._step_tool_time: Dict[str, Dict[str, float]] = {}
+        self._tool_time_lock = threading.Lock()
+
+    def step(self, *args, **kwargs) -> ChatAgentResponse:
+        start = time.perf_counter()
+        self._step_usage = {}
+        self._step_tool_time = {}
+        try:
+            response = super().step(*args, **kwargs)
+            response.info["usage_by_model"] = self._step_usage
+            response.info["tool_time"] = self._step_tool_time
+            return response
+        finally:
+            self.last_step_seconds = time.perf_counter() - start
+
+    async def astep(self, *args, **kwargs) -> ChatAgentResponse:
+        start = time.perf_counter()
+        self._step_usage = {}
+        self._step_tool_time = {}
+        try:
+            response = await super().astep(*args, **kwargs)
+            response.info["usage_by_model"] = self._step_usage
+            response.info["tool_time"] = self._step_tool_time
+            return response
+        finally:
+            self.last_step_seconds = time.perf_counter() - start
+
+    def _check_deadline(self) -> None:
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise SocietyTimeoutError(f"Agent {self.role_name} reached its deadline.")
+
+    def _record_model_call(
+        self, response: ModelResponse, start: float, queue_seconds: float = 0.0
+    ) -> None:
+        # The model manager has switched to the model used for this call
+        model = model_name(self.model_backend.model_type)
+        usage = usage_from_response(
+            response.usage_dict, len(response.tool_call_requests or [])
+        )
+        usage["queue_seconds"] = queue_seconds
+        add_usage(self._step_usage.setdefault(model, new_usage()), usage)
+        if self.tracer is not None:
+            end = time.perf_counter()
+            self.tracer.record(
+                model,
+                "llm",
+                start,
+                end - start,
+                agent=self.role_name,
+                # Without streaming the first token arrives with the response
+                time_to_first_token=(self._first_chunk_time or end) - start,
+                prompt_tokens=usage["prompt_tokens"],
+                completion_tokens=usage["completion_tokens"],
+                tool_calls=usage["tool_calls"],
+                queue_wait=queue_seconds,
+            )
+
+    def _handle_chunk(self, chunk, content_dict, finish_reasons_dict, output_messages):
+        if self._first_chunk_time is None:
+            self._first_chunk_time = time.perf_counter()
+        if self.token_callback is not None:
+            for choice in chunk.choices:
+                # Only the first choice is kept by `_reduce_message_options`
+                if choice.index == 0 and choice.delta.content:
+                    self.token_callback(choice.delta.content)
+        super()._handle_chunk(chunk, content_dict, finish_reasons_dict, output_messages)
+
+    def _settle_rate_limit(
+        self, limiter, num_tokens: int, response: ModelResponse
+    ) -> None:
+        usage = response.usage_dict or {}
+        limiter.settle(
+            num_tokens,
+            (usage.get("prompt_tokens") or num_tokens)
+            + (usage.get("completion_tokens") or 0),
+        )
+
+    def _get_model_response(
+        self, openai_messages, num_tokens: int, *args, **kwargs
+    ) -> ModelResponse:
+        self._check_deadline()
+        limiter = get_rate_limiter(model_name(self.model_backend.model_type))
+        queue_seconds = limiter.acquire(num_tokens) if limiter is not None else 0.0
+        self._check_deadline()
+        start = time.perf_counter()
+        self._first_chunk_time = None
+        response = super()._get_model_response(
+            openai_messages, num_tokens, *args, **kwargs
+        )
+        if limiter is not None:
+            self._settle_rate_limit(limiter, num_tokens, response)
+        self._record_model_call(response, start, queue_seconds)
+        requests = self._parallel_tool_call_requests(response)
+        if requests:
+            self._prefetch_tool_results(requests)
+        return response
+
+    async def _aget_model_response(
+        self, openai_messages, num_tokens: int, *args, **kwargs
+    ) -> ModelResponse:
+        self._check_deadline()
+        limiter = get_rate_limiter(model_name(self.model_backend.model_type))
+        queue_seconds = (
+            await limiter.aacquire(num_tokens) if limiter is not None else 0.0
+        )
+        self._check_deadline()
+        start = time.perf_counter()
+        self._first_chunk_time = None
+        response = await super()._aget_model_response(
+            openai_messages, num_tokens, *args, **kwargs
+        )
+        if limiter is not None:
+            self._settle_rate_limit(limiter, num_tokens, response)
+        self._record_model_call(response, start, queue_seconds)
+        requests = self._parallel_tool_call_requests(response)
+        if requests:
+            await self._aprefetch_tool_results(requests)
+        return response
+
+    def _parallel_tool_call_requests(
+        self, response: ModelResponse
+    ) -> List[ToolCallRequest]:
+        r"""Return the internal tool call requests of a response if they are
+        worth running concurrently, otherwise an empty list."""
+        if self.single_iteration or self.max_tool_workers <= 1:
+            return []
+        requests = [
+            request
+            for request in response.tool_call_requests or []
+            if request.tool_name in self._internal_tools
+        ]
+        return requests if len(requests) > 1 else []
+
+    @contextmanager
+    def _tool_span(self, request: ToolCallRequest, **attrs) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            with maybe_span(
+                self.tracer,
+                request.tool_name,
+                "tool",
+                agent=self.role_name,
+                tool_call_id=request.tool_call_id,
+                **attrs,
+            ):
+                yield
+        finally:
+            seconds = time.perf_counter() - start
+            # Tool calls of a step may finish on several threads at once
+            with self._tool_time_lock:
+                entry = self._step_tool_time.setdefault(
+                    request.tool_name, {"calls": 0, "seconds": 0.0}
+                )
+                entry["calls"] += 1
+                entry["seconds"] += seconds
+
+    def _call_tool(self, request: ToolCallRequest) -> Any:
+        self._check_deadline()
+        try:
+            with self._tool_span(request, concurrent=True):
+                return self._internal_tools[request.tool_name](**request.args)
+        except Exception as e:
+            # Same error shape as `ChatAgent._execute_tool`
+            error_msg = f"Error executing tool '{request.tool_name}': {e!s}"
+            logger.warning(error_msg)
+            return {"error": error_msg}
+
+    async def _acall_tool(self, request: ToolCallRequest) -> Any:
+        tool = self._internal_tools[request.tool_name]
+        self._check_deadline()
+        try:
+            with self._tool_span(request, concurrent=True):
+                if tool.is_async or not is_thread_safe_tool(tool):
+                    return await tool.async_call(**request.args)
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(None, lambda: tool(**request.args))
+        except Exception as e:
+            error_msg = f"Error executing async tool '{request.tool_name}': {e!s}"
+            logger.warning(error_msg)
+            return {"error": error_msg}
+
+    def _prefetch_tool_results(self, requests: List[ToolCallRequest]) -> None:
+        r"""Run the given tool calls concurrently and keep their results until
+        :meth:`_execute_tool` records them."""
+        parallel = [
+            r
+            for r in requests
+            if is_thread_safe_tool(self._internal_tools[r.tool_name])
+        ]
+        serial = [r for r in requests if r not in parallel]
+        logger.debug(
+            f"Running {len(parallel)} tool calls concurrently, {len(serial)} serially."
+        )
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_tool_workers, max(len(parallel), 1))
+        ) as executor:
+            futures = {
+                r.tool_call_id: executor.submit(self._call_tool, r) for r in parallel
+            }
+            # Thread-unsafe tools run on this thread while the pool is busy
+            for r in serial:
+                self._prefetched_tool_results[r.tool_call_id] = self._call_tool(r)
+            for tool_call_id, future in futures.items():
+                self._prefetched_tool_results[tool_call_id] = future.result()
+
+    async def _aprefetch_tool_results(self, requests: List[ToolCallRequest]) -> None:
+        semaphore = asyncio.Semaphore(self.max_tool_workers)
+
+        async def _run(request: ToolCallRequest) -> Any:
+            async with semaphore:
+                return await self._acall_tool(request)
+
+        results = await asyncio.gather(*(_run(r) for r in requests))
+        for request, result in zip(requests, results):
+            self._prefetched_tool_results[request.tool_call_id] = result
+
+    def _execute_tool(self, tool_call_request: ToolCallRequest) -> ToolCallingRecord:
+        self._check_deadline()
+        tool_call_id = tool_call_request.tool_call_id
+        if tool_call_id not in self._prefetched_tool_results:
+            with self._tool_span(tool_call_request, concurrent=False):
+                return super()._execute_tool(tool_call_request)
+        return self._record_tool_calling(
+            tool_call_request.tool_name,
+            tool_call_request.args,
+            self._prefetched_tool_results.pop(tool_call_id),
+            tool_call_id,
+        )
+
+    async def _aexecute_tool(
+        self, tool_call_request: ToolCallRequest
+    ) -> ToolCallingRecord:
+        self._check_deadline()
+        tool_call_id = tool_call_request.tool_call_id
+        if tool_call_id not in self._prefetched_tool_results:
+            with self._tool_span(tool_call_request, concurrent=False):
+                return await super()._aexecute_tool(tool_call_request)
+        return self._record_tool_calling(
+            tool_call_request.tool_name,
+            tool_call_request.args,
+            self._prefetched_tool_results.pop(tool_call_id),
+            tool_call_id,
+        )
+
+    def reset(self):
+        r"""Resets the agent and drops any unconsumed tool results."""
+        super().reset()
+        self._prefetched_tool_results.clear()
@@ -12,7 +12,25 @@
 # limitations under the License.
 # ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
 
-from typing import Dict, List, Optional, Tuple
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import partial
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 
 from camel.agents import ChatAgent
@@ -24,6 +42,22 @@ from camel.logger import get_logger
 
 from copy import deepcopy
 
+from .budget import SocietyBudget
+from .checkpoint import SocietyCheckpoint, load_checkpoint, save_checkpoint
+from .document_toolkit import http_client_scope
+from .enhanced_chat_agent import OwlChatAgent, SocietyTimeoutError
+from .token_accounting import TokenAccounting
+from .tracing import Tracer, maybe_span
+from .society_events import (
+    AssistantMessageEvent,
+    RoundEndEvent,
+    SocietyEndEvent,
+    SocietyEvent,
+    TokenDeltaEvent,
+    ToolCallEvent,
+    UserMessageEvent,
+)
+
 logger = get_logger(__name__)
 
 
@@ -39,6 +73,24 @@ class OwlRolePlaying(RolePlaying):
 
         self.output_language = kwargs.get("output_language", None)
 
+        # Upper bound of tool calls executed concurrently within one agent step
+        self.max_tool_workers: int = kwargs.pop("max_tool_workers", 8)
+
+        # Records latency spans of rounds, model calls, tool calls and
+        # prompt building, see `owl.utils.tracing`
+        self.tracer: Optional[Tracer] = kwargs.pop("tracer", None)
+
+        # "full" repeats the task in every round, "compact" keeps it only in
+        # the system prompts and sends short per-round reminders instead
+        self.prompt_layout: str = kwargs.pop("prompt_layout", "full")
+        if self.prompt_layout not in ("full", "compact"):
+            raise ValueError(
+                f"Invalid value for `prompt_layout`: {self.prompt_layout}, "
+                "expected 'full' or 'compact'."
+            )
+        self.saved_prompt_token_count = 0
+        self._saved_tokens_in_history = {"user": 0, "assistant": 0}
+
         super().__init__(**kwargs)
 
         init_user_sys_msg, init_assistant_sys_msg = self._construct_gaia_sys_msgs()
@@ -104,16 +156,20 @@ class OwlRolePlaying(RolePlaying):
         #         model_type=ModelType.O3_MINI,
         #     )
 
-        self.assistant_agent = ChatAgent(
+        self.assistant_agent = OwlChatAgent(
             init_assistant_sys_msg,
             output_language=output_language,
+            max_tool_workers=self.max_tool_workers,
+            tracer=self.tracer,
             **(assistant_agent_kwargs or {}),
         )
         self.assistant_sys_msg = self.assistant_agent.system_message
 
-        self.user_agent = ChatAgent(
+        self.user_agent = OwlChatAgent(
             init_user_sys_msg,
             output_language=output_language,
+            max_tool_workers=self.max_tool_workers,
+            tracer=self.tracer,
             **(user_agent_kwargs or {}),
         )
         self.user_sys_msg = self.user_agent.system_message
@@ -138,8 +194,24 @@ class OwlRolePlaying(RolePlaying):
     #     else:
     #         return False
 
+    def set_deadline(self, deadline: Optional[float]) -> None:
+        r"""Make both agents raise :obj:`SocietyTimeoutError` instead of
+        starting a model or tool call after `deadline`, a
+        `time.perf_counter` value."""
+        self.user_agent.deadline = deadline
+        self.assistant_agent.deadline = deadline
+
+    def set_tracer(self, tracer: Optional[Tracer]) -> None:
+        r"""Record the spans of the society and its agents with `tracer`."""
+        self.tracer = tracer
+        self.user_agent.tracer = tracer
+        self.assistant_agent.tracer = tracer
+
     def _construct_gaia_sys_msgs(self):
-        user_system_prompt = f"""
+        # The rules and tips are identical for every task and come first, the
+        # task is appended at the end. This keeps a long shared prefix that
+        # provider-side prompt caching can reuse across tasks.
+        user_system_prompt = """
 ===== RULES OF USER =====
 Never forget you are a user and I am a assistant. Never flip roles! You will always instruct me. We share a common interest in collaborating to successfully complete a task.
 I must help you to complete a difficult task.
@@ -161,22 +233,18 @@ Here are some tips that will help you to give more valuable instructions about o
 - Flexibly write codes to solve some problems, such as excel relevant tasks.
 </tips>
 
-Now, here is the overall task: <task>{self.task_prompt}</task>. Never forget our task!
-
 Now you must start to instruct me to solve the task step-by-step. Do not add anything else other than your instruction!
 Keep giving me instructions until you think the task is completed.
 When the task is completed, you must only reply with a single word <TASK_DONE>.
 Never say <TASK_DONE> unless my responses have solved your task.
-        """
+"""
 
-        assistant_system_prompt = f"""
+        assistant_system_prompt = """
 ===== RULES OF ASSISTANT =====
 Never forget you are a assistant and I am a user. Never flip roles! Never instruct me! You have to utilize your available tools to solve the task I assigned.
 We share a common interest in collaborating to successfully complete a complex task.
 You must help me to complete the task.
 
-Here is our overall task: {self.task_prompt}. Never forget our task!
-
 I must instruct you based on your expertise and my needs to complete the task. An instruction is typically a sub-task or question.
 
 You must leverage your available tools, try your best to solve the problem, and explain your solutions.
@@ -198,8 +266,14 @@ Please note that our overall task may be very complicated. Here are some tips th
 - Search results typically do not provide precise answers. It is not likely to find the answer directly using search toolkit only, the search query should be concise and focuses on finding sources rather than direct answers, as it always need to use other tools to further process the url, e.g. interact with the webpage, extract webpage content, etc. 
 - For downloading files, you can either use the web browser simulation toolkit or write codes.
 </tips>
+"""
 
-        """
+        user_system_prompt += f"""
+Now, here is the overall task: <task>{self.task_prompt}</task>. Never forget our task!
+"""
+        assistant_system_prompt += f"""
+Here is our overall task: <task>{self.task_prompt}</task>. Never forget our task!
+"""
 
         user_sys_msg = BaseMessage.make_user_message(
             role_name=self.user_role_name, content=user_system_prompt
@@ -211,6 +285,81 @@ Please note that our overall task may be very complicated. Here are some tips th
 
         return user_sys_msg, assistant_sys_msg
 
+    def _instruction_suffix(self) -> str:
+        r"""The text appended to every instruction of the user agent before it
+        is sent to the assistant agent."""
+        if self.prompt_layout == "compact":
+            suffix = """\n
+            请牢记系统提示中给出的总体任务。
+            如果有可用的工具并且您想要调用它们，请不要说"我将..."，而是先调用工具，根据工具调用的结果回复，并告诉我您使用了哪个工具。
+            """
+            return suffix
+        return self._full_instruction_suffix()
+
+    def _full_instruction_suffix(self) -> str:
+        return f"""\n
+            以下是关于总体任务的辅助信息，这可能有助于您理解当前任务的意图：
+            <auxiliary_information>
+            {self.task_prompt}
+            </auxiliary_information>
+            如果有可用的工具并且您想要调用它们，请不要说"我将..."，而是先调用工具，根据工具调用的结果回复，并告诉我您使用了哪个工具。
+            """
+
+    def _reminder_suffix(self) -> str:
+        r"""The text appended to every reply of the assistant agent before it
+        is sent back to the user agent."""
+        if self.prompt_layout == "compact":
+            suffix = """\n
+                根据我的回复和系统提示中的总体任务，请提供下一步指示和输入（如果需要）。
+                在给出最终答案之前，请检查我是否已经使用了不同的工具包尽可能地重新验证了最终答案。如果没有，请提醒我这样做。
+                如果我写了代码，请提醒我运行代码。
+                如果您认为我们的任务已经完成，请回复"TASK_DONE"来结束我们的对话。
+            """
+            return suffix
+        return self._full_reminder_suffix()
+
+    def _full_reminder_suffix(self) -> str:
+        return f"""\n
+                根据我的回复和我们当前的任务：<task>{self.task_prompt}</task>，请提供下一步指示和输入（如果需要）。
+                在给出最终答案之前，请检查我是否已经使用了不同的工具包尽可能地重新验证了最终答案。如果没有，请提醒我这样做。
+                如果我写了代码，请提醒我运行代码。
+                如果您认为我们的任务已经完成，请回复"TASK_DONE"来结束我们的对话。
+            """
+
+    def _final_answer_suffix(self) -> str:
+        r"""The text appended to the user agent's last message, asking the
+        assistant agent for the final answer. It always repeats the task."""
+        return f"""\n
+            现在请根据我们的对话，对原始任务给出最终答案：<task>{self.task_prompt}</task>
+            """
+
+    def _record_saved_tokens(self, receiver: str) -> None:
+        r"""Account for the compact suffix of a message sent to the
+        `receiver` agent, once per message. It is saved again on every later
+        call of that agent, since the history is resent each time."""
+        if self.prompt_layout != "compact":
+            return
+        if receiver == "assistant":
+            full, compact = self._full_instruction_suffix(), self._instruction_suffix()
+        else:
+            full, compact = self._full_reminder_suffix(), self._reminder_suffix()
+        counter = self.assistant_agent.model_backend.token_counter
+        try:
+            saved = len(counter.encode(full)) - len(counter.encode(compact))
+        except Exception:
+            # Token counters may need to download their encoding first
+            saved = (len(full) - len(compact)) // 4
+        self._saved_tokens_in_history[receiver] += saved
+
+    def init_chat(self, init_msg_content: Optional[str] = None) -> BaseMessage:
+        self.saved_prompt_token_count = 0
+        self._saved_tokens_in_history = {"user": 0, "assistant": 0}
+        return super().init_chat(init_msg_content)
+
+    def _account_model_call(self, agent: str) -> None:
+        r"""Add the suffix tokens that `agent` did not have to resend."""
+        self.saved_prompt_token_count += self._saved_tokens_in_history[agent]
+
     def step(
         self, assistant_msg: BaseMessage
     ) -> Tuple[ChatAgentResponse, ChatAgentResponse]:
@@ -219,78 +368,68 @@ Please note that our overall task may be very complicated. Here are some tips th
         参数: assistant_msg - 助手的消息
         返回: 包含助手响应和用户响应的元组
         """
-        
-        # 1. 处理工具调用
-        if hasattr(assistant_msg, 'tool_calls') and assistant_msg.tool_calls:
-            tool_messages = []
-            for tool_call in assistant_msg.tool_calls:
-                if tool_call.type == 'function':
-                    # 创建工具响应消息
-                    tool_response = {
-                        'role': 'tool',
-                        'content': f"Tool {tool_call.function.name} executed successfully",
-                        'tool_call_id': tool_call.id
-                    }
-                    tool_messages.append(tool_response)
-        
-            # 如果有工具调用，将工具响应添加到消息中
-            if tool_messages:
-                assistant_msg.tool_responses = tool_messages
-        
-        # 2. 用户代理处理助手消息
+
+        # 1. 用户代理处理助手消息（同一轮内的多个工具调用由 OwlChatAgent 并发执行）
+        self._account_model_call("user")
         user_response = self.user_agent.step(assistant_msg)
-        
-        # 3. 检查用户响应是否终止或为空
+
+        # 2. 检查用户响应是否终止或为空
         if user_response.terminated or user_response.msgs is None:
             return (
                 ChatAgentResponse(msgs=[], terminated=False, info={}),
-                ChatAgentResponse(msgs=[], terminated=user_response.terminated, info=user_response.info),
+                ChatAgentResponse(
+                    msgs=[],
+                    terminated=user_response.terminated,
+                    info=user_response.info,
+                ),
             )
-        
-        # 4. 提取用户消息并创建副本
-        user_msg = self._reduce_message_options(user_response.msgs)
-        modified_user_msg = deepcopy(user_msg)
-
-        # 5. 根据任务完成状态修改用户消息
-        if "TASK_DONE" not in user_msg.content:
-            # 如果任务未完成，添加辅助信息和工具使用说明
-            modified_user_msg.content += f"""\n
-            以下是关于总体任务的辅助信息，这可能有助于您理解当前任务的意图：
-            <auxiliary_information>
-            {self.task_prompt}
-            </auxiliary_information>
-            如果有可用的工具并且您想要调用它们，请不要说"我将..."，而是先调用工具，根据工具调用的结果回复，并告诉我您使用了哪个工具。
-            """
-        else:
-            # 如果任务完成，添加最终答案请求
-            modified_user_msg.content += f"""\n
-            现在请根据我们的对话，对原始任务给出最终答案：<task>{self.task_prompt}</task>
-            """
 
-        # 6. 助手代理处理修改后的用户消息
+        # 3. 提取用户消息并创建副本
+        user_msg = self._reduce_message_options(user_response.msgs)
+        with maybe_span(self.tracer, "deepcopy", "orchestration", agent="user"):
+            modified_user_msg = deepcopy(user_msg)
+
+        # 4. 根据任务完成状态修改用户消息
+        with maybe_span(self.tracer, "prompt_build", "orchestration", agent="user"):
+            if "TASK_DONE" not in user_msg.content:
+                # 如果任务未完成，添加辅助信息和工具使用说明
+                modified_user_msg.content += self._instruction_suffix()
+                self._record_saved_tokens("assistant")
+            else:
+                # 如果任务完成，添加最终答案请求
+                modified_user_msg.content += self._final_answer_suffix()
+
+        # 5. 助手代理处理修改后的用户消息
+        self._account_model_call("assistant")
         assistant_response = self.assistant_agent.step(modified_user_msg)
-        
-        # 7. 检查助手响应是否终止或为空
+
+        # 6. 检查助手响应是否终止或为空
         if assistant_response.terminated or assistant_response.msgs is None:
             return (
-                ChatAgentResponse(msgs=[], terminated=assistant_response.terminated, info=assistant_response.info),
-                ChatAgentResponse(msgs=[user_msg], terminated=False, info=user_response.info),
+                ChatAgentResponse(
+                    msgs=[],
+                    terminated=assistant_response.terminated,
+                    info=assistant_response.info,
+                ),
+                ChatAgentResponse(
+                    msgs=[user_msg], terminated=False, info=user_response.info
+                ),
             )
-        
-        # 8. 提取助手消息并创建副本
+
+        # 7. 提取助手消息并创建副本
         assistant_msg = self._reduce_message_options(assistant_response.msgs)
-        modified_assistant_msg = deepcopy(assistant_msg)
+        with maybe_span(self.tracer, "deepcopy", "orchestration", agent="assistant"):
+            modified_assistant_msg = deepcopy(assistant_msg)
 
-        # 9. 如果任务未完成，修改助手消息
-        if "TASK_DONE" not in user_msg.content:
-            modified_assistant_msg.content += f"""\n
-                根据我的回复和我们当前的任务：<task>{self.task_prompt}</task>，请提供下一步指示和输入（如果需要）。
-                在给出最终答案之前，请检查我是否已经使用了不同的工具包尽可能地重新验证了最终答案。如果没有，请提醒我这样做。
-                如果我写了代码，请提醒我运行代码。
-                如果您认为我们的任务已经完成，请回复"TASK_DONE"来结束我们的对话。
-            """
+        # 8. 如果任务未完成，修改助手消息
+        with maybe_span(
+            self.tracer, "prompt_build", "orchestration", agent="assistant"
+        ):
+            if "TASK_DONE" not in user_msg.content:
+                modified_assistant_msg.content += self._reminder_suffix()
+                self._record_saved_tokens("user")
 
-        # 10. 返回最终的响应元组
+        # 9. 返回最终的响应元组
         return (
             ChatAgentResponse(
                 msgs=[modified_assistant_msg],
@@ -307,6 +446,7 @@ Please note that our overall task may be very complicated. Here are some tips th
     async def astep(
         self, assistant_msg: BaseMessage
     ) -> Tuple[ChatAgentResponse, ChatAgentResponse]:
+        self._account_model_call("user")
         user_response = await self.user_agent.astep(assistant_msg)
         if user_response.terminated or user_response.msgs is None:
             return (
@@ -319,23 +459,19 @@ Please note that our overall task may be very complicated. Here are some tips th
             )
         user_msg = self._reduce_message_options(user_response.msgs)
 
-        modified_user_msg = deepcopy(user_msg)
+        with maybe_span(self.tracer, "deepcopy", "orchestration", agent="user"):
+            modified_user_msg = deepcopy(user_msg)
 
-        if "TASK_DONE" not in user_msg.content:
-            modified_user_msg.content += f"""\n
-            以下是关于总体任务的辅助信息，这可能有助于您理解当前任务的意图：
-            <auxiliary_information>
-            {self.task_prompt}
-            </auxiliary_information>
-            如果有可用的工具并且您想要调用它们，请不要说"我将..."，而是先调用工具，根据工具调用的结果回复，并告诉我您使用了哪个工具。
-            """
+        with maybe_span(self.tracer, "prompt_build", "orchestration", agent="user"):
+            if "TASK_DONE" not in user_msg.content:
+                modified_user_msg.content += self._instruction_suffix()
+                self._record_saved_tokens("assistant")
 
-        else:
-            # The task is done, and the assistant agent need to give the final answer about the original task
-            modified_user_msg.content += f"""\n
-            现在请根据我们的对话，对原始任务给出最终答案：<task>{self.task_prompt}</task>
-            """
+            else:
+                # The task is done, and the assistant agent need to give the final answer about the original task
+                modified_user_msg.content += self._final_answer_suffix()
 
+        self._account_model_call("assistant")
         assistant_response = await self.assistant_agent.astep(modified_user_msg)
         if assistant_response.terminated or assistant_response.msgs is None:
             return (
@@ -348,17 +484,9 @@ Please note that our overall task may be very complicated. Here are some tips th
                     msgs=[user_msg], terminated=False, info=user_response.info
                 ),
             )
+        # The unmodified reply is passed on, so no reminder is appended here
         assistant_msg = self._reduce_message_options(assistant_response.msgs)
 
-        modified_assistant_msg = deepcopy(assistant_msg)
-        if "TASK_DONE" not in user_msg.content:
-            modified_assistant_msg.content += f"""\n
-                根据我的回复和我们当前的任务：<task>{self.task_prompt}</task>，请提供下一步指示和输入（如果需要）。
-                在给出最终答案之前，请检查我是否已经使用了不同的工具包尽可能地重新验证了最终答案。如果没有，请提醒我这样做。
-                如果我写了代码，请提醒我运行代码。
-                如果您认为我们的任务已经完成，请回复"TASK_DONE"来结束我们的对话。
-            """
-
         return (
             ChatAgentResponse(
                 msgs=[assistant_msg],
@@ -372,40 +500,62 @@ Please note that our overall task may be very complicated. Here are some tips th
             ),
         )
 
+    def _final_answer_msg(self, stop_reason: str) -> BaseMessage:
+        r"""The message ending a run on behalf of the user agent, asking the
+        assistant agent for the final answer."""
+        return BaseMessage.make_user_message(
+            role_name=self.user_role_name,
+            content=(
+                f"We have run out of our {stop_reason.replace('_', ' ')}, "
+                "so there will be no more instructions. TASK_DONE"
+                + self._final_answer_suffix()
+            ),
+        )
 
-class OwlGAIARolePlaying(OwlRolePlaying):
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
+    def _final_answer_responses(
+        self, user_msg: BaseMessage, assistant_response: ChatAgentResponse
+    ) -> Tuple[ChatAgentResponse, ChatAgentResponse]:
+        assistant_msgs = (
+            []
+            if assistant_response.terminated or assistant_response.msgs is None
+            else [self._reduce_message_options(assistant_response.msgs)]
+        )
+        return (
+            ChatAgentResponse(
+                msgs=assistant_msgs,
+                terminated=assistant_response.terminated,
+                info=assistant_response.info,
+            ),
+            ChatAgentResponse(msgs=[user_msg], terminated=False, info={}),
+        )
 
-    def step(
-        self, assistant_msg: BaseMessage
+    def final_answer_step(
+        self, stop_reason: str
     ) -> Tuple[ChatAgentResponse, ChatAgentResponse]:
-        user_response = self.user_agent.step(assistant_msg)
-        if user_response.terminated or user_response.msgs is None:
-            return (
-                ChatAgentResponse(msgs=[], terminated=False, info={}),
-                ChatAgentResponse(
-                    msgs=[],
-                    terminated=user_response.terminated,
-                    info=user_response.info,
-                ),
-            )
-        user_msg = self._reduce_message_options(user_response.msgs)
+        r"""Skip the user agent and ask the assistant agent for the final
+        answer, e.g. once a budget is exhausted. Returns the responses like
+        :meth:`step`, the user message containing `TASK_DONE`."""
+        user_msg = self._final_answer_msg(stop_reason)
+        self._account_model_call("assistant")
+        assistant_response = self.assistant_agent.step(user_msg)
+        return self._final_answer_responses(user_msg, assistant_response)
+
+    async def afinal_answer_step(
+        self, stop_reason: str
+    ) -> Tuple[ChatAgentResponse, ChatAgentResponse]:
+        r"""Asynchronous version of :meth:`final_answer_step`."""
+        user_msg = self._final_answer_msg(stop_reason)
+        self._account_model_call("assistant")
+        assistant_response = await self.assistant_agent.astep(user_msg)
+        return self._final_answer_responses(user_msg, assistant_response)
 
-        modified_user_msg = deepcopy(user_msg)
 
-        if "TASK_DONE" not in user_msg.content:
-            modified_user_msg.content += f"""\n
-            以下是关于总体任务的辅助信息，这可能有助于您理解当前任务的意图：
-            <auxiliary_information>
-            {self.task_prompt}
-            </auxiliary_information>
-            如果有可用的工具并且您想要调用它们，请不要说"我将..."，而是先调用工具，根据工具调用的结果回复，并告诉我您使用了哪个工具。
-            """
+class OwlGAIARolePlaying(OwlRolePlaying):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
 
-        else:
-            # The task is done, and the assistant agent need to give the final answer about the original task
-            modified_user_msg.content += f"""\n
+    def _final_answer_suffix(self) -> str:
+        return f"""\n
             现在请根据我们的对话，对原始任务给出最终答案：<task>{self.task_prompt}</task>
             Please pay special attention to the format in which the answer is presented.
             You should first analyze the answer format required by the question and then output the final answer that meets the format requirements. 
@@ -421,143 +571,533 @@ class OwlGAIARolePlaying(OwlRolePlaying):
             </hint>
             """
 
-        # process assistant's response
-        assistant_response = self.assistant_agent.step(modified_user_msg)
-        if assistant_response.terminated or assistant_response.msgs is None:
-            return (
-                ChatAgentResponse(
-                    msgs=[],
-                    terminated=assistant_response.terminated,
-                    info=assistant_response.info,
-                ),
-                ChatAgentResponse(
-                    msgs=[user_msg], terminated=False, info=user_response.info
-                ),
+
+def _round_events(
+    _round: int,
+    assistant_response: ChatAgentResponse,
+    user_response: ChatAgentResponse,
+) -> List[SocietyEvent]:
+    r"""Build the message and tool call events of a finished round."""
+    events: List[SocietyEvent] = [
+        UserMessageEvent(
+            _round,
+            user_response.msg.content
+            if hasattr(user_response, "msg") and user_response.msg
+            else "",
+        )
+    ]
+    for tool_call in assistant_response.info.get("tool_calls") or []:
+        events.append(
+            ToolCallEvent(
+                _round,
+                tool_call.tool_name,
+                tool_call.args,
+                tool_call.result,
+                tool_call.tool_call_id,
             )
-        assistant_msg = self._reduce_message_options(assistant_response.msgs)
+        )
+    events.append(
+        AssistantMessageEvent(
+            _round,
+            assistant_response.msg.content
+            if hasattr(assistant_response, "msg") and assistant_response.msg
+            else "",
+        )
+    )
+    return events
 
-        modified_assistant_msg = deepcopy(assistant_msg)
-        if "TASK_DONE" not in user_msg.content:
-            modified_assistant_msg.content += f"""\n
-                根据我的回复和我们当前的任务：<task>{self.task_prompt}</task>，请提供下一步指示和输入（如果需要）。
-                在给出最终答案之前，请检查我是否已经使用了不同的工具包尽可能地重新验证了最终答案。如果没有，请提醒我这样做。
-                如果我写了代码，请提醒我运行代码。
-                如果您认为我们的任务已经完成，请回复"TASK_DONE"来结束我们的对话。
-            """
 
-        # return the modified messages
-        return (
-            ChatAgentResponse(
-                msgs=[modified_assistant_msg],
-                terminated=assistant_response.terminated,
-                info=assistant_response.info,
-            ),
-            ChatAgentResponse(
-                msgs=[modified_user_msg],
-                terminated=user_response.terminated,
-                info=user_response.info,
-            ),
-        )
+def _round_timings(society: OwlRolePlaying, round_seconds: float) -> Dict[str, float]:
+    return {
+        "user": getattr(society.user_agent, "last_step_seconds", 0.0),
+        "assistant": getattr(society.assistant_agent, "last_step_seconds", 0.0),
+        "round": round_seconds,
+    }
 
 
-def run_society(
+class _StepWorker:
+    r"""Runs the steps of a society on one background thread, so that
+    thread-bound toolkits see the same thread in every round. The thread is
+    a daemon, so a step abandoned at its deadline cannot keep the
+    interpreter alive."""
+
+    def __init__(self):
+        self._tasks: "queue.Queue" = queue.Queue()
+        threading.Thread(target=self._loop, daemon=True).start()
+
+    def _loop(self) -> None:
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            func, future = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func())
+            except BaseException as e:
+                future.set_exception(e)
+
+    def submit(self, func: Callable[[], Any]) -> Future:
+        future: Future = Future()
+        self._tasks.put((func, future))
+        return future
+
+    def shutdown(self) -> None:
+        self._tasks.put(None)
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    if deadline is None:
+        return None
+    return max(deadline - time.perf_counter(), 0.0)
+
+
+def _step_before_deadline(
+    step: Callable[[], Tuple[ChatAgentResponse, ChatAgentResponse]],
+    worker: _StepWorker,
+    deadline: float,
+) -> Tuple[ChatAgentResponse, ChatAgentResponse]:
+    r"""Run `step` on `worker` and give up on it at `deadline`."""
+    try:
+        return worker.submit(step).result(timeout=_remaining(deadline))
+    except FutureTimeoutError:
+        raise SocietyTimeoutError("The society run reached its deadline.")
+
+
+def _step_with_token_events(
+    society: OwlRolePlaying,
+    step: Callable[[], Tuple[ChatAgentResponse, ChatAgentResponse]],
+    _round: int,
+    worker: _StepWorker,
+    deadline: Optional[float] = None,
+) -> Generator[TokenDeltaEvent, None, Tuple[ChatAgentResponse, ChatAgentResponse]]:
+    r"""Run `step` on `worker` and yield the streamed text while it is
+    running. Returns the result of the step."""
+    events: "queue.Queue[TokenDeltaEvent]" = queue.Queue()
+
+    def _callback(role: str):
+        return lambda delta: events.put(TokenDeltaEvent(_round, role, delta))
+
+    society.user_agent.token_callback = _callback("user")
+    society.assistant_agent.token_callback = _callback("assistant")
+    try:
+        future = worker.submit(step)
+        while not future.done() or not events.empty():
+            if not future.done() and _remaining(deadline) == 0.0:
+                raise SocietyTimeoutError("The society run reached its deadline.")
+            try:
+                yield events.get(timeout=0.05)
+            except queue.Empty:
+                continue
+        return future.result()
+    finally:
+        society.user_agent.token_callback = None
+        society.assistant_agent.token_callback = None
+
+
+def _threadsafe_token_callback(
+    token_events: "asyncio.Queue[TokenDeltaEvent]", _round: int, role: str
+) -> Callable[[str], None]:
+    # Streams may be consumed off the loop thread (e.g. by a model call
+    # running in an executor), so hand the events over thread-safely
+    loop = asyncio.get_running_loop()
+    return lambda delta: loop.call_soon_threadsafe(
+        token_events.put_nowait, TokenDeltaEvent(_round, role, delta)
+    )
+
+
+def iter_society(
     society: OwlRolePlaying,
     round_limit: int = 5,
-) -> Tuple[str, List[dict], dict]:
-    
+    stream_tokens: bool = False,
+    checkpoint_path: Optional[str] = None,
+    resume_from: Optional[SocietyCheckpoint] = None,
+    budget: Optional[SocietyBudget] = None,
+    timeout: Optional[float] = None,
+) -> Iterator[SocietyEvent]:
+    r"""Run the society round by round and yield the events of each round as
+    they happen. See :mod:`owl.utils.society_events` for the event order.
+
+    Args:
+        society (OwlRolePlaying): The society to run.
+        round_limit (int, optional): The maximum number of rounds.
+            (default: :obj:`5`)
+        stream_tokens (bool, optional): Whether to yield
+            :obj:`TokenDeltaEvent` while the model backend streams. The steps
+            then run on one background thread. (default: :obj:`False`)
+        checkpoint_path (str, optional): Where to write a checkpoint after
+            every round, see :func:`save_checkpoint`. (default: :obj:`None`)
+        resume_from (SocietyCheckpoint, optional): Continue the run saved in
+            this checkpoint instead of starting a new chat.
+            (default: :obj:`None`)
+        budget (SocietyBudget, optional): Limits on tokens, time and cost.
+            Once one is exhausted the assistant gives its final answer and
+            the run stops. (default: :obj:`None`)
+        timeout (float, optional): The deadline of the run in seconds. A
+            round still running at the deadline is abandoned, the run ends
+            with the rounds finished so far and the stop reason `"timeout"`.
+            The agents start no further model or tool calls, so the society
+            should not be reused. (default: :obj:`None`)
+
+    Yields:
+        SocietyEvent: The events of the run, ending with a
+            :obj:`SocietyEndEvent`.
+    """
     # 初始化token计数器
     # 创建空的对话历史列表
     # 设置初始提示语
-    overall_completion_token_count = 0
-    overall_prompt_token_count = 0
+    accounting = TokenAccounting()
+    # 预算定价与停止原因
+    pricing = budget or SocietyBudget()
+    stop_reason = None
 
     chat_history = []
     init_prompt = """
     现在请给我一步步解决总体任务的指示。如果任务需要一些特定知识，请指导我使用工具来完成任务。
         """
-    input_msg = society.init_chat(init_prompt)
-    # 遍历对话轮次
-    for _round in range(round_limit):
-        # 处理对话的一个步骤，接收助手消息并返回用户和助手的响应
-        assistant_response, user_response = society.step(input_msg)
-        # 检查使用信息是否可用
-        if assistant_response.info.get("usage") and user_response.info.get("usage"):
-            overall_completion_token_count += assistant_response.info["usage"].get(
-                "completion_tokens", 0
-            ) + user_response.info["usage"].get("completion_tokens", 0)
-            overall_prompt_token_count += assistant_response.info["usage"].get(
-                "prompt_tokens", 0
-            ) + user_response.info["usage"].get("prompt_tokens", 0)
-
-        # 将工具调用转换为字典
-        tool_call_records: List[dict] = []
-        if assistant_response.info.get("tool_calls"):
-            for tool_call in assistant_response.info["tool_calls"]:
-                tool_call_records.append(tool_call.as_dict())
+    start_round = 0
+    if resume_from is not None:
+        # 从检查点恢复对话历史、token计数和双方记忆
+        input_msg = resume_from.restore(society)
+        chat_history = list(resume_from.chat_history)
+        accounting = TokenAccounting.from_dict(resume_from.token_counters)
+        stop_reason = resume_from.token_counters.get("stop_reason")
+        start_round = round_limit if resume_from.finished else resume_from.next_round
+    else:
+        input_msg = society.init_chat(init_prompt)
+    # 设置截止时间
+    deadline = time.perf_counter() + timeout if timeout is not None else None
+    society.set_deadline(deadline)
+    # 流式输出或有截止时间时，所有轮次在同一个后台线程中执行
+    worker = _StepWorker() if stream_tokens or deadline is not None else None
+    try:
+        # 遍历对话轮次
+        for _round in range(start_round, round_limit):
+            # 检查预算，预算用尽时跳过用户代理，直接请求最终答案
+            if budget is not None and stop_reason is None:
+                stop_reason = budget.exceeded(accounting.spend(pricing))
+            if stop_reason is not None:
+                logger.info(f"Stopping for {stop_reason}, asking for the final answer.")
+                step = partial(society.final_answer_step, stop_reason)
+            else:
+                step = partial(society.step, input_msg)
+            round_start = time.perf_counter()
+            # 处理对话的一个步骤，接收助手消息并返回用户和助手的响应
+            # 到达截止时间时放弃当前轮次并结束对话
+            try:
+                if stream_tokens:
+                    (
+                        assistant_response,
+                        user_response,
+                    ) = yield from _step_with_token_events(
+                        society, step, _round, worker, deadline
+                    )
+                elif worker is not None:
+                    assistant_response, user_response = _step_before_deadline(
+                        step, worker, deadline
+                    )
+                else:
+                    assistant_response, user_response = step()
+            except SocietyTimeoutError:
+                logger.warning(f"Round #{_round} was abandoned at the deadline.")
+                stop_reason = "timeout"
+                break
+            round_seconds = time.perf_counter() - round_start
+            if society.tracer is not None:
+                society.tracer.record(
+                    f"round {_round}",
+                    "round",
+                    round_start,
+                    round_seconds,
+                    round_idx=_round,
+                )
+            # 统计本轮双方的token与工具调用（缺少usage的一方按0计）
+            round_usage = accounting.record_round(
+                _round, society, assistant_response, user_response, round_seconds
+            )
 
-        # 当前轮次对话历史
-        _data = {
-            "user": user_response.msg.content
-            if hasattr(user_response, "msg") and user_response.msg
-            else "",
-            "assistant": assistant_response.msg.content
-            if hasattr(assistant_response, "msg") and assistant_response.msg
-            else "",
-            "tool_calls": tool_call_records,
-        }
+            # 将工具调用转换为字典
+            tool_call_records: List[dict] = []
+            if assistant_response.info.get("tool_calls"):
+                for tool_call in assistant_response.info["tool_calls"]:
+                    tool_call_records.append(tool_call.as_dict())
+
+            # 当前轮次对话历史
+            _data = {
+                "user": user_response.msg.content
+                if hasattr(user_response, "msg") and user_response.msg
+                else "",
+                "assistant": assistant_response.msg.content
+                if hasattr(assistant_response, "msg") and assistant_response.msg
+                else "",
+                "tool_calls": tool_call_records,
+            }
+
+            # 更新对话历史
+            chat_history.append(_data)
+            logger.info(
+                f"Round #{_round} user_response:\n {user_response.msgs[0].content if user_response.msgs and len(user_response.msgs) > 0 else ''}"
+            )
+            logger.info(
+                f"Round #{_round} assistant_response:\n {assistant_response.msgs[0].content if assistant_response.msgs and len(assistant_response.msgs) > 0 else ''}"
+            )
 
-        # 更新对话历史
-        chat_history.append(_data)
-        logger.info(
-            f"Round #{_round} user_response:\n {user_response.msgs[0].content if user_response.msgs and len(user_response.msgs) > 0 else ''}"
-        )
-        logger.info(
-            f"Round #{_round} assistant_response:\n {assistant_response.msgs[0].content if assistant_response.msgs and len(assistant_response.msgs) > 0 else ''}"
-        )
+            # 检查其他终止条件
+            terminated = (
+                assistant_response.terminated
+                or user_response.terminated
+                or "TASK_DONE" in user_response.msg.content
+            )
+            if terminated and stop_reason is None:
+                stop_reason = (
+                    "terminated"
+                    if assistant_response.terminated or user_response.terminated
+                    else "task_done"
+                )
+
+            if checkpoint_path is not None:
+                save_checkpoint(
+                    SocietyCheckpoint.capture(
+                        society,
+                        _round + 1,
+                        round_limit,
+                        chat_history,
+                        {**accounting.to_dict(), "stop_reason": stop_reason},
+                        None if terminated else assistant_response.msg,
+                        finished=terminated,
+                    ),
+                    checkpoint_path,
+                )
+
+            yield from _round_events(_round, assistant_response, user_response)
+            yield RoundEndEvent(
+                _round,
+                usage={
+                    "user": round_usage["user"],
+                    "assistant": round_usage["assistant"],
+                },
+                timings=_round_timings(society, round_seconds),
+                terminated=terminated,
+            )
 
-        # 检查其他终止条件
-        if (
-            assistant_response.terminated
-            or user_response.terminated
-            or "TASK_DONE" in user_response.msg.content
-        ):
-            break
+            if terminated:
+                break
 
-        input_msg = assistant_response.msg
+            input_msg = assistant_response.msg
+    finally:
+        if worker is not None:
+            worker.shutdown()
+    # 超时后放弃的轮次可能仍在运行，保留截止时间使其尽快停止
+    if stop_reason != "timeout":
+        society.set_deadline(None)
 
     # 返回最终答案
-    answer = chat_history[-1]["assistant"]
+    answer = chat_history[-1]["assistant"] if chat_history else ""
     # 返回token信息
     token_info = {
-        "completion_token_count": overall_completion_token_count,
-        "prompt_token_count": overall_prompt_token_count,
+        **accounting.token_counts(),
+        "usage": accounting.to_dict(),
+        "prompt_layout": society.prompt_layout,
+        "saved_prompt_token_count": society.saved_prompt_token_count,
+        "stop_reason": stop_reason or "round_limit",
+        "spend": accounting.spend(pricing),
     }
 
-    return answer, chat_history, token_info
+    yield SocietyEndEvent(len(chat_history) - 1, answer, chat_history, token_info)
 
 
-async def arun_society(
+def run_society(
     society: OwlRolePlaying,
-    round_limit: int = 15,
+    round_limit: int = 5,
+    checkpoint_path: Optional[str] = None,
+    budget: Optional[SocietyBudget] = None,
+    timeout: Optional[float] = None,
+) -> Tuple[str, List[dict], dict]:
+    for event in iter_society(
+        society,
+        round_limit,
+        checkpoint_path=checkpoint_path,
+        budget=budget,
+        timeout=timeout,
+    ):
+        if isinstance(event, SocietyEndEvent):
+            return event.answer, event.chat_history, event.token_info
+    raise RuntimeError("iter_society ended without a SocietyEndEvent.")
+
+
+def resume_society(
+    society: OwlRolePlaying,
+    checkpoint: Union[str, SocietyCheckpoint],
+    round_limit: Optional[int] = None,
+    checkpoint_path: Optional[str] = None,
+    budget: Optional[SocietyBudget] = None,
+    timeout: Optional[float] = None,
 ) -> Tuple[str, List[dict], dict]:
-    overall_completion_token_count = 0
-    overall_prompt_token_count = 0
+    r"""Continue a :func:`run_society` run from a checkpoint.
+
+    The agents' models and tools cannot be serialized, so `society` has to be
+    built the same way as for the interrupted run; its memories are replaced
+    with the ones in the checkpoint.
+
+    Args:
+        society (OwlRolePlaying): A freshly built society for the same task.
+        checkpoint (Union[str, SocietyCheckpoint]): A checkpoint, or the path
+            it was written to.
+        round_limit (int, optional): The round limit, defaults to the one of
+            the interrupted run. (default: :obj:`None`)
+        checkpoint_path (str, optional): Where to keep writing checkpoints,
+            defaults to `checkpoint` if it is a path. (default: :obj:`None`)
+        budget (SocietyBudget, optional): The budget of the whole run,
+            including the rounds before the checkpoint. (default: :obj:`None`)
+        timeout (float, optional): The deadline of the resumed part of the
+            run in seconds. (default: :obj:`None`)
+
+    Returns:
+        Tuple[str, List[dict], dict]: Same as :func:`run_society`.
+    """
+    if isinstance(checkpoint, str):
+        checkpoint_path = checkpoint_path or checkpoint
+        checkpoint = load_checkpoint(checkpoint)
+    for event in iter_society(
+        society,
+        round_limit or checkpoint.round_limit,
+        checkpoint_path=checkpoint_path,
+        resume_from=checkpoint,
+        budget=budget,
+        timeout=timeout,
+    ):
+        if isinstance(event, SocietyEndEvent):
+            return event.answer, event.chat_history, event.token_info
+    raise RuntimeError("iter_society ended without a SocietyEndEvent.")
+
+
+async def aiter_society(
+    society: OwlRolePlaying,
+    round_limit: int = 15,
+    stream_tokens: bool = False,
+    checkpoint_path: Optional[str] = None,
+    resume_from: Optional[SocietyCheckpoint] = None,
+    budget: Optional[SocietyBudget] = None,
+    timeout: Optional[float] = None,
+) -> AsyncIterator[SocietyEvent]:
+    r"""Asynchronous version of :func:`iter_society`.
+
+    Args:
+        society (OwlRolePlaying): The society to run.
+        round_limit (int, optional): The maximum number of rounds.
+            (default: :obj:`15`)
+        stream_tokens (bool, optional): Whether to yield
+            :obj:`TokenDeltaEvent` while the model backend streams.
+            (default: :obj:`False`)
+        checkpoint_path (str, optional): Where to write a checkpoint after
+            every round, see :func:`save_checkpoint`. (default: :obj:`None`)
+        resume_from (SocietyCheckpoint, optional): Continue the run saved in
+            this checkpoint instead of starting a new chat.
+            (default: :obj:`None`)
+        budget (SocietyBudget, optional): Limits on tokens, time and cost.
+            Once one is exhausted the assistant gives its final answer and
+            the run stops. (default: :obj:`None`)
+        timeout (float, optional): The deadline of the run in seconds. A
+            round still running at the deadline is abandoned, the run ends
+            with the rounds finished so far and the stop reason `"timeout"`.
+            The agents start no further model or tool calls, so the society
+            should not be reused. (default: :obj:`None`)
+
+    Yields:
+        SocietyEvent: The events of the run, ending with a
+            :obj:`SocietyEndEvent`.
+    """
+    accounting = TokenAccounting()
+    pricing = budget or SocietyBudget()
+    stop_reason = None
 
     chat_history = []
     init_prompt = """
     Now please give me instructions to solve over overall task step by step. If the task requires some specific knowledge, please instruct me to use tools to complete the task.
         """
-    input_msg = society.init_chat(init_prompt)
-    for _round in range(round_limit):
-        assistant_response, user_response = await society.astep(input_msg)
-        # Check if usage info is available before accessing it
-        if assistant_response.info.get("usage") and user_response.info.get("usage"):
-            overall_prompt_token_count += assistant_response.info["usage"].get(
-                "completion_tokens", 0
+    start_round = 0
+    if resume_from is not None:
+        input_msg = resume_from.restore(society)
+        chat_history = list(resume_from.chat_history)
+        accounting = TokenAccounting.from_dict(resume_from.token_counters)
+        stop_reason = resume_from.token_counters.get("stop_reason")
+        start_round = round_limit if resume_from.finished else resume_from.next_round
+    else:
+        input_msg = society.init_chat(init_prompt)
+    deadline = time.perf_counter() + timeout if timeout is not None else None
+    society.set_deadline(deadline)
+    token_events: "asyncio.Queue[TokenDeltaEvent]" = asyncio.Queue()
+    for _round in range(start_round, round_limit):
+        # Once a budget is exhausted, skip the user agent and ask for the
+        # final answer
+        if budget is not None and stop_reason is None:
+            stop_reason = budget.exceeded(accounting.spend(pricing))
+        if stop_reason is not None:
+            logger.info(f"Stopping for {stop_reason}, asking for the final answer.")
+            step = partial(society.afinal_answer_step, stop_reason)
+        else:
+            step = partial(society.astep, input_msg)
+        round_start = time.perf_counter()
+        # A round still running at the deadline is cancelled
+        timed_out = False
+        if not stream_tokens:
+            try:
+                assistant_response, user_response = await asyncio.wait_for(
+                    step(), _remaining(deadline)
+                )
+            except (asyncio.TimeoutError, SocietyTimeoutError):
+                timed_out = True
+        else:
+            society.user_agent.token_callback = _threadsafe_token_callback(
+                token_events, _round, "user"
             )
-            overall_prompt_token_count += assistant_response.info["usage"].get(
-                "prompt_tokens", 0
-            ) + user_response.info["usage"].get("prompt_tokens", 0)
+            society.assistant_agent.token_callback = _threadsafe_token_callback(
+                token_events, _round, "assistant"
+            )
+            step_task = asyncio.ensure_future(step())
+            try:
+                while not step_task.done():
+                    getter = asyncio.ensure_future(token_events.get())
+                    done, _ = await asyncio.wait(
+                        {step_task, getter},
+                        timeout=_remaining(deadline),
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                    if getter in done:
+                        yield getter.result()
+                    else:
+                        getter.cancel()
+                    if not done:
+                        break
+                # Let pending `call_soon_threadsafe` callbacks run before draining
+                await asyncio.sleep(0)
+                while not token_events.empty():
+                    yield token_events.get_nowait()
+            finally:
+                if not step_task.done():
+                    step_task.cancel()
+                society.user_agent.token_callback = None
+                society.assistant_agent.token_callback = None
+            # A cancelled step has no result until the cancellation is done
+            await asyncio.gather(step_task, return_exceptions=True)
+            try:
+                assistant_response, user_response = step_task.result()
+            except (asyncio.CancelledError, SocietyTimeoutError):
+                timed_out = True
+        if timed_out:
+            logger.warning(f"Round #{_round} was cancelled at the deadline.")
+            stop_reason = "timeout"
+            break
+        round_seconds = time.perf_counter() - round_start
+        if society.tracer is not None:
+            society.tracer.record(
+                f"round {_round}", "round", round_start, round_seconds, round_idx=_round
+            )
+        # Account both sides of the round, a side without usage counts as 0
+        round_usage = accounting.record_round(
+            _round, society, assistant_response, user_response, round_seconds
+        )
 
         # convert tool call to dict
         tool_call_records: List[dict] = []
@@ -584,20 +1124,109 @@ async def arun_society(
         )
 
         # Check other termination conditions
-        if (
+        terminated = (
             assistant_response.terminated
             or user_response.terminated
             or "TASK_DONE" in user_response.msg.content
             or "任务已完成" in user_response.msg.content
-        ):
+        )
+        if terminated and stop_reason is None:
+            stop_reason = (
+                "terminated"
+                if assistant_response.terminated or user_response.terminated
+                else "task_done"
+            )
+
+        if checkpoint_path is not None:
+            save_checkpoint(
+                SocietyCheckpoint.capture(
+                    society,
+                    _round + 1,
+                    round_limit,
+                    chat_history,
+                    {**accounting.to_dict(), "stop_reason": stop_reason},
+                    None if terminated else assistant_response.msg,
+                    finished=terminated,
+                ),
+                checkpoint_path,
+            )
+
+        for event in _round_events(_round, assistant_response, user_response):
+            yield event
+        yield RoundEndEvent(
+            _round,
+            usage={
+                "user": round_usage["user"],
+                "assistant": round_usage["assistant"],
+            },
+            timings=_round_timings(society, round_seconds),
+            terminated=terminated,
+        )
+
+        if terminated:
             break
 
         input_msg = assistant_response.msg
 
-    answer = chat_history[-1]["assistant"]
+    # Tool calls of a cancelled round may still be running in executors
+    if stop_reason != "timeout":
+        society.set_deadline(None)
+    answer = chat_history[-1]["assistant"] if chat_history else ""
     token_info = {
-        "completion_token_count": overall_completion_token_count,
-        "prompt_token_count": overall_prompt_token_count,
+        **accounting.token_counts(),
+        "usage": accounting.to_dict(),
+        "prompt_layout": society.prompt_layout,
+        "saved_prompt_token_count": society.saved_prompt_token_count,
+        "stop_reason": stop_reason or "round_limit",
+        "spend": accounting.spend(pricing),
     }
 
-    return answer, chat_history, token_info
+    yield SocietyEndEvent(len(chat_history) - 1, answer, chat_history, token_info)
+
+
+async def arun_society(
+    society: OwlRolePlaying,
+    round_limit: int = 15,
+    checkpoint_path: Optional[str] = None,
+    budget: Optional[SocietyBudget] = None,
+    timeout: Optional[float] = None,
+) -> Tuple[str, List[dict], dict]:
+    # Close the HTTP client the async tools pooled their connections in
+    async with http_client_scope():
+        async for event in aiter_society(
+            society,
+            round_limit,
+            checkpoint_path=checkpoint_path,
+            budget=budget,
+            timeout=timeout,
+        ):
+            if isinstance(event, SocietyEndEvent):
+                return event.answer, event.chat_history, event.token_info
+    raise RuntimeError("aiter_society ended without a SocietyEndEvent.")
+
+
+async def aresume_society(
+    society: OwlRolePlaying,
+    checkpoint: Union[str, SocietyCheckpoint],
+    round_limit: Optional[int] = None,
+    checkpoint_path: Optional[str] = None,
+    budget: Optional[SocietyBudget] = None,
+    timeout: Optional[float] = None,
+) -> Tuple[str, List[dict], dict]:
+    r"""Asynchronous version of :func:`resume_society`, continuing an
+    :func:`arun_society` run."""
+    if isinstance(checkpoint, str):
+        checkpoint_path = checkpoint_path or checkpoint
+        checkpoint = load_checkpoint(checkpoint)
+    async with http_client_scope():
+        async for event in aiter_society(
+            society,
+            round_limit or checkpoint.round_limit,
+            checkpoint_path=checkpoint_path,
+            resume_from=checkpoint,
+            budget=budget,
+            timeout=timeout,
+        ):
+            if isinstance(event, SocietyEndEvent):
+                return event.answer, event.chat_history, event.token_info
+    raise RuntimeError("aiter_society ended without a SocietyEndEvent.")
@@ -0,0 +1,165 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from camel.logger import get_logger
+
+from .budget import SocietyBudget
+from .common import extract_pattern
+from .enhanced_role_playing import OwlRolePlaying, arun_society
+from .gaia_scoring import answer_key
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class EnsembleResult:
+    r"""The outcome of :func:`arun_ensemble`.
+
+    Args:
+        answer (str, optional): The first extracted answer of the winning
+            group, `None` if no run produced an answer.
+        votes (int): The number of runs that gave an equivalent answer.
+        agreement (float): `votes` divided by the number of runs launched,
+            a confidence signal in `[0, 1]`.
+        stopped_early (bool): Whether the remaining runs were cancelled
+            because a quorum agreed.
+        runs (List[Dict[str, Any]]): Every run's `status` (`"completed"`,
+            `"cancelled"` or `"failed"`), `answer`, `raw_answer`,
+            `chat_history` and `token_info`, in launch order.
+    """
+
+    answer: Optional[str]
+    votes: int
+    agreement: float
+    stopped_early: bool
+    runs: List[Dict[str, Any]] = field(default_factory=list)
+
+
+async def arun_ensemble(
+    build_society: Callable[[], OwlRolePlaying],
+    size: int = 3,
+    quorum: Optional[int] = None,
+    round_limit: int = 15,
+    budget: Optional[SocietyBudget] = None,
+    timeout: Optional[float] = None,
+    answer_pattern: str = "final_answer",
+) -> EnsembleResult:
+    r"""Run independent societies on the same task concurrently and take a
+    majority vote on their final answers (self-consistency).
+
+    Answers are grouped by :func:`answer_key`, the normalization of
+    :func:`question_scorer`, so answers agree exactly when they would get
+    the same score. As soon as `quorum` runs agree, the other runs are
+    cancelled to save their tokens. Otherwise the largest group wins, ties
+    going to the group that formed first.
+
+    Args:
+        build_society (Callable[[], OwlRolePlaying]): Builds a new society
+            for every run. Runs must not share toolkits holding state.
+        size (int, optional): The number of runs. (default: :obj:`3`)
+        quorum (int, optional): The number of agreeing runs that decides the
+            vote. (default: :obj:`None`, a majority of `size`)
+        round_limit (int, optional): Passed to :func:`arun_society`.
+            (default: :obj:`15`)
+        budget (SocietyBudget, optional): The budget of every single run.
+            (default: :obj:`None`)
+        timeout (float, optional): The deadline of every single run in
+            seconds. (default: :obj:`None`)
+        answer_pattern (str, optional): The tag holding the final answer.
+            (default: :obj:`"final_answer"`)
+
+    Returns:
+        EnsembleResult: The vote and the runs.
+    """
+    if quorum is None:
+        quorum = size // 2 + 1
+    if not 1 <= quorum <= size:
+        raise ValueError(
+            f"Invalid value for `quorum`: {quorum}, expected 1 <= quorum <= {size}."
+        )
+
+    societies = [build_society() for _ in range(size)]
+    tasks = [
+        asyncio.ensure_future(
+            arun_society(society, round_limit, budget=budget, timeout=timeout)
+        )
+        for society in societies
+    ]
+    runs: List[Dict[str, Any]] = [{"status": "cancelled"} for _ in range(size)]
+    # answer key -> indices of the runs, in the order the groups formed
+    groups: Dict[Any, List[int]] = {}
+    stopped_early = False
+
+    try:
+        pending = set(tasks)
+        while pending and not stopped_early:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                i = tasks.index(task)
+                try:
+                    raw_answer, chat_history, token_info = task.result()
+                except Exception as e:
+                    logger.warning(f"Ensemble run {i} failed: {e}")
+                    runs[i] = {"status": "failed", "error": str(e)}
+                    continue
+                answer = extract_pattern(raw_answer, answer_pattern)
+                runs[i] = {
+                    "status": "completed",
+                    "answer": answer,
+                    "raw_answer": raw_answer,
+                    "chat_history": chat_history,
+                    "token_info": token_info,
+                }
+                if answer is None:
+                    continue
+                group = groups.setdefault(answer_key(answer), [])
+                group.append(i)
+                if len(group) >= quorum:
+                    stopped_early = bool(pending)
+    finally:
+        for task, society in zip(tasks, societies):
+            if not task.done():
+                task.cancel()
+                # Tool calls already handed to executor threads keep
+                # running, but start no further model or tool calls
+                society.set_deadline(time.perf_counter())
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    if stopped_early:
+        logger.info(
+            f"Ensemble reached a quorum of {quorum}, cancelled "
+            f"{sum(run['status'] == 'cancelled' for run in runs)} runs."
+        )
+    if not groups:
+        return EnsembleResult(None, 0, 0.0, stopped_early, runs)
+    winner = max(groups.values(), key=len)
+    return EnsembleResult(
+        runs[winner[0]]["answer"],
+        len(winner),
+        len(winner) / size,
+        stopped_early,
+        runs,
+    )
+
+
+def run_ensemble(*args, **kwargs) -> EnsembleResult:
+    r"""Synchronous version of :func:`arun_ensemble`."""
+    return asyncio.run(arun_ensemble(*args, **kwargs))
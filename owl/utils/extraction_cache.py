@@ -0,0 +1,392 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import bisect
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from camel.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Documents without pages of their own are paged in chunks of this many
+# characters
+DEFAULT_PAGE_CHARS = 4000
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    r"""Return the sha256 hex digest of the contents of a file."""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _page_offsets(
+    content: str, page_chars: Optional[List[int]]
+) -> Tuple[List[int], List[int]]:
+    r"""Return the character and byte offsets of the pages of `content`,
+    which start at `page_chars`, or every :obj:`DEFAULT_PAGE_CHARS`."""
+    if not page_chars:
+        page_chars = list(range(0, max(len(content), 1), DEFAULT_PAGE_CHARS))
+    page_bytes = []
+    position = 0
+    for start, stop in zip(page_chars, page_chars[1:] + [len(content)]):
+        page_bytes.append(position)
+        position += len(content[start:stop].encode("utf-8"))
+    return page_chars, page_bytes
+
+
+class DocumentHandle:
+    r"""Ranged access to an extracted document. Reads only the requested
+    pages from the cache file, so huge documents are never held in memory
+    as a whole.
+
+    Args:
+        content_path (Path, optional): The text file of the content.
+        page_chars (List[int]): The character offset of every page.
+        page_bytes (List[int]): The byte offset of every page.
+        num_chars (int): The length of the content.
+        outline (List[Dict[str, Any]]): The headings or bookmarks of the
+            document, with their `title`, `level` and character offset
+            `char`.
+        paged (bool): Whether the pages are real pages (e.g. of a PDF)
+            rather than chunks of :obj:`DEFAULT_PAGE_CHARS` characters.
+        content (str, optional): The content, for documents that are not
+            cached. (default: :obj:`None`)
+        key (str, optional): The cache key of the document, `None` if it is
+            not cached. (default: :obj:`None`)
+    """
+
+    def __init__(
+        self,
+        content_path: Optional[Path],
+        page_chars: List[int],
+        page_bytes: List[int],
+        num_chars: int,
+        outline: List[Dict[str, Any]],
+        paged: bool,
+        content: Optional[str] = None,
+        key: Optional[str] = None,
+    ):
+        self.content_path = content_path
+        self.page_chars = page_chars
+        self.page_bytes = page_bytes
+        self.num_chars = num_chars
+        self.outline = outline
+        self.paged = paged
+        self._content = content
+        self.key = key
+
+    @classmethod
+    def from_text(
+        cls,
+        content: str,
+        page_chars: Optional[List[int]] = None,
+        outline: Optional[List[Dict[str, Any]]] = None,
+        key: Optional[str] = None,
+    ) -> "DocumentHandle":
+        r"""Return a handle of a document that is kept in memory."""
+        chars, offsets = _page_offsets(content, page_chars)
+        return cls(
+            None,
+            chars,
+            offsets,
+            len(content),
+            outline or [],
+            bool(page_chars),
+            content,
+            key,
+        )
+
+    @property
+    def num_pages(self) -> int:
+        return len(self.page_chars)
+
+    def page_of(self, char: int) -> int:
+        r"""Return the index of the page holding character `char`."""
+        return max(bisect.bisect_right(self.page_chars, char) - 1, 0)
+
+    def read_pages(self, start: int = 0, stop: Optional[int] = None) -> str:
+        r"""Return the content of the pages `[start, stop)`, 0-based."""
+        stop = self.num_pages if stop is None else min(stop, self.num_pages)
+        if start >= stop:
+            return ""
+        if self._content is not None:
+            end = self.page_chars[stop] if stop < self.num_pages else self.num_chars
+            return self._content[self.page_chars[start] : end]
+        with open(self.content_path, "rb") as f:
+            f.seek(self.page_bytes[start])
+            if stop < self.num_pages:
+                data = f.read(self.page_bytes[stop] - self.page_bytes[start])
+            else:
+                data = f.read()
+        return data.decode("utf-8")
+
+    def read_chars(self, start: int = 0, stop: Optional[int] = None) -> str:
+        r"""Return the characters `[start, stop)` of the content."""
+        stop = self.num_chars if stop is None else min(stop, self.num_chars)
+        if start >= stop:
+            return ""
+        first, last = self.page_of(start), self.page_of(stop - 1)
+        text = self.read_pages(first, last + 1)
+        offset = self.page_chars[first]
+        return text[start - offset : stop - offset]
+
+    def read(self) -> str:
+        r"""Return the whole content."""
+        return self.read_pages()
+
+
+class ExtractionCache:
+    r"""Extracted document contents stored on disk by the hash of the
+    document, so a file is extracted once however often or under whichever
+    name it is used.
+
+    Every entry is a text file `<key>.txt` with the extracted content, which
+    can be handed to an agent as is, and a `<key>.json` file with its
+    metadata. Keys include the extractor version, so entries of an older
+    extractor are never returned. Reading an entry marks it as used, and
+    once the cache outgrows `max_bytes` the least recently used entries are
+    removed.
+
+    Args:
+        cache_dir (Union[str, Path]): The directory of the cache.
+        max_bytes (int, optional): The size limit of the cache.
+            (default: :obj:`None`, unlimited)
+        version (str, optional): The version of the extractor filling the
+            cache. (default: :obj:`""`)
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        max_bytes: Optional[int] = None,
+        version: str = "",
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._size = sum(path.stat().st_size for path in self._entry_files())
+
+    def _entry_files(self) -> List[Path]:
+        return [
+            path
+            for path in self.cache_dir.glob("*/*")
+            if path.suffix in (".txt", ".json", ".idx")
+        ]
+
+    def _hash(self, *parts: str) -> str:
+        data = "\0".join((self.version, *parts)).encode("utf-8")
+        return hashlib.sha256(data).hexdigest()
+
+    def key(self, path: Union[str, Path], variant: str = "") -> str:
+        r"""Return the cache key of a local file. Extractions depending on
+        more than the file, e.g. image captions on the captioning model,
+        pass that as `variant`."""
+        if variant:
+            return self._hash(file_digest(path), variant)
+        return self._hash(file_digest(path))
+
+    def url_key(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        variant: str = "",
+    ) -> Optional[str]:
+        r"""Return the cache key of a remote document, `None` if the server
+        reports neither an ETag nor a modification time to tell whether the
+        document changed."""
+        if not etag and not last_modified:
+            return None
+        if variant:
+            return self._hash(url, etag or "", last_modified or "", variant)
+        return self._hash(url, etag or "", last_modified or "")
+
+    def content_path(self, key: str) -> Path:
+        r"""Return the text file holding the extracted content of `key`."""
+        return self.cache_dir / key[:2] / f"{key}.txt"
+
+    def _meta_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def index_path(self, key: str) -> Path:
+        r"""Return the file holding the search index of `key`."""
+        return self.cache_dir / key[:2] / f"{key}.idx"
+
+    def open(self, key: str) -> Optional[DocumentHandle]:
+        r"""Return a :obj:`DocumentHandle` of the cached entry of `key`,
+        `None` on a miss."""
+        meta_path = self._meta_path(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(meta_path)
+        except (OSError, json.JSONDecodeError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return DocumentHandle(
+            self.content_path(key),
+            entry["page_chars"],
+            entry["page_bytes"],
+            entry["num_chars"],
+            entry.get("outline", []),
+            entry.get("paged", False),
+            key=key,
+        )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        r"""Return the cached entry of `key` with its `content`, `None` on a
+        miss."""
+        meta_path = self._meta_path(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            entry["content"] = self.content_path(key).read_text(encoding="utf-8")
+            # The modification time of the metadata orders the entries for
+            # eviction
+            os.utime(meta_path)
+        except (OSError, json.JSONDecodeError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return entry
+
+    def put(
+        self,
+        key: str,
+        content: Any,
+        page_chars: Optional[List[int]] = None,
+        outline: Optional[List[Dict[str, Any]]] = None,
+        **metadata,
+    ) -> Path:
+        r"""Store the extracted content of `key` and return its text file.
+        Contents that are not strings (e.g. parsed JSON) are serialized.
+
+        Args:
+            key (str): The key of the document.
+            content (Any): The extracted content.
+            page_chars (List[int], optional): The character offsets at
+                which the pages of the document start. (default:
+                :obj:`None`, chunks of :obj:`DEFAULT_PAGE_CHARS` characters)
+            outline (List[Dict[str, Any]], optional): The headings of the
+                document, see :obj:`DocumentHandle`. (default: :obj:`None`)
+            **metadata: Stored with the entry, e.g. the `source` path.
+        """
+        if not isinstance(content, str):
+            content = json.dumps(content, ensure_ascii=False, default=str)
+        chars, offsets = _page_offsets(content, page_chars)
+        metadata.update(
+            num_chars=len(content),
+            page_chars=chars,
+            page_bytes=offsets,
+            paged=bool(page_chars),
+            outline=outline or [],
+        )
+        content_path = self.content_path(key)
+        content_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write the content before the metadata, which marks the entry as
+        # complete, and replace both atomically so readers never see a
+        # partial entry
+        self._write(content_path, content)
+        self._write(
+            self._meta_path(key),
+            json.dumps(
+                {"key": key, "version": self.version, **metadata},
+                ensure_ascii=False,
+                default=str,
+            ),
+        )
+        self._evict()
+        return content_path
+
+    def put_index(self, key: str, data: str) -> None:
+        r"""Store the serialized search index of a cached entry. It counts
+        towards the size of the cache and is evicted with its entry."""
+        if not self._meta_path(key).exists():
+            return
+        self._write(self.index_path(key), data)
+        self._evict()
+
+    def get_index(self, key: str) -> Optional[str]:
+        r"""Return the serialized search index of `key`, `None` if there is
+        none."""
+        try:
+            return self.index_path(key).read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def _write(self, path: Path, data: str) -> None:
+        tmp_path = path.with_name(
+            f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        tmp_path.write_text(data, encoding="utf-8")
+        size = tmp_path.stat().st_size
+        with self._lock:
+            if path.exists():
+                self._size -= path.stat().st_size
+            os.replace(tmp_path, path)
+            self._size += size
+
+    def _evict(self) -> None:
+        with self._lock:
+            if self.max_bytes is None or self._size <= self.max_bytes:
+                return
+            meta_paths = sorted(
+                self.cache_dir.glob("*/*.json"), key=lambda path: path.stat().st_mtime
+            )
+            for meta_path in meta_paths:
+                if self._size <= self.max_bytes:
+                    break
+                for path in (
+                    meta_path,
+                    meta_path.with_suffix(".txt"),
+                    meta_path.with_suffix(".idx"),
+                ):
+                    try:
+                        size = path.stat().st_size
+                        path.unlink()
+                        self._size -= size
+                    except FileNotFoundError:
+                        pass
+                self.evictions += 1
+            logger.debug(f"Extraction cache evicted down to {self._size} bytes.")
+
+    def stats(self) -> Dict[str, Optional[int]]:
+        r"""Return the `hits`, `misses` and `evictions` so far and the
+        current `bytes` of the cache."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+            }
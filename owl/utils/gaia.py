@@ -15,23 +15,45 @@ import sys
 
 sys.path.append("../")
 
+import hashlib
 import json
+import os
 import random
-import re
-import string
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional, Union, Tuple
+from typing import Any, Callable, Dict, List, Literal, Optional, Union, Tuple
 
 from tqdm import tqdm
 from camel.benchmarks import BaseBenchmark
 from camel.tasks import Task
 from camel.logger import get_logger
 
+from . import gaia_scoring
+from .benchmark_report import performance_report
 from .common import extract_pattern
+from .enhanced_chat_agent import is_thread_safe_tool
 from .enhanced_role_playing import run_society, OwlGAIARolePlaying
+from .extraction_cache import ExtractionCache
+from .gaia_dataset import GAIADataset
+from .result_store import ResultStore, load_results
 
 logger = get_logger(__name__)
 
+# Results kept by `merge_results` when a task appears in several files, from
+# the most to the least preferred status
+_STATUS_PREFERENCE = ["completed", "timeout", "skipped", "failed"]
+
+# Attachments `DocumentProcessingToolkit` cannot extract
+_UNEXTRACTABLE_SUFFIXES = {".mp3", ".wav", ".m4a", ".mp4", ".mov"}
+
+
+def task_shard(task_id: str, shard_count: int) -> int:
+    r"""Return the shard of a task. The hash is stable across processes and
+    machines, unlike Python's `hash`."""
+    digest = hashlib.sha256(task_id.encode("utf-8")).hexdigest()
+    return int(digest, 16) % shard_count
+
 
 class GAIABenchmark(BaseBenchmark):
     r"""GAIA Benchmark adapted from `"GAIA: a benchmark for General AI
@@ -40,9 +62,11 @@ class GAIABenchmark(BaseBenchmark):
 
     Args:
         data_dir (str): The directory to save the data.
-        save_to (str): The file to save the results.
-        processes (int, optional): The number of processes to use.
-            (default: :obj:`1`)
+        save_to (str): The file to save the results. A `.jsonl` file is
+            used as an append-only :obj:`ResultStore`, any other file is
+            rewritten as one JSON list after every task.
+        processes (int, optional): The number of tasks :meth:`run` executes
+            concurrently. (default: :obj:`1`)
     """
 
     def __init__(
@@ -56,10 +80,15 @@ class GAIABenchmark(BaseBenchmark):
         Args:
             data_dir (str): The directory to save the data.
             save_to (str): The file to save the results.
-            processes (int, optional): The number of processes to use for
-                parallel processing. (default: :obj:`1`)
+            processes (int, optional): The number of tasks :meth:`run`
+                executes concurrently. (default: :obj:`1`)
         """
         super().__init__("gaia", data_dir, save_to, processes)
+        self._result_store: Optional[ResultStore] = None
+        self._completed_task_ids: set = set()
+        self._attachment_cache: Optional[ExtractionCache] = None
+        self._attachment_toolkit: Optional[Any] = None
+        self._attachment_digest_chars = 500
 
     def download(self):
         r"""Download the GAIA dataset."""
@@ -73,10 +102,7 @@ class GAIABenchmark(BaseBenchmark):
         )
 
     def _check_task_completed(self, task_id: str) -> bool:
-        for data in self._results:
-            if data["task_id"] == task_id:
-                return True
-        return False
+        return task_id in self._completed_task_ids
 
     def dump_tasks(self, save_path: str, datas):
         constructed_data = []
@@ -98,7 +124,8 @@ class GAIABenchmark(BaseBenchmark):
         print(f"Successfully dumped tasks to {save_path}")
 
     def load(self, force_download=False):
-        r"""Load the GAIA dataset.
+        r"""Load the GAIA dataset. The splits are :obj:`GAIADataset` objects,
+        which read the tasks on demand.
 
         Args:
             force_download (bool, optional): Whether to
@@ -108,27 +135,18 @@ class GAIABenchmark(BaseBenchmark):
             logger.info("Force downloading data.")
             self.download()
 
-        # Define validation and test directories
-        valid_dir = self.data_dir / "2023/validation"
-        test_dir = self.data_dir / "2023/test"
+        metadata_paths = {
+            "valid": self.data_dir / "2023/validation/metadata.jsonl",
+            "test": self.data_dir / "2023/test/metadata.jsonl",
+        }
 
-        # Check if directories exist; if not, download the data
-        if not valid_dir.is_dir() or not test_dir.is_dir():
+        # Only download if the metadata files are missing
+        if not all(path.is_file() for path in metadata_paths.values()):
             logger.info("Data not found. Downloading data.")
             self.download()
 
-        # Load metadata for both validation and test datasets
-        for path, label in zip([valid_dir, test_dir], ["valid", "test"]):
-            self._data[label] = []
-            with open(path / "metadata.jsonl", "r") as f:
-                lines = f.readlines()
-                for line in lines:
-                    data = json.loads(line)
-                    if data["task_id"] == "0-0-0-0-0":
-                        continue
-                    if data["file_name"]:
-                        data["file_name"] = path / data["file_name"]
-                    self._data[label].append(data)
+        for label, path in metadata_paths.items():
+            self._data[label] = GAIADataset(path)
         return self
 
     @property
@@ -140,15 +158,66 @@ class GAIABenchmark(BaseBenchmark):
         self,
         user_role_name: str,
         assistant_role_name: str,
-        user_agent_kwargs: dict,
-        assistant_agent_kwargs: dict,
+        user_agent_kwargs: Union[dict, Callable[[], dict]],
+        assistant_agent_kwargs: Union[dict, Callable[[], dict]],
         on: Literal["train", "valid", "test"],
         level: Union[int, List[int], Literal["all"]],
         randomize: bool = False,
         subset: Optional[int] = None,
         idx: Optional[List[int]] = None,
+        task_ids: Optional[List[str]] = None,
         save_result: bool = False,
+        concurrency: Optional[int] = None,
+        task_timeout: Optional[float] = None,
+        shard_index: int = 0,
+        shard_count: int = 1,
     ) -> Dict[str, Any]:
+        r"""Run the benchmark.
+
+        With a concurrency above `1` the tasks run on a thread pool, each in
+        a fresh :obj:`OwlGAIARolePlaying`. The results are kept in task
+        order regardless of which task finishes first. Toolkits holding
+        per-thread state (e.g. the browser toolkit) must not be shared
+        between tasks, so pass the agent kwargs as a function building new
+        ones; it is called in the worker thread for every task.
+
+        Args:
+            user_role_name (str): The role name of the user agent.
+            assistant_role_name (str): The role name of the assistant agent.
+            user_agent_kwargs (Union[dict, Callable[[], dict]]): The kwargs of
+                the user agent, or a function returning them.
+            assistant_agent_kwargs (Union[dict, Callable[[], dict]]): The
+                kwargs of the assistant agent, or a function returning them.
+            on (Literal["valid", "test"]): The split to run on.
+            level (Union[int, List[int], Literal["all"]]): The levels to run.
+            randomize (bool, optional): Whether to shuffle the tasks.
+                (default: :obj:`False`)
+            subset (int, optional): Only run the first `subset` tasks.
+                (default: :obj:`None`)
+            idx (List[int], optional): Only run the tasks at these indices.
+                (default: :obj:`None`)
+            task_ids (List[str], optional): Only run these tasks, in this
+                order, e.g. to rerun failed tasks. Tasks not in `level` are
+                left out. (default: :obj:`None`)
+            save_result (bool, optional): Whether to save the results to
+                `save_to` after every task and skip the tasks already saved
+                there. Tasks saved as failed (their society raised) are run
+                again. (default: :obj:`False`)
+            concurrency (int, optional): The number of tasks run at the same
+                time. (default: :obj:`None`, uses `processes`)
+            task_timeout (float, optional): The wall-clock seconds a task may
+                run. A task reaching it is recorded with its partial history
+                and the status `"timeout"`, and the run moves on.
+                (default: :obj:`None`)
+            shard_index (int, optional): The shard to run, to split the
+                selected tasks across machines. Combine the result files
+                with :meth:`merge_results`. (default: :obj:`0`)
+            shard_count (int, optional): The number of shards.
+                (default: :obj:`1`)
+
+        Returns:
+            Dict[str, Any]: The summary of the results.
+        """
         # Validate inputs
         if on not in ["valid", "test"]:
             raise ValueError(
@@ -166,103 +235,427 @@ class GAIABenchmark(BaseBenchmark):
             raise ValueError(
                 f"Invalid value for `level`: {level}, expected 1, 2, 3 " "or 'all'."
             )
+        if not 0 <= shard_index < shard_count:
+            raise ValueError(
+                f"Invalid value for `shard_index`: {shard_index}, expected "
+                f"0 <= shard_index < {shard_count}."
+            )
         logger.info(f"Running benchmark on {on} set at levels {levels}.")
-        datas = [data for data in self._data[on] if data["Level"] in levels]
+        # Tasks are selected by id and only the selected ones are read
+        dataset = self._data[on]
+        selected = dataset.task_ids(levels)
+        if task_ids is not None:
+            unknown = [task_id for task_id in task_ids if task_id not in dataset]
+            if unknown:
+                raise ValueError(f"Unknown task ids for the {on} set: {unknown}")
+            in_levels = set(selected)
+            selected = [task_id for task_id in task_ids if task_id in in_levels]
         # Shuffle and subset data if necessary
         if randomize:
-            random.shuffle(datas)
+            random.shuffle(selected)
         if subset:
-            datas = datas[:subset]
+            selected = selected[:subset]
 
         if idx is not None:
             # pick only the tasks with the specified idx
             if len(idx) != 0:
-                datas = [datas[i] for i in idx]
+                selected = [selected[i] for i in idx]
+
+        if shard_count > 1:
+            selected = [
+                task_id
+                for task_id in selected
+                if task_shard(task_id, shard_count) == shard_index
+            ]
+            logger.info(f"Running shard {shard_index} of {shard_count}.")
 
-        logger.info(f"Number of tasks: {len(datas)}")
+        logger.info(f"Number of tasks: {len(selected)}")
 
         self._results = []
+        self._result_store = None
 
         if save_result:
-            try:
-                with open(self.save_to, "r", encoding="utf-8") as f:
-                    self._results = json.load(f)
-                f.close()
-            except Exception as e:
-                logger.warning(e)
-                # raise FileNotFoundError(f"{self.save_to} does not exist.")
-        datas = [
-            data for data in datas if not self._check_task_completed(data["task_id"])
+            if Path(self.save_to).suffix == ".jsonl":
+                # Earlier results are loaded without their chat histories
+                self._result_store = ResultStore(self.save_to)
+                self._results = self._result_store.results()
+            else:
+                try:
+                    with open(self.save_to, "r", encoding="utf-8") as f:
+                        self._results = json.load(f)
+                    f.close()
+                except Exception as e:
+                    logger.warning(e)
+                    # raise FileNotFoundError(f"{self.save_to} does not exist.")
+        # Failed tasks usually hit a transient error (e.g. of a model API),
+        # so a resumed run retries them and replaces their results
+        retried = {
+            result["task_id"]
+            for result in self._results
+            if result.get("status") == "failed"
+        } & set(selected)
+        self._results = [
+            result for result in self._results if result["task_id"] not in retried
         ]
+        self._completed_task_ids = {result["task_id"] for result in self._results}
+        datas = list(
+            dataset.select(
+                task_id
+                for task_id in selected
+                if not self._check_task_completed(task_id)
+            )
+        )
         logger.info(f"Number of tasks to be processed: {len(datas)}")
+
+        society_kwargs = {
+            "task_timeout": task_timeout,
+            "user_role_name": user_role_name,
+            "assistant_role_name": assistant_role_name,
+            "user_agent_kwargs": user_agent_kwargs,
+            "assistant_agent_kwargs": assistant_agent_kwargs,
+        }
+        concurrency = concurrency or self.processes
         # Process tasks
-        for task in tqdm(datas, desc="Running"):
-            if_prepared_task, info = self._prepare_task(task)
-            if not if_prepared_task:
-                _result_info = {
-                    "task_id": task["task_id"],
-                    "question": task["Question"],
-                    "level": task["Level"],
-                    "model_answer": None,
-                    "ground_truth": None,
-                    "score": 0,
-                    "history": None,
-                }
-                self._results.append(_result_info)
-                continue
+        if concurrency > 1:
+            self._run_concurrently(datas, society_kwargs, concurrency, save_result)
+        else:
+            for task in tqdm(datas, desc="Running"):
+                result = self._run_task(task, **society_kwargs)
+                self._results.append(result)
+                if save_result:
+                    self._save_result(result)
+
+        return self._generate_summary()
+
+    def _run_concurrently(
+        self,
+        datas: List[Dict[str, Any]],
+        society_kwargs: Dict[str, Any],
+        concurrency: int,
+        save_result: bool,
+    ) -> None:
+        r"""Run the tasks on a thread pool and append their results to
+        `self._results` in task order."""
+        shared_tools = [
+            tool
+            for tool in (
+                society_kwargs["assistant_agent_kwargs"].get("tools") or []
+                if isinstance(society_kwargs["assistant_agent_kwargs"], dict)
+                else []
+            )
+            if not is_thread_safe_tool(tool)
+        ]
+        if shared_tools:
+            logger.warning(
+                f"Tools {[tool.get_function_name() for tool in shared_tools]} are "
+                "not thread-safe but shared by concurrent tasks, pass the agent "
+                "kwargs as a function to build them per task."
+            )
+
+        previous_results = list(self._results)
+        finished: Dict[int, Dict[str, Any]] = {}
+        with ThreadPoolExecutor(max_workers=concurrency) as executor, tqdm(
+            total=len(datas), desc="Running"
+        ) as progress:
+            futures = {
+                executor.submit(self._run_task, task, **society_kwargs): i
+                for i, task in enumerate(datas)
+            }
+            # Results are only touched from this thread
+            for future in as_completed(futures):
+                result = future.result()
+                finished[futures[future]] = result
+                self._results = previous_results + [
+                    finished[i] for i in sorted(finished)
+                ]
+                if save_result:
+                    self._save_result(result)
+                progress.update(1)
+
+    def _run_task(
+        self,
+        task: Dict[str, Any],
+        user_role_name: str,
+        assistant_role_name: str,
+        user_agent_kwargs: Union[dict, Callable[[], dict]],
+        assistant_agent_kwargs: Union[dict, Callable[[], dict]],
+        task_timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        r"""Run one task in a fresh society and return its result. A task
+        whose society raises gets the status `"failed"` and the error."""
+        start = time.perf_counter()
+        if_prepared_task, info = self._prepare_task(task)
+        if not if_prepared_task:
+            _result_info = {
+                "task_id": task["task_id"],
+                "question": task["Question"],
+                "level": task["Level"],
+                "model_answer": None,
+                "ground_truth": None,
+                "score": 0,
+                "history": None,
+                "status": "skipped",
+            }
+            return _result_info
+        try:
+            logger.info(f"Task Question: {task['Question']}")
+            logger.info(f"Required tools: {task['Annotator Metadata']['Tools']}")
+
+            task_kwargs = {
+                "task_prompt": task["Question"],
+                "with_task_specify": False,
+            }
+
+            # The society may update the agent kwargs, so every task gets
+            # its own copy of them
+            society = OwlGAIARolePlaying(
+                **task_kwargs,
+                user_role_name=user_role_name,
+                user_agent_kwargs=(
+                    user_agent_kwargs()
+                    if callable(user_agent_kwargs)
+                    else dict(user_agent_kwargs)
+                ),
+                assistant_role_name=assistant_role_name,
+                assistant_agent_kwargs=(
+                    assistant_agent_kwargs()
+                    if callable(assistant_agent_kwargs)
+                    else dict(assistant_agent_kwargs)
+                ),
+            )
+
+            raw_answer, chat_history, token_info = run_society(
+                society, timeout=task_timeout
+            )
             try:
-                logger.info(f"Task Question: {task['Question']}")
-                logger.info(f"Required tools: {task['Annotator Metadata']['Tools']}")
-
-                task_kwargs = {
-                    "task_prompt": task["Question"],
-                    "with_task_specify": False,
-                }
-
-                society = OwlGAIARolePlaying(
-                    **task_kwargs,
-                    user_role_name=user_role_name,
-                    user_agent_kwargs=user_agent_kwargs,
-                    assistant_role_name=assistant_role_name,
-                    assistant_agent_kwargs=assistant_agent_kwargs,
+                answer = extract_pattern(raw_answer, "final_answer")
+            except Exception as e:
+                logger.error(
+                    f"Error in extracting final answer from text {raw_answer}: {e}"
                 )
+                answer = None
+
+            logger.info(f"Model answer: {answer}, Ground truth: {task['Final answer']}")
+
+            _result_info = {
+                "task_id": task["task_id"],
+                "question": task["Question"]
+                + "Please decompose the task into several sub-tasks and find the answer step-by-step.",
+                "level": task["Level"],
+                "model_answer": answer,
+                # Kept so the answer can be re-extracted and rescored offline
+                "raw_answer": raw_answer,
+                "ground_truth": task["Final answer"],
+                # Timed out or malformed runs have no answer to score
+                "score": self.question_scorer(answer, task["Final answer"])
+                if answer is not None
+                else False,
+                "token_info": token_info,
+                "history": chat_history,
+                "status": "timeout"
+                if token_info["stop_reason"] == "timeout"
+                else "completed",
+                "duration": time.perf_counter() - start,
+            }
+            if _result_info["status"] == "timeout":
+                logger.warning(
+                    f"Task {task['task_id']} timed out after {len(chat_history)} rounds."
+                )
+            return _result_info
+
+        except Exception as e:
+            logger.error(f"Error in processing task {task['task_id']}: {e}")
+            return {
+                "task_id": task["task_id"],
+                "question": task["Question"],
+                "level": task["Level"],
+                "model_answer": None,
+                "ground_truth": task["Final answer"],
+                "score": False,
+                "history": None,
+                "status": "failed",
+                "error": f"{type(e).__name__}: {e}",
+                "duration": time.perf_counter() - start,
+            }
 
-                raw_answer, chat_history, token_info = run_society(society)
-                try:
-                    answer = extract_pattern(raw_answer, "final_answer")
-                except Exception as e:
-                    logger.error(
-                        f"Error in extracting final answer from text {raw_answer}: {e}"
-                    )
-                    answer = None
+    def _save_result(self, result: Dict[str, Any]) -> None:
+        r"""Persist a new result, which is already in `self._results`."""
+        self._completed_task_ids.add(result["task_id"])
+        if self._result_store is not None:
+            self._result_store.append(result)
+            return
+        self._write_results()
+
+    def _write_results(self) -> None:
+        # Replace the file atomically so a crash cannot corrupt it
+        tmp_path = f"{self.save_to}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._results, f, indent=4, ensure_ascii=False)
+        f.close()
+        os.replace(tmp_path, self.save_to)
 
-                logger.info(
-                    f"Model answer: {answer}, Ground truth: {task['Final answer']}"
-                )
+    def merge_results(
+        self, result_paths: List[str], save_result: bool = True
+    ) -> Dict[str, Any]:
+        r"""Combine the result files of several (e.g. sharded) runs.
 
-                _result_info = {
-                    "task_id": task["task_id"],
-                    "question": task["Question"]
-                    + "Please decompose the task into several sub-tasks and find the answer step-by-step.",
-                    "level": task["Level"],
-                    "model_answer": answer,
-                    "ground_truth": task["Final answer"],
-                    "score": self.question_scorer(answer, task["Final answer"]),
-                    "token_info": token_info,
-                    "history": chat_history,
-                }
-                self._results.append(_result_info)
+        A task found in several files keeps its completed result over a
+        timed-out, skipped or failed one, and the result of the later file among
+        equals. All answers are extracted again from the raw answers and
+        rescored, see :func:`owl.utils.gaia_scoring.score_result`.
 
-            except Exception as e:
-                logger.error(f"Error in processing task: {e}")
+        Args:
+            result_paths (List[str]): The JSON or JSONL result files.
+            save_result (bool, optional): Whether to write the merged results
+                to `save_to`. (default: :obj:`True`)
+
+        Returns:
+            Dict[str, Any]: The summary of the merged results.
+        """
 
-            if save_result:
-                with open(self.save_to, "w") as f:
-                    json.dump(self._results, f, indent=4, ensure_ascii=False)
-                f.close()
+        def _rank(result: Dict[str, Any]) -> int:
+            status = result.get("status", "completed")
+            if status in _STATUS_PREFERENCE:
+                return _STATUS_PREFERENCE.index(status)
+            return len(_STATUS_PREFERENCE)
+
+        merged: Dict[str, Dict[str, Any]] = {}
+        for path in result_paths:
+            results = load_results(path)
+            logger.info(f"Loaded {len(results)} results from {path}")
+            for result in results:
+                task_id = result["task_id"]
+                previous = merged.get(task_id)
+                if previous is None or _rank(result) <= _rank(previous):
+                    merged[task_id] = result
+
+        for result in merged.values():
+            result["model_answer"], result["score"] = gaia_scoring.score_result(result)
+        self._results = list(merged.values())
 
+        if save_result:
+            # `save_to` may be one of the merged files, so it is replaced
+            # rather than appended to
+            if Path(self.save_to).suffix == ".jsonl":
+                ResultStore(self.save_to).replace(self._results)
+            else:
+                self._write_results()
         return self._generate_summary()
 
+    def preextract_attachments(
+        self,
+        cache_dir: Optional[str] = None,
+        toolkit: Optional[Any] = None,
+        concurrency: Optional[int] = None,
+        digest_chars: int = 500,
+    ) -> Dict[str, int]:
+        r"""Extract the attachments of all loaded tasks ahead of the run.
+
+        The contents land in the extraction cache of the toolkit, keyed by
+        file hash, so later runs, tasks sharing a file and agents using a
+        toolkit with the same `cache_dir` reuse them. Afterwards the
+        prompt of a task with a short extracted attachment carries its
+        content, and that of a longer one its size and the tools to read it
+        with, which spares the assistant the extraction rounds.
+
+        Args:
+            cache_dir (str, optional): The `cache_dir` of the new toolkit.
+                (default: :obj:`None`, `<data_dir>/cache`)
+            toolkit (DocumentProcessingToolkit, optional): The toolkit to
+                extract with, its cache must be enabled.
+                (default: :obj:`None`, a new toolkit)
+            concurrency (int, optional): The number of attachments extracted
+                at once. (default: :obj:`None`, `processes`)
+            digest_chars (int, optional): The length up to which the
+                content is added to the prompt. (default: :obj:`500`)
+
+        Returns:
+            Dict[str, int]: The number of attachments that were `extracted`,
+                already `cached`, `failed` or `skipped` as unsupported.
+        """
+        if toolkit is None:
+            from .document_toolkit import DocumentProcessingToolkit
+
+            toolkit = DocumentProcessingToolkit(
+                cache_dir=str(cache_dir or self.data_dir / "cache")
+            )
+        cache = toolkit.extraction_cache
+        if cache is None:
+            raise ValueError("The toolkit must be created with `use_cache=True`.")
+        stats = {"extracted": 0, "cached": 0, "failed": 0, "skipped": 0}
+
+        file_names = sorted(
+            {
+                str(task["file_name"])
+                for tasks in self._data.values()
+                for task in tasks
+                if task["file_name"]
+            }
+        )
+        # key -> one of the files with that content
+        pending: Dict[str, str] = {}
+        for file_name in file_names:
+            path = Path(file_name)
+            if path.suffix.lower() in _UNEXTRACTABLE_SUFFIXES or not path.exists():
+                stats["skipped"] += 1
+                continue
+            key = cache.key(path, toolkit.cache_variant(file_name))
+            if key in pending or cache.get(key) is not None:
+                stats["cached"] += 1
+            else:
+                pending[key] = file_name
+
+        def _extract(file_name: str) -> bool:
+            try:
+                success, content = toolkit.extract_document_content(file_name)
+            except Exception as e:
+                logger.warning(f"Failed to extract {file_name}: {e}")
+                return False
+            if not success:
+                logger.warning(f"Failed to extract {file_name}: {content}")
+                return False
+            return True
+
+        with ThreadPoolExecutor(max_workers=concurrency or self.processes) as pool:
+            futures = [
+                pool.submit(_extract, file_name) for file_name in pending.values()
+            ]
+            for future in tqdm(
+                as_completed(futures), total=len(futures), desc="Extracting"
+            ):
+                stats["extracted" if future.result() else "failed"] += 1
+
+        self._attachment_cache = cache
+        self._attachment_toolkit = toolkit
+        self._attachment_digest_chars = digest_chars
+        logger.info(f"Pre-extracted attachments: {stats}")
+        return stats
+
+    def _attachment_digest(self, file_path: Path) -> Optional[str]:
+        r"""Return the prompt note of a pre-extracted attachment, `None` if
+        it was not extracted. The note is part of the task, which the full
+        prompt layout repeats every round, so only short contents are
+        inlined and longer ones are pointed to."""
+        if self._attachment_cache is None or self._attachment_toolkit is None:
+            return None
+        key = self._attachment_cache.key(
+            file_path, self._attachment_toolkit.cache_variant(str(file_path))
+        )
+        handle = self._attachment_cache.open(key)
+        if handle is None:
+            return None
+        if handle.num_chars <= self._attachment_digest_chars:
+            return (
+                f" The content of {file_path.name} has already been extracted:"
+                f"\n{handle.read()}"
+            )
+        return (
+            f" The content of {file_path.name} has already been extracted "
+            f"({handle.num_chars} characters, {handle.num_pages} pages), call "
+            f"`get_document_outline` or `search_document` on {file_path} and "
+            f"read the relevant pages with `extract_document_content`."
+        )
+
     def _prepare_task(self, task: Dict[str, Any]) -> Tuple[bool, str]:
         r"""Prepare the task by validating and enriching its data."""
         if task["file_name"]:
@@ -292,6 +685,10 @@ class GAIABenchmark(BaseBenchmark):
             else:
                 task["Question"] += f" Here are the necessary files: {file_path}"
 
+            digest = self._attachment_digest(file_path)
+            if digest is not None:
+                task["Question"] += digest
+
         return True, None
 
     def _create_task(self, task: Dict[str, Any]) -> Task:
@@ -308,17 +705,23 @@ class GAIABenchmark(BaseBenchmark):
     def _generate_summary(self) -> Dict[str, Any]:
         r"""Generate and return a summary of the benchmark results."""
         correct = sum(result["score"] for result in self._results)
+        timeouts = [r for r in self._results if r.get("status") == "timeout"]
+        failed = [r for r in self._results if r.get("status") == "failed"]
         return {
             "total": len(self._results),
             "correct": correct,
             "results": self._results,
             "accuracy": correct / len(self._results) if len(self._results) > 0 else 0,
+            "timeouts": len(timeouts),
+            "timeout_seconds": sum(r.get("duration", 0) for r in timeouts),
+            "failed": len(failed),
+            "total_seconds": sum(r.get("duration", 0) for r in self._results),
+            "performance": performance_report(self._results),
         }
 
     def question_scorer(self, model_answer: str, ground_truth: str) -> bool:
-        r"""Scorer for the GAIA benchmark.
-        https://huggingface.co/spaces/gaia-benchmark/leaderboard/blob/main/
-        scorer.py
+        r"""Scorer for the GAIA benchmark, see
+        :func:`owl.utils.gaia_scoring.question_scorer`.
 
         Args:
             model_answer (str): The model answer.
@@ -327,55 +730,10 @@ class GAIABenchmark(BaseBenchmark):
         Returns:
             bool: The score of the model
         """
-
-        def is_float(element: Any) -> bool:
-            try:
-                float(element)
-                return True
-            except ValueError:
-                return False
-
-        if is_float(ground_truth):
-            logger.info(f"Evaluating {model_answer} as a number.")
-            normalized_answer = self.normalize_number_str(model_answer)
-            return normalized_answer == float(ground_truth)
-
-        elif any(char in ground_truth for char in [",", ";"]):
-            logger.info(f"Evaluating {model_answer} as a comma separated list.")
-            gt_elems = self.split_string(ground_truth)
-            ma_elems = self.split_string(model_answer)
-
-            if len(gt_elems) != len(ma_elems):
-                logger.warning(
-                    "Answer lists have different lengths, returning False.",
-                    UserWarning,
-                )
-                return False
-
-            comparisons = []
-            for ma_elem, gt_elem in zip(ma_elems, gt_elems):
-                if is_float(gt_elem):
-                    normalized_ma_elem = self.normalize_number_str(ma_elem)
-                    comparisons.append(normalized_ma_elem == float(gt_elem))
-                else:
-                    ma_elem = self.normalize_str(ma_elem, remove_punct=False)
-                    gt_elem = self.normalize_str(gt_elem, remove_punct=False)
-                    comparisons.append(ma_elem == gt_elem)
-            return all(comparisons)
-        else:
-            logger.info(f"Evaluating {model_answer} as a string.")
-            ma_elem = self.normalize_str(model_answer)
-            gt_elem = self.normalize_str(ground_truth)
-            return ma_elem == gt_elem
+        return gaia_scoring.question_scorer(model_answer, ground_truth)
 
     def normalize_number_str(self, number_str: str) -> float:
-        for char in ["$", "%", ","]:
-            number_str = number_str.replace(char, "")
-        try:
-            return float(number_str)
-        except ValueError:
-            logger.error(f"String {number_str} cannot be normalized to number str.")
-            return float("inf")
+        return gaia_scoring.normalize_number_str(number_str)
 
     def split_string(self, s: str, char_list: Optional[List[str]] = None) -> list[str]:
         r"""Split a string based on a list of characters.
@@ -386,10 +744,7 @@ class GAIABenchmark(BaseBenchmark):
                 he list of characters to split on.
                 (default: :obj:`None`)
         """
-        if char_list is None:
-            char_list = [",", ";"]
-        pattern = f"[{''.join(char_list)}]"
-        return re.split(pattern, s)
+        return gaia_scoring.split_string(s, char_list)
 
     def normalize_str(self, input_str, remove_punct=True) -> str:
         r"""Normalize a string.
@@ -401,9 +756,4 @@ class GAIABenchmark(BaseBenchmark):
         Returns:
             str: The normalized string.
         """
-        no_spaces = re.sub(r"\s", "", input_str)
-        if remove_punct:
-            translator = str.maketrans("", "", string.punctuation)
-            return no_spaces.lower().translate(translator)
-        else:
-            return no_spaces.lower()
+        return gaia_scoring.normalize_str(input_str, remove_punct)
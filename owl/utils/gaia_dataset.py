@@ -0,0 +1,120 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from camel.logger import get_logger
+
+logger = get_logger(__name__)
+
+# The placeholder task at the top of the GAIA metadata files
+PLACEHOLDER_TASK_ID = "0-0-0-0-0"
+
+
+class GAIADataset:
+    r"""The tasks of one GAIA split, read from its `metadata.jsonl` on
+    demand.
+
+    The file is scanned once, on first use, for the byte offset and level
+    of every task. Tasks are then read one at a time, so only the selected
+    tasks are parsed and every access returns a fresh copy that callers may
+    modify.
+
+    Args:
+        metadata_path (Union[str, Path]): The `metadata.jsonl` of the split.
+            Attachments are resolved relative to its directory.
+    """
+
+    def __init__(self, metadata_path: Union[str, Path]):
+        self.metadata_path = Path(metadata_path)
+        self._lock = threading.Lock()
+        self._offsets: Optional[Dict[str, int]] = None
+        self._levels: Dict[str, int] = {}
+
+    def _index(self) -> Dict[str, int]:
+        with self._lock:
+            if self._offsets is None:
+                offsets: Dict[str, int] = {}
+                with open(self.metadata_path, "rb") as f:
+                    offset = 0
+                    for line in f:
+                        if line.strip():
+                            data = json.loads(line)
+                            if data["task_id"] != PLACEHOLDER_TASK_ID:
+                                offsets[data["task_id"]] = offset
+                                self._levels[data["task_id"]] = data["Level"]
+                        offset += len(line)
+                self._offsets = offsets
+                logger.debug(f"Indexed {len(offsets)} tasks in {self.metadata_path}")
+        return self._offsets
+
+    def _resolve(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        if data["file_name"]:
+            data["file_name"] = self.metadata_path.parent / data["file_name"]
+        return data
+
+    def __len__(self) -> int:
+        return len(self._index())
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._index()
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        r"""Stream all tasks in file order."""
+        return self.select(self.task_ids())
+
+    def __getitem__(self, task_id: str) -> Dict[str, Any]:
+        offsets = self._index()
+        if task_id not in offsets:
+            raise KeyError(f"Unknown GAIA task: {task_id}")
+        with open(self.metadata_path, "rb") as f:
+            f.seek(offsets[task_id])
+            return self._resolve(json.loads(f.readline()))
+
+    def level(self, task_id: str) -> int:
+        r"""Return the level of a task without reading it."""
+        self._index()
+        return self._levels[task_id]
+
+    def task_ids(self, levels: Optional[Iterable[int]] = None) -> List[str]:
+        r"""Return the ids of the tasks, optionally only of the given
+        levels, in file order."""
+        offsets = self._index()
+        if levels is None:
+            return list(offsets)
+        levels = set(levels)
+        return [task_id for task_id in offsets if self._levels[task_id] in levels]
+
+    def select(self, task_ids: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        r"""Stream the given tasks in the given order.
+
+        Raises:
+            KeyError: If a task does not exist in the split.
+        """
+        offsets = self._index()
+        task_ids = list(task_ids)
+        unknown = [task_id for task_id in task_ids if task_id not in offsets]
+        if unknown:
+            raise KeyError(f"Unknown GAIA tasks: {unknown}")
+
+        def _stream() -> Iterator[Dict[str, Any]]:
+            with open(self.metadata_path, "rb") as f:
+                for task_id in task_ids:
+                    f.seek(offsets[task_id])
+                    yield self._resolve(json.loads(f.readline()))
+
+        return _stream()
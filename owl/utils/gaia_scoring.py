@@ -0,0 +1,331 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+r"""The GAIA scorer, and offline rescoring of saved results.
+
+Rescoring re-extracts the final answer from the raw answer stored with every
+result, so changes to the answer extraction or normalization can be
+evaluated without rerunning any task.
+
+Usage::
+
+    python -m owl.utils.gaia_scoring results.jsonl -o rescored.jsonl --diff changes.jsonl
+"""
+
+import argparse
+import json
+import os
+import re
+import string
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from camel.logger import get_logger
+
+from .common import extract_pattern
+from .result_store import ResultStore
+
+logger = get_logger(__name__)
+
+_WHITESPACE = re.compile(r"\s")
+_PUNCTUATION = str.maketrans("", "", string.punctuation)
+_LIST_SEPARATORS = re.compile(r"[,;]")
+
+
+def is_float(element: Any) -> bool:
+    try:
+        float(element)
+        return True
+    except ValueError:
+        return False
+
+
+def normalize_number_str(number_str: str) -> float:
+    for char in ["$", "%", ","]:
+        number_str = number_str.replace(char, "")
+    try:
+        return float(number_str)
+    except ValueError:
+        logger.debug(f"String {number_str} cannot be normalized to number str.")
+        return float("inf")
+
+
+def split_string(s: str, char_list: Optional[List[str]] = None) -> List[str]:
+    r"""Split a string based on a list of characters.
+
+    Args:
+        s (str): The string to split.
+        char_list (Optional[List[str]], optional): The list of characters to
+            split on. (default: :obj:`None`, commas and semicolons)
+    """
+    if char_list is None:
+        return _LIST_SEPARATORS.split(s)
+    return re.split(f"[{''.join(char_list)}]", s)
+
+
+def normalize_str(input_str: str, remove_punct: bool = True) -> str:
+    r"""Normalize a string.
+
+    Args:
+        input_str (str): The input string to normalize.
+        remove_punct (bool, optional): Whether to remove punctuation.
+            (default: :obj:`True`)
+
+    Returns:
+        str: The normalized string.
+    """
+    no_spaces = _WHITESPACE.sub("", input_str).lower()
+    if remove_punct:
+        return no_spaces.translate(_PUNCTUATION)
+    return no_spaces
+
+
+def question_scorer(model_answer: str, ground_truth: str) -> bool:
+    r"""Scorer for the GAIA benchmark.
+    https://huggingface.co/spaces/gaia-benchmark/leaderboard/blob/main/
+    scorer.py
+
+    Args:
+        model_answer (str): The model answer.
+        ground_truth (str): The ground truth answer.
+
+    Returns:
+        bool: The score of the model
+    """
+    if is_float(ground_truth):
+        logger.debug(f"Evaluating {model_answer} as a number.")
+        return normalize_number_str(model_answer) == float(ground_truth)
+
+    elif any(char in ground_truth for char in [",", ";"]):
+        logger.debug(f"Evaluating {model_answer} as a comma separated list.")
+        gt_elems = split_string(ground_truth)
+        ma_elems = split_string(model_answer)
+
+        if len(gt_elems) != len(ma_elems):
+            logger.debug("Answer lists have different lengths, returning False.")
+            return False
+
+        for ma_elem, gt_elem in zip(ma_elems, gt_elems):
+            if is_float(gt_elem):
+                if normalize_number_str(ma_elem) != float(gt_elem):
+                    return False
+            elif normalize_str(ma_elem, remove_punct=False) != normalize_str(
+                gt_elem, remove_punct=False
+            ):
+                return False
+        return True
+    else:
+        logger.debug(f"Evaluating {model_answer} as a string.")
+        return normalize_str(model_answer) == normalize_str(ground_truth)
+
+
+def answer_key(model_answer: str) -> Tuple[Any, ...]:
+    r"""Normalize an answer the way :func:`question_scorer` compares it, so
+    answers with the same key get the same score for any ground truth of
+    their kind: numbers by value, lists element-wise and strings without
+    whitespace, case and punctuation."""
+    number = normalize_number_str(model_answer)
+    if number != float("inf"):
+        return ("number", number)
+    if any(char in model_answer for char in [",", ";"]):
+        return (
+            "list",
+            tuple(
+                float(elem)
+                if is_float(elem)
+                else normalize_str(elem, remove_punct=False)
+                for elem in split_string(model_answer)
+            ),
+        )
+    return ("string", normalize_str(model_answer))
+
+
+def raw_answer(result: Dict[str, Any]) -> Optional[str]:
+    r"""Return the raw final message of a result. Results saved before the
+    raw answer was kept fall back to the last assistant message of their
+    history."""
+    if result.get("raw_answer") is not None:
+        return result["raw_answer"]
+    history = result.get("history") or []
+    return history[-1].get("assistant") if history else None
+
+
+def score_result(
+    result: Dict[str, Any], pattern: str = "final_answer"
+) -> Tuple[Optional[str], bool]:
+    r"""Extract the answer of a result from its raw answer and score it.
+
+    Args:
+        result (Dict[str, Any]): A saved result.
+        pattern (str, optional): The tag holding the answer.
+            (default: :obj:`"final_answer"`)
+
+    Returns:
+        Tuple[Optional[str], bool]: The answer and its score. Results
+            without a raw answer keep their stored answer.
+    """
+    raw = raw_answer(result)
+    answer = (
+        extract_pattern(raw, pattern) if raw is not None else result.get("model_answer")
+    )
+    ground_truth = result.get("ground_truth")
+    if answer is None or ground_truth is None:
+        return answer, False
+    return answer, question_scorer(answer, ground_truth)
+
+
+def _stream_results(
+    path: Union[str, Path], with_history: bool
+) -> Iterator[Dict[str, Any]]:
+    if Path(path).suffix != ".jsonl":
+        with open(path, "r", encoding="utf-8") as f:
+            yield from json.load(f)
+        return
+    store = ResultStore(path)
+    for record in store.iter_results(with_history=with_history):
+        if not with_history and record.get("raw_answer") is None:
+            record["history"] = store.load_history(record)
+        yield record
+
+
+def rescore_results(
+    results: Iterable[Dict[str, Any]], pattern: str = "final_answer"
+) -> Iterator[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]:
+    r"""Rescore results one at a time.
+
+    Yields:
+        Tuple[Dict[str, Any], Optional[Dict[str, Any]]]: The rescored result
+            and, if its answer or score changed, the change.
+    """
+    for result in results:
+        answer, score = score_result(result, pattern)
+        change = None
+        if answer != result.get("model_answer") or bool(score) != bool(
+            result.get("score")
+        ):
+            change = {
+                "task_id": result["task_id"],
+                "ground_truth": result.get("ground_truth"),
+                "old_answer": result.get("model_answer"),
+                "new_answer": answer,
+                "old_score": bool(result.get("score")),
+                "new_score": score,
+            }
+        yield {**result, "model_answer": answer, "score": score}, change
+
+
+def rescore_file(
+    path: Union[str, Path],
+    output: Optional[Union[str, Path]] = None,
+    diff_path: Optional[Union[str, Path]] = None,
+    pattern: str = "final_answer",
+) -> Dict[str, Any]:
+    r"""Rescore a JSON or JSONL result file.
+
+    Args:
+        path (Union[str, Path]): The results to rescore.
+        output (Union[str, Path], optional): Where to write the rescored
+            results, in the format given by its suffix. May be `path`.
+            (default: :obj:`None`)
+        diff_path (Union[str, Path], optional): Where to write the changes,
+            one JSON line per changed task. (default: :obj:`None`)
+        pattern (str, optional): The tag holding the answer.
+            (default: :obj:`"final_answer"`)
+
+    Returns:
+        Dict[str, Any]: The new totals, the number of `fixed` and `broken`
+            tasks and the list of `changes`.
+    """
+    start = time.perf_counter()
+    to_store = output is not None and Path(output).suffix == ".jsonl"
+    store = None
+    if to_store:
+        # The results go to a new store that replaces `output` at the end,
+        # so rescoring a store in place rewrites it instead of appending a
+        # second copy of every result and history
+        tmp_store_path = Path(f"{output}.tmp")
+        for stale in (tmp_store_path, Path(f"{tmp_store_path}.histories")):
+            stale.unlink(missing_ok=True)
+        store = ResultStore(tmp_store_path)
+    rescored: List[Dict[str, Any]] = []
+    changes: List[Dict[str, Any]] = []
+    total = correct = 0
+    for result, change in rescore_results(
+        _stream_results(path, with_history=output is not None), pattern
+    ):
+        total += 1
+        correct += bool(result["score"])
+        if change is not None:
+            changes.append(change)
+        if store is not None:
+            store.append(result)
+        elif output is not None:
+            rescored.append(result)
+
+    if store is not None:
+        history_path = Path(f"{output}.histories")
+        if store.history_path.exists():
+            os.replace(store.history_path, history_path)
+        else:
+            history_path.unlink(missing_ok=True)
+        os.replace(store.path, output)
+    elif output is not None:
+        tmp_path = f"{output}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(rescored, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, output)
+    if diff_path is not None:
+        with open(diff_path, "w", encoding="utf-8") as f:
+            for change in changes:
+                f.write(json.dumps(change, ensure_ascii=False) + "\n")
+
+    return {
+        "total": total,
+        "correct": correct,
+        "accuracy": correct / total if total else 0,
+        "fixed": sum(c["new_score"] and not c["old_score"] for c in changes),
+        "broken": sum(c["old_score"] and not c["new_score"] for c in changes),
+        "changes": changes,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def main():
+    r"""Rescore saved GAIA results with the current answer extraction and
+    scorer."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("results", help="A .json or .jsonl result file.")
+    parser.add_argument("-o", "--output", help="Where to write the rescored results.")
+    parser.add_argument("--diff", help="Where to write the changed tasks.")
+    parser.add_argument(
+        "--pattern", default="final_answer", help="The tag holding the answer."
+    )
+    args = parser.parse_args()
+
+    summary = rescore_file(args.results, args.output, args.diff, args.pattern)
+    for change in summary["changes"]:
+        print(
+            f"{change['task_id']}: {change['old_score']} -> {change['new_score']} "
+            f"({change['old_answer']!r} -> {change['new_answer']!r}, "
+            f"expected {change['ground_truth']!r})"
+        )
+    print(
+        f"{summary['correct']}/{summary['total']} correct "
+        f"({summary['accuracy']:.2%}), {summary['fixed']} fixed, "
+        f"{summary['broken']} broken, {summary['seconds']:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
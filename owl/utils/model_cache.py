@@ -0,0 +1,247 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Literal, Optional, Type, Union
+
+from openai import AsyncStream, Stream
+from pydantic import BaseModel
+
+from camel.messages import OpenAIMessage
+from camel.models import BaseModelBackend
+from camel.types import ChatCompletion, ChatCompletionChunk
+from camel.utils import BaseTokenCounter
+from camel.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ResponseCache:
+    r"""A SQLite store of model responses with size-based LRU eviction.
+
+    Args:
+        path (str): The SQLite file to store the responses in.
+        max_bytes (int, optional): The maximum total size of the stored
+            responses. The least recently used ones are evicted beyond it.
+            (default: :obj:`1 GiB`)
+    """
+
+    def __init__(self, path: str, max_bytes: int = 1 << 30):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT, size INTEGER, "
+                "last_access REAL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_last_access "
+                "ON responses (last_access)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One connection per operation keeps the cache usable from the tool
+        # and society worker threads
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            self.hits += 1
+        return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        size = len(value.encode("utf-8"))
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, size, time.time()),
+            )
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        (total,) = conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        logger.debug(f"Evicted {evicted} cached responses from {self.path}")
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+def request_key(
+    model_type: str,
+    model_config_dict: Dict[str, Any],
+    messages: List[OpenAIMessage],
+    tools: Optional[List[Dict[str, Any]]],
+    response_format: Optional[Type[BaseModel]] = None,
+) -> str:
+    r"""Hash everything that determines the response of a model call."""
+    payload = {
+        "model": str(model_type),
+        "config": {k: v for k, v in model_config_dict.items() if k != "tools"},
+        "messages": messages,
+        "tools": tools,
+        "response_format": (
+            response_format.model_json_schema() if response_format else None
+        ),
+    }
+    data = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class CachedModelBackend(BaseModelBackend):
+    r"""Wraps a model backend and records its responses into a
+    :obj:`ResponseCache`, so that repeated runs of the same conversation
+    (e.g. at `temperature: 0`) are served from disk.
+
+    Streamed responses are passed through without being recorded.
+
+    Args:
+        backend (BaseModelBackend): The model backend to wrap.
+        cache (ResponseCache): The cache to record into and replay from.
+        mode (Literal["record", "replay", "passthrough"], optional):
+            `"record"` replays cached responses and records the missing ones,
+            `"replay"` only serves cached responses and raises on a miss,
+            `"passthrough"` always calls the wrapped backend.
+            (default: :obj:`"record"`)
+    """
+
+    def __init__(
+        self,
+        backend: BaseModelBackend,
+        cache: ResponseCache,
+        mode: Literal["record", "replay", "passthrough"] = "record",
+    ) -> None:
+        if mode not in ("record", "replay", "passthrough"):
+            raise ValueError(
+                f"Invalid value for `mode`: {mode}, expected 'record', "
+                "'replay' or 'passthrough'."
+            )
+        self.backend = backend
+        self.cache = cache
+        self.mode = mode
+        super().__init__(
+            backend.model_type,
+            backend.model_config_dict,
+            backend._api_key,
+            backend._url,
+            backend._token_counter,
+        )
+
+    @property
+    def token_counter(self) -> BaseTokenCounter:
+        return self.backend.token_counter
+
+    @property
+    def token_limit(self) -> int:
+        return self.backend.token_limit
+
+    @property
+    def stream(self) -> bool:
+        return self.backend.stream
+
+    def check_model_config(self):
+        # The wrapped backend has checked its config already
+        pass
+
+    def _lookup(
+        self,
+        messages: List[OpenAIMessage],
+        response_format: Optional[Type[BaseModel]],
+        tools: Optional[List[Dict[str, Any]]],
+    ):
+        if self.mode == "passthrough":
+            return None, None
+        key = request_key(
+            self.model_type, self.model_config_dict, messages, tools, response_format
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            return key, ChatCompletion.model_validate_json(cached)
+        if self.mode == "replay":
+            raise RuntimeError(
+                f"No cached response for request {key} of model "
+                f"{self.model_type} in replay mode."
+            )
+        return key, None
+
+    def _record(self, key: Optional[str], response) -> None:
+        if key is not None and isinstance(response, ChatCompletion):
+            self.cache.put(key, response.model_dump_json())
+
+    def _run(
+        self,
+        messages: List[OpenAIMessage],
+        response_format: Optional[Type[BaseModel]] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+    ) -> Union[ChatCompletion, Stream[ChatCompletionChunk]]:
+        key, response = self._lookup(messages, response_format, tools)
+        if response is not None:
+            return response
+        response = self.backend.run(messages, response_format, tools)
+        self._record(key, response)
+        return response
+
+    async def _arun(
+        self,
+        messages: List[OpenAIMessage],
+        response_format: Optional[Type[BaseModel]] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+    ) -> Union[ChatCompletion, AsyncStream[ChatCompletionChunk]]:
+        key, response = self._lookup(messages, response_format, tools)
+        if response is not None:
+            return response
+        response = await self.backend.arun(messages, response_format, tools)
+        self._record(key, response)
+        return response
@@ -0,0 +1,195 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+r"""Process-wide rate limits of model calls.
+
+Every model call of an :obj:`OwlChatAgent` first waits for the limiter
+registered for its model, in both :func:`run_society` and
+:func:`arun_society`, so concurrent societies sharing a provider key stay
+under its quota instead of running into 429 errors::
+
+    # One quota for all models of a provider key
+    set_rate_limit(["gpt-4o", "gpt-4.1"], requests_per_minute=500,
+                   tokens_per_minute=30000)
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, List, Optional, Union
+
+from camel.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class _Bucket:
+    r"""A token bucket that can go into debt. A reservation larger than the
+    current level is granted at once, and the wait until the debt is
+    refilled is returned, so later reservations wait longer."""
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60
+        self.capacity = per_minute
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float, now: float) -> float:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        self.level -= amount
+        return max(0.0, -self.level / self.rate)
+
+    def refund(self, amount: float) -> None:
+        self.level = min(self.capacity, self.level + amount)
+
+
+class RateLimiter:
+    r"""Limits the requests and tokens per minute of model calls, shared by
+    all threads and event loops of the process.
+
+    Callers are served in the order they arrive: each call reserves its
+    share of the buckets under a lock and then sleeps until the share is
+    refilled. No society can overtake the calls already queued, and a
+    society has at most one call per agent waiting.
+
+    Args:
+        requests_per_minute (float, optional): The request limit.
+            (default: :obj:`None`, unlimited)
+        tokens_per_minute (float, optional): The token limit, counting
+            prompt and completion tokens. (default: :obj:`None`, unlimited)
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = _Bucket(requests_per_minute) if requests_per_minute else None
+        self._tokens = _Bucket(tokens_per_minute) if tokens_per_minute else None
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "queued_requests": 0,
+            "wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+        }
+
+    def _reserve(self, tokens: int) -> float:
+        with self._lock:
+            now = time.monotonic()
+            wait = 0.0
+            if self._requests is not None:
+                wait = max(wait, self._requests.reserve(1, now))
+            if self._tokens is not None:
+                wait = max(wait, self._tokens.reserve(tokens, now))
+            self._stats["requests"] += 1
+            if wait > 0:
+                self._stats["queued_requests"] += 1
+                self._stats["wait_seconds"] += wait
+                self._stats["max_wait_seconds"] = max(
+                    self._stats["max_wait_seconds"], wait
+                )
+            return wait
+
+    def _cancel(self, tokens: int) -> None:
+        with self._lock:
+            if self._requests is not None:
+                self._requests.refund(1)
+            if self._tokens is not None:
+                self._tokens.refund(tokens)
+
+    def acquire(self, tokens: int = 0) -> float:
+        r"""Wait until a call of `tokens` estimated tokens may start.
+
+        Returns:
+            float: The seconds waited.
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, tokens: int = 0) -> float:
+        r"""Asynchronous version of :meth:`acquire`. A cancelled wait gives
+        its reservation back."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self._cancel(tokens)
+                raise
+        return wait
+
+    def settle(self, estimated_tokens: int, actual_tokens: int) -> None:
+        r"""Correct the estimate a call was admitted with by the tokens it
+        actually used, e.g. its completion tokens."""
+        if self._tokens is not None:
+            with self._lock:
+                self._tokens.refund(estimated_tokens - actual_tokens)
+
+    def stats(self) -> Dict[str, float]:
+        r"""Return the number of `requests`, of `queued_requests` that had to
+        wait, and the total and maximum seconds waited."""
+        with self._lock:
+            return dict(self._stats)
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def set_rate_limit(
+    models: Union[str, List[str]],
+    requests_per_minute: Optional[float] = None,
+    tokens_per_minute: Optional[float] = None,
+) -> RateLimiter:
+    r"""Register one limiter for the given models.
+
+    Args:
+        models (Union[str, List[str]]): Model names or prefixes sharing the
+            quota, matched like the names of :obj:`MODEL_PRICES`. `""`
+            matches every model without a more specific limit.
+        requests_per_minute (float, optional): The request limit.
+            (default: :obj:`None`)
+        tokens_per_minute (float, optional): The token limit.
+            (default: :obj:`None`)
+
+    Returns:
+        RateLimiter: The new limiter.
+    """
+    limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+    with _limiters_lock:
+        for model in [models] if isinstance(models, str) else models:
+            _limiters[model] = limiter
+    return limiter
+
+
+def get_rate_limiter(model: str) -> Optional[RateLimiter]:
+    r"""Return the limiter of a model, by its longest registered prefix."""
+    with _limiters_lock:
+        if model in _limiters:
+            return _limiters[model]
+        prefixes = [name for name in _limiters if model.startswith(name)]
+        if not prefixes:
+            return None
+        return _limiters[max(prefixes, key=len)]
+
+
+def clear_rate_limits() -> None:
+    r"""Remove all limiters."""
+    with _limiters_lock:
+        _limiters.clear()
@@ -0,0 +1,225 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+r"""An append-only store of benchmark results.
+
+Usage::
+
+    python -m owl.utils.result_store export results.jsonl results.json
+    python -m owl.utils.result_store compact results.jsonl
+"""
+
+import argparse
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from camel.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ResultStore:
+    r"""Benchmark results stored as one JSON line per task, with the chat
+    histories in a separate file referenced by byte offset.
+
+    Results are only ever appended, so a crash can at most lose the line
+    being written, which is skipped when the store is opened again. A task
+    that is stored more than once (e.g. after a rerun) resolves to its
+    latest result.
+
+    Args:
+        path (Union[str, Path]): The JSONL file of the results. The histories
+            are kept next to it in `<path>.histories`.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.history_path = self.path.with_name(self.path.name + ".histories")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # task_id -> byte offset of its latest result line
+        self._index: Dict[str, int] = {}
+        self._load_index()
+
+    def _load_index(self) -> None:
+        if not self.path.exists():
+            return
+        with open(self.path, "rb") as f:
+            offset = 0
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    self._index[record["task_id"]] = offset
+                # A line cut off by a crash may not decode or not be an object
+                except (ValueError, KeyError, TypeError):
+                    logger.warning(
+                        f"Skipping a corrupt result at byte {offset} of {self.path}"
+                    )
+                offset += len(line)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @staticmethod
+    def _append_line(path: Path, data: str) -> int:
+        r"""Append a line to `path` and return its byte offset."""
+        with open(path, "ab") as f:
+            offset = f.tell()
+            # Terminate a line cut off by a crash so it stays skippable
+            if offset > 0:
+                with open(path, "rb") as r:
+                    r.seek(offset - 1)
+                    if r.read(1) != b"\n":
+                        f.write(b"\n")
+                        offset += 1
+            f.write(data.encode("utf-8") + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        return offset
+
+    def append(self, result: Dict[str, Any]) -> None:
+        r"""Store the result of a task. Its `history` is written to the
+        history file and replaced by `history_offset`/`history_length`."""
+        record = {k: v for k, v in result.items() if k != "history"}
+        with self._lock:
+            history = result.get("history")
+            if history is not None:
+                data = json.dumps(history, ensure_ascii=False, default=str)
+                record["history_offset"] = self._append_line(self.history_path, data)
+                record["history_length"] = len(data.encode("utf-8"))
+            offset = self._append_line(
+                self.path, json.dumps(record, ensure_ascii=False, default=str)
+            )
+            self._index[record["task_id"]] = offset
+
+    def load_history(self, record: Dict[str, Any]) -> Optional[List[dict]]:
+        r"""Read the chat history of a stored result."""
+        if record.get("history_offset") is None:
+            return None
+        with open(self.history_path, "rb") as f:
+            f.seek(record["history_offset"])
+            return json.loads(f.read(record["history_length"]))
+
+    def _read(self, offset: int, f) -> Dict[str, Any]:
+        f.seek(offset)
+        return json.loads(f.readline())
+
+    def get(self, task_id: str, with_history: bool = True) -> Optional[Dict[str, Any]]:
+        r"""Return the latest result of a task, `None` if it is not stored."""
+        if task_id not in self._index:
+            return None
+        with open(self.path, "rb") as f:
+            record = self._read(self._index[task_id], f)
+        return self._to_result(record) if with_history else record
+
+    def _to_result(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        result = {
+            k: v
+            for k, v in record.items()
+            if k not in ("history_offset", "history_length")
+        }
+        result["history"] = self.load_history(record)
+        return result
+
+    def iter_results(self, with_history: bool = False) -> Iterator[Dict[str, Any]]:
+        r"""Stream the latest result of every task, in the order they were
+        last stored. Without histories only the small result lines are
+        read."""
+        offsets = sorted(self._index.values())
+        if not offsets:
+            return
+        with open(self.path, "rb") as f:
+            for offset in offsets:
+                record = self._read(offset, f)
+                yield self._to_result(record) if with_history else record
+
+    def results(self, with_history: bool = False) -> List[Dict[str, Any]]:
+        r"""Return the latest result of every task, see :meth:`iter_results`."""
+        return list(self.iter_results(with_history))
+
+    def export_json(self, path: Union[str, Path]) -> None:
+        r"""Write all results with their histories in the JSON format of
+        :meth:`GAIABenchmark.run` without a result store."""
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.results(with_history=True), f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def compact(self) -> None:
+        r"""Rewrite the store without superseded or corrupt results and
+        their histories."""
+        results = self.results(with_history=True)
+        self.replace(results)
+        logger.info(f"Compacted {self.path} to {len(results)} results.")
+
+    def replace(self, results: List[Dict[str, Any]]) -> None:
+        r"""Replace everything stored with `results`. The new store is
+        written next to the old one and moved over it at the end, so a
+        crash leaves either of them complete."""
+        tmp_store = ResultStore(self.path.with_name(self.path.name + ".compact"))
+        for path in (tmp_store.path, tmp_store.history_path):
+            path.unlink(missing_ok=True)
+        tmp_store._index.clear()
+        for result in results:
+            tmp_store.append(result)
+        with self._lock:
+            if tmp_store.history_path.exists():
+                os.replace(tmp_store.history_path, self.history_path)
+            else:
+                self.history_path.unlink(missing_ok=True)
+            os.replace(tmp_store.path, self.path)
+            self._index = tmp_store._index
+
+
+def load_results(
+    path: Union[str, Path], with_history: bool = True
+) -> List[Dict[str, Any]]:
+    r"""Load the results of a run saved either as a JSONL result store or
+    as a JSON list."""
+    if Path(path).suffix == ".jsonl":
+        return ResultStore(path).results(with_history=with_history)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    r"""Export or compact a result store."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser(
+        "export", help="Write the results in the JSON format."
+    )
+    export_parser.add_argument("store")
+    export_parser.add_argument("output")
+    compact_parser = subparsers.add_parser(
+        "compact", help="Drop superseded results from the store."
+    )
+    compact_parser.add_argument("store")
+    args = parser.parse_args()
+
+    store = ResultStore(args.store)
+    if args.command == "export":
+        store.export_json(args.output)
+    else:
+        store.compact()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import asyncio
+import json
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Type, Union
+
+from openai import AsyncStream, Stream
+from pydantic import BaseModel
+
+from camel.messages import OpenAIMessage
+from camel.models import BaseModelBackend
+from camel.types import ChatCompletion, ChatCompletionChunk
+from camel.utils import BaseTokenCounter
+from camel.logger import get_logger
+
+from .model_cache import CachedModelBackend, ResponseCache
+
+logger = get_logger(__name__)
+
+# A script item is the text of the reply, a dict with `content` and optional
+# `tool_calls` (each `{"name": ..., "arguments": {...}}`), a recorded
+# `ChatCompletion` dict, or a callable mapping the messages to one of those.
+ScriptItem = Union[str, Dict[str, Any], Callable[[List[OpenAIMessage]], Any]]
+
+
+class ApproxTokenCounter(BaseTokenCounter):
+    r"""Counts roughly four characters per token, without downloading a
+    tokenizer."""
+
+    def count_tokens_from_messages(self, messages: List[OpenAIMessage]) -> int:
+        num_tokens = 0
+        for message in messages:
+            content = json.dumps(message.get("content") or "", ensure_ascii=False)
+            num_tokens += len(self.encode(content)) + 4
+        return num_tokens
+
+    def encode(self, text: str) -> List[int]:
+        return [0] * (len(text) // 4 + 1)
+
+    def decode(self, token_ids: List[int]) -> str:
+        return ""
+
+
+class _ScriptedStream(Stream):
+    # `Stream.__init__` needs an HTTP response; only the iterator is used
+    def __init__(self, chunks: List[ChatCompletionChunk], delay: float) -> None:
+        def _iterate():
+            for chunk in chunks:
+                time.sleep(delay)
+                yield chunk
+
+        self._iterator = _iterate()
+
+
+class _AsyncScriptedStream(AsyncStream):
+    def __init__(self, chunks: List[ChatCompletionChunk], delay: float) -> None:
+        async def _iterate():
+            for chunk in chunks:
+                await asyncio.sleep(delay)
+                yield chunk
+
+        self._iterator = _iterate()
+
+
+class ScriptedModelBackend(BaseModelBackend):
+    r"""An offline model backend returning scripted or recorded responses,
+    for running societies and benchmarks without API keys.
+
+    The items of `script` are returned in order, the last one is repeated
+    once the script is exhausted. Every call sleeps for `latency` seconds to
+    simulate the provider. With `"stream": True` in `model_config_dict` the
+    text is returned as a stream of word chunks (note that :obj:`ChatAgent`
+    counts the usage of streams with `tiktoken`, which needs its encoding
+    files to be available offline).
+
+    Args:
+        model_type (str, optional): The model name to report.
+            (default: :obj:`"scripted"`)
+        model_config_dict (Dict[str, Any], optional): The model config.
+            (default: :obj:`None`)
+        api_key (str, optional): Unused. (default: :obj:`None`)
+        url (str, optional): Unused. (default: :obj:`None`)
+        token_counter (BaseTokenCounter, optional): Token counter, defaults
+            to :obj:`ApproxTokenCounter`. (default: :obj:`None`)
+        script (List[ScriptItem], optional): The responses to return.
+            (default: :obj:`None`, always replies `"TASK_DONE"`)
+        latency (float, optional): Simulated seconds per call.
+            (default: :obj:`0.0`)
+    """
+
+    def __init__(
+        self,
+        model_type: str = "scripted",
+        model_config_dict: Optional[Dict[str, Any]] = None,
+        api_key: Optional[str] = None,
+        url: Optional[str] = None,
+        token_counter: Optional[BaseTokenCounter] = None,
+        script: Optional[List[ScriptItem]] = None,
+        latency: float = 0.0,
+    ) -> None:
+        super().__init__(model_type, model_config_dict, api_key, url, token_counter)
+        self._token_counter: Optional[BaseTokenCounter] = token_counter
+        self.script: List[ScriptItem] = list(script or ["TASK_DONE"])
+        self.latency = latency
+        self.num_calls = 0
+        # Seconds spent in each call, including the simulated latency
+        self.call_seconds: List[float] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_jsonl(cls, path: str, **kwargs) -> "ScriptedModelBackend":
+        r"""Load a script from a JSONL file with one script item (or recorded
+        `ChatCompletion`) per line."""
+        with open(path, "r", encoding="utf-8") as f:
+            script = [json.loads(line) for line in f if line.strip()]
+        return cls(script=script, **kwargs)
+
+    @property
+    def token_counter(self) -> BaseTokenCounter:
+        if not self._token_counter:
+            self._token_counter = ApproxTokenCounter()
+        return self._token_counter
+
+    @property
+    def token_limit(self) -> int:
+        return self.model_config_dict.get("max_tokens") or 128_000
+
+    @property
+    def stream(self) -> bool:
+        return self.model_config_dict.get("stream", False)
+
+    def check_model_config(self):
+        pass
+
+    def _next_item(self, messages: List[OpenAIMessage]) -> Any:
+        with self._lock:
+            item = self.script[min(self.num_calls, len(self.script) - 1)]
+            self.num_calls += 1
+        return item(messages) if callable(item) else item
+
+    def _to_completion(
+        self, item: Any, messages: List[OpenAIMessage]
+    ) -> ChatCompletion:
+        if isinstance(item, dict) and "choices" in item:
+            return ChatCompletion.model_validate(item)
+        if isinstance(item, str):
+            item = {"content": item}
+
+        content = item.get("content") or ""
+        tool_calls = [
+            {
+                "id": f"call_{uuid.uuid4().hex[:12]}",
+                "type": "function",
+                "function": {
+                    "name": call["name"],
+                    "arguments": json.dumps(call.get("arguments", {})),
+                },
+            }
+            for call in item.get("tool_calls") or []
+        ]
+        prompt_tokens = self.token_counter.count_tokens_from_messages(messages)
+        completion_tokens = len(self.token_counter.encode(content))
+        return ChatCompletion.model_validate(
+            {
+                "id": f"scripted-{self.num_calls}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": str(self.model_type),
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "tool_calls" if tool_calls else "stop",
+                        "message": {
+                            "role": "assistant",
+                            "content": content,
+                            "tool_calls": tool_calls or None,
+                        },
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            }
+        )
+
+    def _to_chunks(self, completion: ChatCompletion) -> List[ChatCompletionChunk]:
+        words = (completion.choices[0].message.content or "").split(" ")
+        return [
+            ChatCompletionChunk.model_validate(
+                {
+                    "id": completion.id,
+                    "object": "chat.completion.chunk",
+                    "created": completion.created,
+                    "model": completion.model,
+                    "choices": [
+                        {
+                            "index": 0,
+                            "delta": {
+                                "content": word if i == len(words) - 1 else word + " "
+                            },
+                            "finish_reason": "stop" if i == len(words) - 1 else None,
+                        }
+                    ],
+                }
+            )
+            for i, word in enumerate(words)
+        ]
+
+    def _run(
+        self,
+        messages: List[OpenAIMessage],
+        response_format: Optional[Type[BaseModel]] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+    ) -> Union[ChatCompletion, Stream[ChatCompletionChunk]]:
+        start = time.perf_counter()
+        completion = self._to_completion(self._next_item(messages), messages)
+        if self.stream:
+            chunks = self._to_chunks(completion)
+            self.call_seconds.append(self.latency)
+            return _ScriptedStream(chunks, self.latency / max(len(chunks), 1))
+        time.sleep(self.latency)
+        self.call_seconds.append(time.perf_counter() - start)
+        return completion
+
+    async def _arun(
+        self,
+        messages: List[OpenAIMessage],
+        response_format: Optional[Type[BaseModel]] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+    ) -> Union[ChatCompletion, AsyncStream[ChatCompletionChunk]]:
+        start = time.perf_counter()
+        completion = self._to_completion(self._next_item(messages), messages)
+        if self.stream:
+            chunks = self._to_chunks(completion)
+            self.call_seconds.append(self.latency)
+            return _AsyncScriptedStream(chunks, self.latency / max(len(chunks), 1))
+        await asyncio.sleep(self.latency)
+        self.call_seconds.append(time.perf_counter() - start)
+        return completion
+
+
+def replay_model(
+    cache_path: str,
+    model_type: str,
+    model_config_dict: Optional[Dict[str, Any]] = None,
+) -> CachedModelBackend:
+    r"""Build a backend that replays a run recorded with
+    :obj:`CachedModelBackend`, without network access.
+
+    `model_type` and `model_config_dict` must match the recorded backend,
+    since both are part of the cache key.
+    """
+    return CachedModelBackend(
+        ScriptedModelBackend(model_type, model_config_dict),
+        ResponseCache(cache_path),
+        mode="replay",
+    )
@@ -0,0 +1,224 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import json
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from copy import deepcopy
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List
+
+from camel.agents import ChatAgent
+from camel.logger import get_logger
+
+from .checkpoint import _CheckpointJSONEncoder, SocietyCheckpoint, save_checkpoint
+from .enhanced_role_playing import OwlRolePlaying, iter_society
+from .scripted_model import ScriptedModelBackend
+from .society_events import RoundEndEvent, SocietyEndEvent
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class SocietyBenchmarkResult:
+    r"""Measurements of one society run on scripted models.
+
+    All times are in seconds. `round_overhead_seconds` is the wall-clock time
+    of each round minus the time spent inside the model backends, i.e. the
+    time spent in prompt building, memory, tool dispatch and bookkeeping.
+
+    Args:
+        rounds (int): The number of rounds run.
+        wall_seconds (float): The wall-clock time of the whole run.
+        model_seconds (float): The time spent inside the model backends.
+        round_overhead_seconds (List[float]): The overhead of each round.
+        deepcopy_seconds (float): The time to deepcopy the last message of
+            the assistant agent, as done for every message by
+            :meth:`OwlRolePlaying.step`.
+        serialize_seconds (float): The time to `json.dumps` the chat history.
+        context_seconds (float): The time to build the context of both
+            agents from memory.
+        checkpoint_seconds (float): The time to capture a
+            :obj:`SocietyCheckpoint` and write it with
+            :func:`save_checkpoint`.
+        build_memory_bytes (int): The memory allocated to build the society.
+        peak_memory_bytes (int): The peak memory allocated during the run.
+    """
+
+    rounds: int
+    wall_seconds: float
+    model_seconds: float
+    round_overhead_seconds: List[float] = field(default_factory=list)
+    deepcopy_seconds: float = 0.0
+    serialize_seconds: float = 0.0
+    context_seconds: float = 0.0
+    checkpoint_seconds: float = 0.0
+    build_memory_bytes: int = 0
+    peak_memory_bytes: int = 0
+
+
+def _scripted_backends(agent: ChatAgent) -> List[ScriptedModelBackend]:
+    models = getattr(agent.model_backend, "models", [agent.model_backend])
+    backends = []
+    for model in models:
+        # Unwrap e.g. a `CachedModelBackend` replaying over a scripted model
+        while not isinstance(model, ScriptedModelBackend) and hasattr(model, "backend"):
+            model = model.backend
+        if isinstance(model, ScriptedModelBackend):
+            backends.append(model)
+    return backends
+
+
+def _model_seconds(backends: List[ScriptedModelBackend]) -> float:
+    return sum(sum(backend.call_seconds) for backend in backends)
+
+
+def _timed(func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run_society_benchmark(
+    society: OwlRolePlaying,
+    round_limit: int = 5,
+) -> SocietyBenchmarkResult:
+    r"""Run `society` once and measure where the time goes.
+
+    The society should use :obj:`ScriptedModelBackend` models (possibly
+    wrapped by a :obj:`CachedModelBackend`), otherwise the model time cannot
+    be told apart from the orchestration overhead.
+    """
+    backends = _scripted_backends(society.user_agent) + _scripted_backends(
+        society.assistant_agent
+    )
+    if not backends:
+        logger.warning(
+            "The society does not use scripted models, the overhead includes "
+            "the model time."
+        )
+
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    rounds: List[float] = []
+    chat_history: List[dict] = []
+    token_info: Dict[str, Any] = {}
+    model_seconds_before = _model_seconds(backends)
+    start = time.perf_counter()
+    try:
+        for event in iter_society(society, round_limit):
+            if isinstance(event, RoundEndEvent):
+                model_seconds = _model_seconds(backends)
+                rounds.append(
+                    event.timings["round"] - (model_seconds - model_seconds_before)
+                )
+                model_seconds_before = model_seconds
+            elif isinstance(event, SocietyEndEvent):
+                chat_history, token_info = event.chat_history, event.token_info
+        wall_seconds = time.perf_counter() - start
+        peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+    records = society.assistant_agent.memory.retrieve()
+    last_message = records[-1].memory_record.message if records else None
+
+    def _checkpoint(path: str) -> None:
+        save_checkpoint(
+            SocietyCheckpoint.capture(
+                society,
+                len(rounds),
+                round_limit,
+                chat_history,
+                token_info,
+                last_message,
+            ),
+            path,
+        )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        checkpoint_seconds = _timed(
+            lambda: _checkpoint(os.path.join(tmp_dir, "checkpoint.json"))
+        )
+    return SocietyBenchmarkResult(
+        rounds=len(rounds),
+        wall_seconds=wall_seconds,
+        model_seconds=_model_seconds(backends),
+        round_overhead_seconds=rounds,
+        deepcopy_seconds=_timed(lambda: deepcopy(last_message)),
+        serialize_seconds=_timed(
+            lambda: json.dumps(
+                chat_history, cls=_CheckpointJSONEncoder, ensure_ascii=False
+            )
+        ),
+        context_seconds=_timed(
+            lambda: (
+                society.user_agent.memory.get_context(),
+                society.assistant_agent.memory.get_context(),
+            )
+        ),
+        checkpoint_seconds=checkpoint_seconds,
+        peak_memory_bytes=peak_memory_bytes,
+    )
+
+
+def benchmark_society(
+    build_society: Callable[[], OwlRolePlaying],
+    round_limit: int = 5,
+    repeat: int = 3,
+) -> Dict[str, Any]:
+    r"""Build and run a society `repeat` times and summarize the
+    measurements of :func:`run_society_benchmark`.
+
+    Args:
+        build_society (Callable[[], OwlRolePlaying]): Builds a fresh society,
+            typically with :obj:`ScriptedModelBackend` models.
+        round_limit (int, optional): The round limit of each run.
+            (default: :obj:`5`)
+        repeat (int, optional): The number of runs. (default: :obj:`3`)
+
+    Returns:
+        Dict[str, Any]: The median of every measurement over the runs, plus
+            the median overhead per round and the individual `runs`.
+    """
+    results = []
+    for _ in range(repeat):
+        tracemalloc.start()
+        try:
+            society = build_society()
+            build_memory_bytes = tracemalloc.get_traced_memory()[0]
+            result = run_society_benchmark(society, round_limit)
+        finally:
+            tracemalloc.stop()
+        result.build_memory_bytes = build_memory_bytes
+        results.append(result)
+
+    runs = [asdict(result) for result in results]
+    summary: Dict[str, Any] = {
+        key: statistics.median(run[key] for run in runs)
+        for key in runs[0]
+        if key != "round_overhead_seconds"
+    }
+    overheads = [s for run in runs for s in run["round_overhead_seconds"]]
+    summary["overhead_per_round_seconds"] = (
+        statistics.median(overheads) if overheads else 0.0
+    )
+    summary["runs"] = runs
+    return summary
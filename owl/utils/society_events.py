@@ -0,0 +1,99 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+r"""Events yielded by :func:`iter_society` and :func:`aiter_society`.
+
+Within one round the events arrive in this order: any number of
+:obj:`TokenDeltaEvent` (only when token streaming is enabled and the model
+backend streams), then :obj:`UserMessageEvent`, :obj:`ToolCallEvent` for each
+tool call of the assistant, :obj:`AssistantMessageEvent` and finally
+:obj:`RoundEndEvent`. The last event of a run is :obj:`SocietyEndEvent`.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+
+@dataclass
+class SocietyEvent:
+    r"""Base class of all society events.
+
+    Args:
+        round_idx (int): The index of the round the event belongs to.
+    """
+
+    round_idx: int
+
+
+@dataclass
+class TokenDeltaEvent(SocietyEvent):
+    r"""A partial piece of text streamed by the model backend.
+
+    Args:
+        role (str): Either `"user"` or `"assistant"`.
+        delta (str): The newly generated text.
+    """
+
+    role: str
+    delta: str
+
+
+@dataclass
+class UserMessageEvent(SocietyEvent):
+    r"""The instruction given by the user agent in this round."""
+
+    content: str
+
+
+@dataclass
+class AssistantMessageEvent(SocietyEvent):
+    r"""The reply given by the assistant agent in this round."""
+
+    content: str
+
+
+@dataclass
+class ToolCallEvent(SocietyEvent):
+    r"""A tool call made by the assistant agent in this round."""
+
+    tool_name: str
+    args: Dict[str, Any]
+    result: Any
+    tool_call_id: str
+
+
+@dataclass
+class RoundEndEvent(SocietyEvent):
+    r"""Marks the end of a round.
+
+    Args:
+        usage (Dict[str, Dict[str, Any]]): The usage of the round in the
+            schema of :obj:`TokenAccounting`, keyed by `"user"` and
+            `"assistant"`.
+        timings (Dict[str, float]): Wall-clock seconds spent by the user
+            agent, the assistant agent and the whole round.
+        terminated (bool): Whether this is the last round.
+    """
+
+    usage: Dict[str, Dict[str, Any]]
+    timings: Dict[str, float]
+    terminated: bool
+
+
+@dataclass
+class SocietyEndEvent(SocietyEvent):
+    r"""The final result of the run, as returned by :func:`run_society`."""
+
+    answer: str
+    chat_history: List[dict] = field(default_factory=list)
+    token_info: Dict[str, Any] = field(default_factory=dict)
@@ -0,0 +1,195 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+r"""Token accounting shared by :func:`run_society` and :func:`arun_society`.
+
+Every usage entry has the same fields, see :obj:`USAGE_FIELDS`. The schema
+returned by :meth:`TokenAccounting.to_dict` (`token_info["usage"]`) is::
+
+    {
+        "total": {...},
+        "agents": {"user": {...}, "assistant": {...}},
+        "models": {"<model name>": {...}},
+        "tools": {"<tool name>": {"calls": 2, "seconds": 0.8}},
+        "rounds": [
+            {"round": 0, "seconds": 1.2, "user": {...}, "assistant": {...}},
+        ],
+    }
+"""
+
+from typing import Any, Dict, List, Optional
+
+from camel.agents import ChatAgent
+from camel.responses import ChatAgentResponse
+
+from .budget import SocietyBudget, new_spend
+
+USAGE_FIELDS = (
+    "prompt_tokens",
+    "completion_tokens",
+    "cached_tokens",
+    "model_calls",
+    "tool_calls",
+    # Seconds model calls waited for their rate limiter
+    "queue_seconds",
+)
+
+
+def new_usage() -> Dict[str, int]:
+    return dict.fromkeys(USAGE_FIELDS, 0)
+
+
+def add_usage(total: Dict[str, int], usage: Dict[str, int]) -> None:
+    for key in USAGE_FIELDS:
+        total[key] += usage.get(key, 0)
+
+
+def model_name(model_type: Any) -> str:
+    r"""Return the plain name of a :obj:`ModelType` or model name string."""
+    return getattr(model_type, "value", str(model_type))
+
+
+def cached_prompt_tokens(usage: Optional[dict]) -> int:
+    r"""Return the number of prompt tokens served from the provider's prefix
+    cache, as reported by OpenAI-compatible backends
+    (`prompt_tokens_details.cached_tokens`) or DeepSeek
+    (`prompt_cache_hit_tokens`). `0` if the backend does not report it."""
+    if not usage:
+        return 0
+    details = usage.get("prompt_tokens_details") or {}
+    return details.get("cached_tokens") or usage.get("prompt_cache_hit_tokens") or 0
+
+
+def usage_from_response(usage: Optional[dict], tool_calls: int = 0) -> Dict[str, int]:
+    r"""Convert the usage reported for one model call into a usage entry."""
+    entry = new_usage()
+    entry["prompt_tokens"] = (usage or {}).get("prompt_tokens") or 0
+    entry["completion_tokens"] = (usage or {}).get("completion_tokens") or 0
+    entry["cached_tokens"] = cached_prompt_tokens(usage)
+    entry["model_calls"] = 1
+    entry["tool_calls"] = tool_calls
+    return entry
+
+
+class TokenAccounting:
+    r"""Tracks the tokens and tool calls of a society run per agent, per
+    round and per model.
+
+    The usage of an agent step is taken from `info["usage_by_model"]`, which
+    :obj:`OwlChatAgent` fills with every model call of the step. For other
+    agents only the reported `info["usage"]` of the last call is available.
+    A side without usage (e.g. the skipped user agent of a final answer turn)
+    counts as zero instead of dropping the other side of the round. Tool
+    time is taken from `info["tool_time"]`, which only :obj:`OwlChatAgent`
+    reports.
+    """
+
+    def __init__(self):
+        self.total = new_usage()
+        self.agents: Dict[str, Dict[str, int]] = {}
+        self.models: Dict[str, Dict[str, int]] = {}
+        self.tools: Dict[str, Dict[str, float]] = {}
+        self.rounds: List[Dict[str, Any]] = []
+
+    def _add_tool_time(self, tool_time: Dict[str, Dict[str, float]]) -> None:
+        for tool, usage in tool_time.items():
+            entry = self.tools.setdefault(tool, {"calls": 0, "seconds": 0.0})
+            entry["calls"] += usage.get("calls", 0)
+            entry["seconds"] += usage.get("seconds", 0.0)
+
+    def _agent_usage(
+        self, agent: ChatAgent, response: ChatAgentResponse
+    ) -> Dict[str, Dict[str, int]]:
+        by_model = response.info.get("usage_by_model")
+        if by_model is None:
+            usage = response.info.get("usage")
+            tool_calls = len(response.info.get("tool_calls") or [])
+            if not usage and not tool_calls:
+                return {}
+            by_model = {
+                model_name(agent.model_backend.model_type): usage_from_response(
+                    usage, tool_calls
+                )
+            }
+        return by_model
+
+    def record_round(
+        self,
+        round_idx: int,
+        society,
+        assistant_response: ChatAgentResponse,
+        user_response: ChatAgentResponse,
+        seconds: float = 0.0,
+    ) -> Dict[str, Any]:
+        r"""Account for a finished round and return its entry."""
+        entry: Dict[str, Any] = {"round": round_idx, "seconds": seconds}
+        for role, agent, response in (
+            ("user", society.user_agent, user_response),
+            ("assistant", society.assistant_agent, assistant_response),
+        ):
+            role_usage = new_usage()
+            for model, usage in self._agent_usage(agent, response).items():
+                add_usage(role_usage, usage)
+                add_usage(self.models.setdefault(model, new_usage()), usage)
+            add_usage(self.agents.setdefault(role, new_usage()), role_usage)
+            add_usage(self.total, role_usage)
+            entry[role] = role_usage
+            self._add_tool_time(response.info.get("tool_time") or {})
+        self.rounds.append(entry)
+        return entry
+
+    @property
+    def seconds(self) -> float:
+        return sum(entry["seconds"] for entry in self.rounds)
+
+    def spend(self, pricing: SocietyBudget) -> Dict[str, float]:
+        r"""Return the spend of the run so far, costed with `pricing`."""
+        spend = new_spend()
+        spend["prompt_tokens"] = self.total["prompt_tokens"]
+        spend["completion_tokens"] = self.total["completion_tokens"]
+        spend["seconds"] = self.seconds
+        spend["cost"] = sum(
+            pricing.cost(model, usage["prompt_tokens"], usage["completion_tokens"])
+            for model, usage in self.models.items()
+        )
+        return spend
+
+    def token_counts(self) -> Dict[str, int]:
+        r"""The flat totals kept at the top level of `token_info`."""
+        return {
+            "completion_token_count": self.total["completion_tokens"],
+            "prompt_token_count": self.total["prompt_tokens"],
+            "cached_prompt_token_count": self.total["cached_tokens"],
+            "tool_call_count": self.total["tool_calls"],
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": dict(self.total),
+            "agents": {k: dict(v) for k, v in self.agents.items()},
+            "models": {k: dict(v) for k, v in self.models.items()},
+            "tools": {k: dict(v) for k, v in self.tools.items()},
+            "rounds": [dict(entry) for entry in self.rounds],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TokenAccounting":
+        r"""Restore the accounting saved by :meth:`to_dict`."""
+        accounting = cls()
+        add_usage(accounting.total, data["total"])
+        for key in ("agents", "models"):
+            for name, usage in data.get(key, {}).items():
+                add_usage(getattr(accounting, key).setdefault(name, new_usage()), usage)
+        accounting._add_tool_time(data.get("tools", {}))
+        accounting.rounds = [dict(entry) for entry in data.get("rounds", [])]
+        return accounting
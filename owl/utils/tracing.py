@@ -0,0 +1,188 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+r"""Latency spans of society runs.
+
+A :obj:`Tracer` passed to :obj:`OwlRolePlaying` records a span for every
+round (`"round"`), model call (`"llm"`), tool call (`"tool"`) and message
+copy or prompt building step (`"orchestration"`), and hands them to its
+sinks. Comparing the totals per category shows whether a slow task is
+model-bound, tool-bound or orchestration-bound.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Union
+
+from camel.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class Span:
+    r"""A timed operation.
+
+    Args:
+        name (str): What was timed, e.g. the tool name.
+        category (str): One of `"round"`, `"llm"`, `"tool"` and
+            `"orchestration"`.
+        start (float): Seconds since the tracer was created.
+        duration (float): The duration in seconds.
+        thread_id (int): The thread the operation ran on.
+        attrs (Dict[str, Any]): Additional attributes, e.g. the round index
+            or the time to first token of a model call.
+    """
+
+    name: str
+    category: str
+    start: float
+    duration: float
+    thread_id: int
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+
+class SpanSink:
+    r"""Receives the spans of a :obj:`Tracer`."""
+
+    def emit(self, span: Span) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class InMemorySink(SpanSink):
+    r"""Keeps the spans in :attr:`spans`."""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+
+    def emit(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def totals(self) -> Dict[str, float]:
+        r"""Return the total seconds per category."""
+        totals: Dict[str, float] = {}
+        for span in self.spans:
+            totals[span.category] = totals.get(span.category, 0.0) + span.duration
+        return totals
+
+
+class JSONLSink(SpanSink):
+    r"""Appends every span as one JSON line to `path`."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def emit(self, span: Span) -> None:
+        self._file.write(
+            json.dumps(asdict(span), ensure_ascii=False, default=str) + "\n"
+        )
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ChromeTraceSink(SpanSink):
+    r"""Writes the spans in the Chrome trace-event format on :meth:`close`,
+    to be opened in `chrome://tracing` or Perfetto."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._events: List[Dict[str, Any]] = []
+
+    def emit(self, span: Span) -> None:
+        self._events.append(
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": span.start * 1e6,
+                "dur": span.duration * 1e6,
+                "pid": os.getpid(),
+                "tid": span.thread_id,
+                "args": span.attrs,
+            }
+        )
+
+    def close(self) -> None:
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self._events}, f, ensure_ascii=False, default=str)
+
+
+class Tracer:
+    r"""Records spans and passes them to its sinks. Safe to use from the
+    tool worker threads.
+
+    Args:
+        sinks (List[SpanSink], optional): Where to send the spans.
+            (default: :obj:`None`, a single :obj:`InMemorySink`)
+    """
+
+    def __init__(self, sinks: Optional[List[SpanSink]] = None):
+        self.sinks = sinks if sinks is not None else [InMemorySink()]
+        self._epoch = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def record(
+        self, name: str, category: str, start: float, duration: float, **attrs
+    ) -> None:
+        r"""Record a span that started at `start` (a `time.perf_counter`
+        value) and lasted `duration` seconds."""
+        span = Span(
+            name,
+            category,
+            start - self._epoch,
+            duration,
+            threading.get_ident(),
+            attrs,
+        )
+        with self._lock:
+            for sink in self.sinks:
+                try:
+                    sink.emit(span)
+                except Exception as e:
+                    logger.warning(f"Failed to emit span to {sink}: {e}")
+
+    @contextmanager
+    def span(self, name: str, category: str, **attrs) -> Iterator[Dict[str, Any]]:
+        r"""Time the enclosed block. The yielded dict of attributes may be
+        extended inside the block."""
+        start = time.perf_counter()
+        try:
+            yield attrs
+        finally:
+            self.record(name, category, start, time.perf_counter() - start, **attrs)
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            sink.close()
+
+
+def maybe_span(
+    tracer: Optional[Tracer], name: str, category: str, **attrs
+) -> ContextManager[Dict[str, Any]]:
+    r"""Return :meth:`Tracer.span` if `tracer` is set, else a no-op."""
+    if tracer is None:
+        return nullcontext(attrs)
+    return tracer.span(name, category, **attrs)
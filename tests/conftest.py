@@ -0,0 +1,190 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pytest
+from camel.logger import set_log_level
+from camel.toolkits import FunctionTool
+
+from owl.utils import OwlRolePlaying, ScriptedModelBackend
+from owl.utils.scripted_model import ScriptItem
+
+set_log_level(level="WARNING")
+
+
+@pytest.fixture
+def make_society() -> Callable[..., OwlRolePlaying]:
+    r"""Build a society on scripted models, which runs without network
+    access."""
+
+    def _make(
+        user_script: List[ScriptItem],
+        assistant_script: List[ScriptItem],
+        tools: Optional[List[Callable[..., Any]]] = None,
+        latency: float = 0.0,
+        stream: bool = False,
+        **kwargs: Any,
+    ) -> OwlRolePlaying:
+        config = {"stream": True} if stream else None
+        assistant_kwargs: Dict[str, Any] = {
+            "model": ScriptedModelBackend(
+                model_config_dict=config, script=assistant_script, latency=latency
+            )
+        }
+        if tools:
+            assistant_kwargs["tools"] = [FunctionTool(tool) for tool in tools]
+        return OwlRolePlaying(
+            task_prompt=kwargs.pop("task_prompt", "Answer the question."),
+            with_task_specify=False,
+            user_role_name="user",
+            user_agent_kwargs={
+                "model": ScriptedModelBackend(
+                    model_config_dict=config, script=user_script, latency=latency
+                )
+            },
+            assistant_role_name="assistant",
+            assistant_agent_kwargs=assistant_kwargs,
+            **kwargs,
+        )
+
+    return _make
+
+
+def _gaia_task(i: int, level: int, file_name: str = "") -> Dict[str, Any]:
+    return {
+        "task_id": f"task-{i}",
+        "Question": f"What is {i} + 1?",
+        "Level": level,
+        "Final answer": str(i + 1),
+        "file_name": file_name,
+        "Annotator Metadata": {"Steps": "1. Add one.", "Tools": "None"},
+    }
+
+
+@pytest.fixture
+def gaia_dir(tmp_path: Path) -> Path:
+    r"""A GAIA data directory with six validation tasks over the three
+    levels and a single test task, so that no download is needed. Task 4
+    comes with a short script attachment and task 5 with a long one."""
+    splits = {
+        "validation": [_gaia_task(i, i % 3 + 1) for i in range(4)]
+        + [_gaia_task(4, 2, "short.py"), _gaia_task(5, 3, "long.py")],
+        "test": [_gaia_task(100, 1)],
+    }
+    for split, tasks in splits.items():
+        split_dir = tmp_path / "gaia" / "2023" / split
+        split_dir.mkdir(parents=True)
+        (split_dir / "short.py").write_text("# A short note.", encoding="utf-8")
+        (split_dir / "long.py").write_text(
+            "# A long report.\n" * 1000, encoding="utf-8"
+        )
+        placeholder = {**_gaia_task(0, 1), "task_id": "0-0-0-0-0"}
+        with open(split_dir / "metadata.jsonl", "w", encoding="utf-8") as f:
+            for task in [placeholder, *tasks]:
+                f.write(json.dumps(task) + "\n")
+    return tmp_path / "gaia"
+
+
+def _answer_with_sum(messages: List[Dict[str, Any]]) -> str:
+    for message in messages:
+        content = message.get("content") or ""
+        if "What is " in content:
+            number = int(content.split("What is ")[1].split(" ")[0].rstrip("?"))
+            return f"Solution: <final_answer>{number + 1}</final_answer>"
+    return "Solution: <final_answer>unknown</final_answer>"
+
+
+@pytest.fixture
+def gaia_agent_kwargs() -> Callable[..., Dict[str, Dict[str, Any]]]:
+    r"""Build the agent kwargs of :meth:`GAIABenchmark.run` on scripted
+    models that answer the tasks of :func:`gaia_dir` correctly."""
+
+    def _make(latency: float = 0.0) -> Dict[str, Dict[str, Any]]:
+        return {
+            "user_agent_kwargs": {
+                "model": ScriptedModelBackend(script=["TASK_DONE"], latency=latency)
+            },
+            "assistant_agent_kwargs": {
+                "model": ScriptedModelBackend(
+                    script=[_answer_with_sum], latency=latency
+                )
+            },
+        }
+
+    return _make
+
+
+def _pdf_bytes(pages: List[str]) -> bytes:
+    r"""A minimal PDF with one line of Helvetica text per page."""
+    font_id = 3 + 2 * len(pages)
+    kids = " ".join(f"{3 + 2 * i} 0 R" for i in range(len(pages)))
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>",
+    ]
+    for i, text in enumerate(pages):
+        stream = f"BT /F1 10 Tf 20 800 Td ({text}) Tj ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Contents {4 + 2 * i} 0 R "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    data = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += f"{i} 0 obj\n{obj}\nendobj\n".encode()
+    xref = len(data)
+    data += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        data += f"{offset:010d} 00000 n \n".encode()
+    data += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n"
+    ).encode()
+    return bytes(data)
+
+
+@pytest.fixture
+def make_pdf(tmp_path: Path) -> Callable[..., Path]:
+    r"""Write a PDF whose page `i` (1-based) reads `page i alpha<i>`, with
+    optional `(title, 0-based page)` bookmarks."""
+    from PyPDF2 import PdfReader, PdfWriter
+
+    def _make(
+        num_pages: int,
+        bookmarks: Optional[List[Tuple[str, int]]] = None,
+        name: str = "document.pdf",
+    ) -> Path:
+        path = tmp_path / name
+        path.write_bytes(
+            _pdf_bytes([f"page {i} alpha{i}" for i in range(1, num_pages + 1)])
+        )
+        if bookmarks:
+            writer = PdfWriter()
+            for page in PdfReader(path).pages:
+                writer.add_page(page)
+            for title, page_number in bookmarks:
+                writer.add_outline_item(title, page_number)
+            with open(path, "wb") as f:
+                writer.write(f)
+        return path
+
+    return _make
@@ -0,0 +1,174 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import asyncio
+import base64
+import json
+
+import httpx
+import pytest
+
+from owl.utils import arun_society
+from owl.utils import document_toolkit
+from owl.utils.document_toolkit import (
+    DocumentProcessingToolkit,
+    get_http_client,
+    http_client_scope,
+)
+
+
+@pytest.fixture
+def toolkit(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    return DocumentProcessingToolkit(cache_dir=str(tmp_path / "toolkit"))
+
+
+def test_async_extraction_matches_the_sync_one(toolkit, tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"note{i}.py"
+        path.write_text(f"# Note {i}\n", encoding="utf-8")
+        paths.append(str(path))
+
+    async def _extract():
+        return await asyncio.gather(
+            *(toolkit.aextract_document_content(path) for path in paths)
+        )
+
+    results = asyncio.run(_extract())
+
+    assert results == [toolkit.extract_document_content(path) for path in paths]
+    assert all(
+        success and f"# Note {i}" in content
+        for i, (success, content) in enumerate(results)
+    )
+
+
+def test_async_tools_are_awaited(toolkit, tmp_path):
+    path = tmp_path / "note.py"
+    path.write_text("# A note.\n", encoding="utf-8")
+
+    tools = toolkit.get_async_tools()
+
+    assert [tool.get_function_name() for tool in tools] == [
+        "aextract_document_content",
+        "aget_document_outline",
+        "asearch_document",
+    ]
+    assert all(tool.is_async for tool in tools)
+    success, content = asyncio.run(tools[0].async_call(document_path=str(path)))
+    assert success and "# A note." in content
+
+
+def test_society_closes_the_http_client(make_society):
+    def _society():
+        return make_society(["TASK_DONE"], ["Solution: <final_answer>1</final_answer>"])
+
+    async def _run():
+        client = get_http_client()
+        await arun_society(_society(), 3)
+        return client
+
+    async def _run_nested():
+        client = get_http_client()
+        async with http_client_scope():
+            # The client outlives a society while another run still uses it
+            await arun_society(_society(), 3)
+            assert not client.is_closed
+        return client
+
+    assert asyncio.run(_run()).is_closed
+    assert asyncio.run(_run_nested()).is_closed
+
+
+@pytest.fixture
+def chunkr(tmp_path, monkeypatch):
+    r"""Route the Chunkr requests of the toolkit to a handler, and return
+    the extraction of a scanned PDF and the requests made."""
+    monkeypatch.setenv("CHUNKR_API_KEY", "key")
+    monkeypatch.setenv("CHUNKR_URL", "https://chunkr.test")
+    monkeypatch.setattr(document_toolkit, "_CHUNKR_POLL_INTERVAL", 0.01)
+    path = tmp_path / "scan.pdf"
+    path.write_bytes(b"%PDF-1.4")
+    requests = []
+
+    def _extract(toolkit, handler):
+        def _handler(request):
+            requests.append((request.method, str(request.url)))
+            assert request.headers["Authorization"] == "key"
+            return handler(request)
+
+        async def _run():
+            loop = asyncio.get_running_loop()
+            document_toolkit._http_clients[loop] = httpx.AsyncClient(
+                transport=httpx.MockTransport(_handler)
+            )
+            async with http_client_scope():
+                return await toolkit._extract_content_with_chunkr(str(path))
+
+        return asyncio.run(_run()), requests
+
+    return _extract
+
+
+def _task(status, markdown=()):
+    segments = [{"segment_id": "s", "markdown": text} for text in markdown]
+    return {
+        "status": status,
+        "task_id": "t1",
+        "message": "Task failed" if status == "Failed" else None,
+        "output": {"chunks": [{"chunk_id": "c", "segments": segments}]},
+    }
+
+
+def test_chunkr_task_is_polled_until_done(toolkit, chunkr):
+    polls = []
+
+    def _handler(request):
+        if request.method == "POST":
+            body = json.loads(request.content)
+            assert body["file_name"] == "scan.pdf"
+            assert base64.b64decode(body["file"]) == b"%PDF-1.4"
+            return httpx.Response(200, json=_task("Starting"))
+        polls.append(request)
+        if len(polls) < 2:
+            return httpx.Response(200, json=_task("Processing"))
+        return httpx.Response(200, json=_task("Succeeded", ["# Scan", "Text"]))
+
+    content, requests = chunkr(toolkit, _handler)
+
+    assert content == "# Scan\n\nText"
+    assert requests == [
+        ("POST", "https://chunkr.test/task/parse"),
+        ("GET", "https://chunkr.test/task/t1"),
+        ("GET", "https://chunkr.test/task/t1"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "status, error",
+    [("Failed", "Task failed"), ("Processing", "did not finish within")],
+)
+def test_chunkr_errors(toolkit, chunkr, monkeypatch, status, error):
+    monkeypatch.setattr(document_toolkit, "_CHUNKR_MAX_WAIT", 0.05)
+
+    content, requests = chunkr(
+        toolkit, lambda request: httpx.Response(200, json=_task(status))
+    )
+
+    assert content.startswith("Error while processing document:")
+    assert error in content
+    if status == "Processing":
+        # A task stuck on the server is given up after the maximum wait
+        assert 2 <= len(requests) <= 10
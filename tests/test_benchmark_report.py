@@ -0,0 +1,110 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import csv
+
+import pytest
+
+from owl.utils import diff_reports, performance_report, write_report
+from owl.utils.benchmark_report import percentile, task_metrics
+
+
+def _result(task_id, level, score, duration, status="completed", answer="a"):
+    return {
+        "task_id": task_id,
+        "level": level,
+        "model_answer": answer,
+        "score": score,
+        "status": status,
+        "duration": duration,
+        "token_info": {
+            "prompt_token_count": 100,
+            "completion_token_count": 10,
+            "tool_call_count": 1,
+            "stop_reason": "task_done",
+            "usage": {
+                "rounds": [{}, {}],
+                "tools": {"search": {"calls": 1, "seconds": 0.5}},
+            },
+        },
+        "history": None,
+    }
+
+
+RESULTS = [
+    _result("a", 1, True, 10.0),
+    _result("b", 1, False, 20.0),
+    _result("c", 2, False, 30.0, answer=None),
+    _result("d", 2, False, 40.0, status="timeout"),
+    _result("e", 3, False, 50.0, status="failed", answer=None),
+]
+
+
+def test_percentile_interpolates():
+    assert percentile([], 50) == 0.0
+    assert percentile([1, 2, 3, 4], 50) == 2.5
+    assert percentile([4, 1, 3, 2], 100) == 4
+
+
+def test_task_metrics_outcomes():
+    outcomes = [task_metrics(result)["outcome"] for result in RESULTS]
+    assert outcomes == ["correct", "incorrect", "no_answer", "timeout", "failed"]
+    assert task_metrics(RESULTS[0])["rounds"] == 2
+
+
+def test_report_overall_and_per_level():
+    report = performance_report(RESULTS)
+
+    overall = report["overall"]
+    assert overall["tasks"] == 5 and overall["accuracy"] == 0.2
+    assert overall["outcomes"] == {
+        "correct": 1,
+        "incorrect": 1,
+        "no_answer": 1,
+        "timeout": 1,
+        "skipped": 0,
+        "failed": 1,
+    }
+    assert overall["wall_seconds"]["p50"] == 30.0
+    assert overall["wall_seconds"]["max"] == 50.0
+    assert overall["tools"] == {"search": {"calls": 5, "seconds": 2.5}}
+    assert set(report["levels"]) == {"1", "2", "3"}
+    assert report["levels"]["1"]["accuracy"] == 0.5
+
+
+def test_diff_reports():
+    base = performance_report(RESULTS)
+    new = performance_report([{**r, "duration": r["duration"] / 2} for r in RESULTS])
+
+    diff = diff_reports(base, new)
+    assert diff["overall.wall_seconds.mean"]["change"] == pytest.approx(-0.5)
+    assert diff["overall.accuracy"]["delta"] == 0
+
+    fixed = performance_report(RESULTS[:-1] + [_result("e", 3, True, 50.0)])
+    diff = diff_reports(base, fixed)
+    assert diff["overall.outcomes.failed"]["delta"] == -1
+    assert diff["overall.outcomes.correct"]["delta"] == 1
+
+
+def test_write_report_as_csv(tmp_path):
+    report = performance_report(RESULTS)
+    write_report(report, tmp_path / "report.csv")
+    write_report(diff_reports(report, report), tmp_path / "diff.csv")
+
+    with open(tmp_path / "report.csv", encoding="utf-8") as f:
+        rows = {row["metric"]: row["value"] for row in csv.DictReader(f)}
+    assert rows["overall.tasks"] == "5"
+    with open(tmp_path / "diff.csv", encoding="utf-8") as f:
+        header = next(csv.reader(f))
+    assert header == ["metric", "base", "new", "delta", "change"]
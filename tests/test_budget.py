@@ -0,0 +1,61 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+from owl.utils import SocietyBudget, run_society
+from owl.utils.budget import COST_BUDGET, PROMPT_TOKEN_BUDGET
+
+
+def _scripts(rounds=10):
+    return (
+        [f"Instruction: step {i}." for i in range(rounds)],
+        [f"Solution: {i}." for i in range(rounds - 1)]
+        + ["Solution: <final_answer>done</final_answer>"],
+    )
+
+
+def test_price_matches_the_longest_prefix():
+    budget = SocietyBudget(prices={"my-model": (1.0, 2.0)})
+
+    assert budget.price("gpt-4o-mini-2024-07-18") == (0.15, 0.6)
+    assert budget.price("gpt-4o-2024-08-06") == (2.5, 10.0)
+    assert budget.price("unknown") is None
+    assert budget.cost("my-model", 1_000_000, 500_000) == 2.0
+    assert budget.cost("unknown", 10, 10) == 0.0
+
+
+def test_exceeded_reports_the_first_exhausted_budget():
+    budget = SocietyBudget(max_prompt_tokens=100, max_cost=1.0)
+    spend = {"prompt_tokens": 50, "completion_tokens": 0, "seconds": 0.0}
+
+    assert budget.exceeded({**spend, "cost": 0.5}) is None
+    assert budget.exceeded({**spend, "cost": 1.0}) == COST_BUDGET
+    assert budget.exceeded({**spend, "prompt_tokens": 100, "cost": 1.0}) == (
+        PROMPT_TOKEN_BUDGET
+    )
+
+
+def test_prompt_token_budget_stops_with_an_answer(make_society):
+    _, unlimited, _ = run_society(make_society(*_scripts()), 10)
+    user_script, assistant_script = _scripts()
+
+    answer, history, token_info = run_society(
+        make_society(user_script, assistant_script),
+        10,
+        budget=SocietyBudget(max_prompt_tokens=1),
+    )
+
+    assert token_info["stop_reason"] == PROMPT_TOKEN_BUDGET
+    assert len(history) < len(unlimited)
+    assert answer == history[-1]["assistant"]
+    assert token_info["spend"]["prompt_tokens"] == token_info["prompt_token_count"]
@@ -0,0 +1,125 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import pytest
+from camel.messages import BaseMessage
+from PIL import Image
+
+from owl.utils import (
+    SocietyCheckpoint,
+    load_checkpoint,
+    resume_society,
+    run_society,
+    save_checkpoint,
+)
+
+
+def _scripts():
+    return (
+        ["Instruction: step one.", "Instruction: step two.", "TASK_DONE"],
+        [
+            "Solution: one.",
+            "Solution: two.",
+            "Solution: <final_answer>42</final_answer>",
+        ],
+    )
+
+
+@pytest.mark.parametrize("suffix", [".json", ".db"])
+def test_resume_continues_an_interrupted_run(make_society, tmp_path, suffix):
+    path = str(tmp_path / f"checkpoint{suffix}")
+    user_script, assistant_script = _scripts()
+
+    # Stop after the first round, as if the process had been killed
+    _, history, _ = run_society(
+        make_society(user_script, assistant_script), 1, checkpoint_path=path
+    )
+    assert len(history) == 1
+    checkpoint = load_checkpoint(path)
+    assert checkpoint.next_round == 1 and not checkpoint.finished
+
+    # A fresh society only needs the remaining replies
+    answer, history, _ = resume_society(
+        make_society(user_script[1:], assistant_script[1:]), path, round_limit=5
+    )
+    assert "42" in answer
+    assert [entry["assistant"].split("\n")[0] for entry in history] == (
+        assistant_script
+    )
+    assert load_checkpoint(path).finished
+
+
+def test_resumed_run_matches_an_uninterrupted_one(make_society, tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    user_script, assistant_script = _scripts()
+
+    expected = run_society(make_society(*_scripts()), 5)
+    run_society(make_society(*_scripts()), 2, checkpoint_path=path)
+    resumed = resume_society(
+        make_society(user_script[2:], assistant_script[2:]), path, round_limit=5
+    )
+
+    assert resumed[0] == expected[0]
+    assert [entry["user"] for entry in resumed[1]] == [
+        entry["user"] for entry in expected[1]
+    ]
+
+
+def test_compact_savings_survive_a_resume(make_society, tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    user_script, assistant_script = _scripts()
+
+    expected = run_society(make_society(*_scripts(), prompt_layout="compact"), 5)
+    run_society(
+        make_society(*_scripts(), prompt_layout="compact"), 2, checkpoint_path=path
+    )
+    resumed = resume_society(
+        make_society(user_script[2:], assistant_script[2:], prompt_layout="compact"),
+        path,
+        round_limit=5,
+    )
+
+    assert expected[2]["saved_prompt_token_count"] > 0
+    assert (
+        resumed[2]["saved_prompt_token_count"]
+        == expected[2]["saved_prompt_token_count"]
+    )
+
+
+def test_messages_with_images_round_trip(make_society, tmp_path):
+    path = tmp_path / "checkpoint.json"
+    society = make_society(*_scripts())
+    image = Image.new("RGB", (2, 2), "red")
+    message = BaseMessage.make_user_message(
+        role_name="user",
+        content="Describe the image.",
+        meta_dict={"source": "test"},
+        image_list=[image],
+    )
+    society.user_agent.update_memory(message, "user")
+
+    save_checkpoint(SocietyCheckpoint.capture(society, 1, 5, [], {}, message), path)
+    resumed_society = make_society(*_scripts())
+    restored = load_checkpoint(path).restore(resumed_society)
+
+    assert restored.content == message.content
+    assert restored.role_type == message.role_type
+    assert restored.meta_dict == {"source": "test"}
+    assert restored.image_list[0].tobytes() == image.tobytes()
+    (record,) = [
+        r.memory_record
+        for r in resumed_society.user_agent.memory.retrieve()
+        if r.memory_record.message.image_list
+    ]
+    assert record.message.image_list[0].tobytes() == image.tobytes()
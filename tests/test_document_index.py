@@ -0,0 +1,90 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+from owl.utils.document_index import BM25Index, _passages, tokenize
+from owl.utils.document_toolkit import DocumentProcessingToolkit
+from owl.utils.extraction_cache import DocumentHandle
+
+PARAGRAPHS = [
+    "The quarterly revenue grew by ten percent.",
+    "Cats sleep most of the day and hunt at night.",
+    "Revenue from services, not products, drove the revenue growth.",
+    "The weather was mild for the whole season.",
+]
+
+
+def _index():
+    handle = DocumentHandle.from_text("\n\n".join(PARAGRAPHS))
+    return handle, BM25Index.build(handle, passage_chars=80)
+
+
+def test_tokenize():
+    assert tokenize("Net revenue, 2023!") == ["net", "revenue", "2023"]
+
+
+def test_passages_end_at_paragraphs_and_boundaries():
+    content = "\n\n".join(PARAGRAPHS)
+    boundary = content.index("Revenue from")
+
+    passages = _passages(content, [boundary], 80)
+
+    assert boundary in [start for start, _ in passages]
+    assert all(stop - start <= 80 for start, stop in passages)
+    assert "".join(content[start:stop] for start, stop in passages) == content
+
+
+def test_search_ranks_by_relevance():
+    handle, index = _index()
+
+    hits = index.search("revenue growth")
+    best = handle.read_chars(*index.passages[hits[0][0]])
+    assert "Revenue from services" in best
+    assert [score for _, score in hits] == sorted(
+        (score for _, score in hits), reverse=True
+    )
+    assert all("Cats" not in handle.read_chars(*index.passages[i]) for i, _ in hits)
+    assert index.search("dogs") == []
+    assert len(index.search("the", top_k=1)) == 1
+
+
+def test_round_trip_and_stale_indexes():
+    _, index = _index()
+    data = index.dumps()
+
+    loaded = BM25Index.loads(data, passage_chars=80)
+    assert loaded.search("revenue growth") == index.search("revenue growth")
+    assert BM25Index.loads(data, passage_chars=100) is None
+    assert BM25Index.loads(data.replace('"version":"1"', '"version":"0"')) is None
+    assert BM25Index.loads(data[:20]) is None
+
+
+def test_search_document_persists_the_index(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    path = tmp_path / "notes.py"
+    path.write_text("\n\n".join(f"# {p}" for p in PARAGRAPHS), encoding="utf-8")
+    toolkit = DocumentProcessingToolkit(cache_dir=str(tmp_path / "toolkit"))
+
+    success, result = toolkit.search_document(str(path), "cats night", top_k=1)
+
+    assert success and "Cats sleep" in result and "[1] page 1" in result
+    key = toolkit.extraction_cache.key(path)
+    assert toolkit.extraction_cache.get_index(key) is not None
+
+    # A new toolkit loads the persisted index instead of rebuilding it
+    other = DocumentProcessingToolkit(cache_dir=str(tmp_path / "toolkit"))
+    monkeypatch.setattr(BM25Index, "build", None)
+    assert other.search_document(str(path), "cats night", top_k=1) == (
+        success,
+        result,
+    )
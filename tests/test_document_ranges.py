@@ -0,0 +1,89 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import pytest
+
+from owl.utils.document_toolkit import DocumentProcessingToolkit, _parse_range
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("3-5", (3, 5)), ("7", (7, 7)), ("10-", (10, None)), (" 2 - 4 ", (2, 4))],
+)
+def test_parse_range(value, expected):
+    assert _parse_range(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "a-b", "3-x", "-"])
+def test_parse_range_rejects_malformed_ranges(value):
+    with pytest.raises(ValueError, match="Invalid range"):
+        _parse_range(value)
+
+
+@pytest.fixture
+def toolkit(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    return DocumentProcessingToolkit(
+        cache_dir=str(tmp_path / "toolkit"), max_content_chars=40
+    )
+
+
+def test_read_pages(toolkit, make_pdf):
+    path = str(make_pdf(5))
+
+    success, content = toolkit.extract_document_content(path, page_range="2-3")
+    assert success and content.startswith("[Pages 2-3 of 5]")
+    assert "alpha2" in content and "alpha3" in content and "alpha4" not in content
+
+    success, content = toolkit.extract_document_content(path, page_range="5-")
+    assert content.startswith("[Page 5 of 5]") and "alpha5" in content
+
+    success, content = toolkit.extract_document_content(path, page_range="6")
+    assert not success and "5 pages" in content
+
+
+def test_read_characters_and_truncation(toolkit, make_pdf):
+    path = str(make_pdf(5))
+
+    success, content = toolkit.extract_document_content(path, char_range="0-6")
+    assert success and content.endswith("\npage 1")
+
+    success, content = toolkit.extract_document_content(path, char_range="x")
+    assert not success and "Invalid range" in content
+
+    # Whole documents beyond `max_content_chars` are cut with a note
+    success, content = toolkit.extract_document_content(path)
+    assert success and "[Truncated after 40 of" in content
+
+
+def test_outline_lists_bookmarks_with_pages(toolkit, make_pdf):
+    path = str(make_pdf(4, bookmarks=[("Introduction", 0), ("Results", 2)]))
+
+    success, outline = toolkit.get_document_outline(path)
+
+    assert success and "4 pages" in outline
+    assert "- Introduction (page 1)" in outline
+    assert "- Results (page 3)" in outline
+
+
+def test_outline_without_headings_lists_first_lines(toolkit, make_pdf):
+    success, outline = toolkit.get_document_outline(str(make_pdf(2)))
+
+    assert "- page 2: page 2 alpha2" in outline
+
+
+def test_missing_document(toolkit, tmp_path):
+    success, message = toolkit.get_document_outline(str(tmp_path / "missing.pdf"))
+
+    assert not success and "not found" in message
@@ -0,0 +1,110 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import time
+
+from camel.toolkits import FunctionTool
+
+from owl.utils import run_society
+from owl.utils.enhanced_chat_agent import is_thread_safe_tool
+
+
+def _slow_lookup(query: str) -> str:
+    r"""Look up a query.
+
+    Args:
+        query (str): The query.
+
+    Returns:
+        str: The entry.
+    """
+    time.sleep(0.3)
+    return f"entry of {query}"
+
+
+def _two_lookups(names):
+    return {
+        "content": "",
+        "tool_calls": [
+            {"name": "_slow_lookup", "arguments": {"query": name}} for name in names
+        ],
+    }
+
+
+def test_tool_calls_of_one_turn_run_concurrently(make_society):
+    society = make_society(
+        ["Instruction: look up a and b.", "TASK_DONE"],
+        [_two_lookups(["a", "b"]), "Solution: done."],
+        tools=[_slow_lookup],
+    )
+
+    start = time.perf_counter()
+    _, history, _ = run_society(society, round_limit=3)
+    seconds = time.perf_counter() - start
+
+    # Serially the two lookups take 0.6s
+    assert seconds < 0.55
+    # Results are recorded in call order
+    assert [call["args"]["query"] for call in history[0]["tool_calls"]] == ["a", "b"]
+    assert [call["result"] for call in history[0]["tool_calls"]] == [
+        "entry of a",
+        "entry of b",
+    ]
+
+
+def test_thread_safety_of_tools():
+    class _Toolkit:
+        thread_safe = False
+
+        def run(self) -> str:
+            return ""
+
+    def plain() -> str:
+        return ""
+
+    assert is_thread_safe_tool(FunctionTool(plain))
+    assert not is_thread_safe_tool(FunctionTool(_Toolkit().run))
+
+
+def test_serial_execution_with_one_worker(make_society):
+    def lookup(query: str) -> str:
+        r"""Look up a query.
+
+        Args:
+            query (str): The query.
+
+        Returns:
+            str: The entry.
+        """
+        return query
+
+    society = make_society(
+        ["Instruction: look up a and b.", "TASK_DONE"],
+        [
+            {
+                "content": "",
+                "tool_calls": [
+                    {"name": "lookup", "arguments": {"query": "a"}},
+                    {"name": "lookup", "arguments": {"query": "b"}},
+                ],
+            },
+            "Solution: done.",
+        ],
+        tools=[lookup],
+    )
+    society.assistant_agent.max_tool_workers = 1
+
+    _, history, _ = run_society(society, round_limit=3)
+
+    assert [call["result"] for call in history[0]["tool_calls"]] == ["a", "b"]
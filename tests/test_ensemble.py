@@ -0,0 +1,64 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import time
+
+import pytest
+
+from owl.utils import run_ensemble
+
+
+def _builder(make_society, answers, latencies):
+    runs = iter(zip(answers, latencies))
+
+    def _build():
+        answer, latency = next(runs)
+        return make_society(
+            ["TASK_DONE"],
+            [f"Solution: <final_answer>{answer}</final_answer>"],
+            latency=latency,
+        )
+
+    return _build
+
+
+def test_quorum_cancels_the_slow_run(make_society):
+    start = time.perf_counter()
+    result = run_ensemble(
+        _builder(make_society, ["42", "$42", "7"], [0.0, 0.05, 2.0]), size=3
+    )
+
+    assert time.perf_counter() - start < 1.5
+    assert result.answer == "42"
+    assert result.votes == 2 and result.stopped_early
+    assert [run["status"] for run in result.runs] == [
+        "completed",
+        "completed",
+        "cancelled",
+    ]
+    assert result.agreement == pytest.approx(2 / 3)
+
+
+def test_largest_group_wins_without_quorum(make_society):
+    result = run_ensemble(
+        _builder(make_society, ["a", "b", "B"], [0.0, 0.0, 0.0]), size=3, quorum=3
+    )
+
+    assert result.answer.lower() == "b"
+    assert result.votes == 2 and not result.stopped_early
+
+
+def test_invalid_quorum(make_society):
+    with pytest.raises(ValueError, match="quorum"):
+        run_ensemble(_builder(make_society, [], []), size=2, quorum=3)
@@ -0,0 +1,160 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import asyncio
+
+import httpx
+import pytest
+from PIL import Image
+
+from owl.utils import ScriptedModelBackend
+from owl.utils import document_toolkit
+from owl.utils.document_toolkit import DocumentProcessingToolkit, http_client_scope
+from owl.utils.extraction_cache import DocumentHandle, ExtractionCache
+
+
+@pytest.fixture
+def script(tmp_path):
+    path = tmp_path / "script.py"
+    path.write_text("# A script.\nprint('hello')\n", encoding="utf-8")
+    return path
+
+
+def test_put_open_and_get(tmp_path, script):
+    cache = ExtractionCache(tmp_path / "cache", version="1")
+    key = cache.key(script)
+    assert cache.open(key) is None
+
+    content_path = cache.put(key, "page one page two", page_chars=[0, 9])
+    assert content_path.read_text(encoding="utf-8") == "page one page two"
+    handle = cache.open(key)
+    assert handle.num_pages == 2 and handle.paged
+    assert handle.read_pages(1) == "page two"
+    assert cache.get(key)["content"] == "page one page two"
+    assert cache.stats()["hits"] == 2
+
+
+def test_keys_depend_on_the_version_and_variant(tmp_path, script):
+    cache = ExtractionCache(tmp_path / "cache", version="1")
+    other_version = ExtractionCache(tmp_path / "cache", version="2")
+
+    assert cache.key(script) != other_version.key(script)
+    assert cache.key(script, "model-a") != cache.key(script, "model-b")
+    assert cache.key(script, "") == cache.key(script)
+    assert cache.url_key("https://example.com/a.pdf") is None
+    assert cache.url_key("https://example.com/a.pdf", etag="1") != cache.url_key(
+        "https://example.com/a.pdf", etag="1", variant="model-a"
+    )
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ExtractionCache(tmp_path / "cache", max_bytes=2500)
+    for key in ("a" * 64, "b" * 64):
+        cache.put(key, "x" * 1000)
+    cache.get("a" * 64)
+    cache.put("c" * 64, "x" * 1000)
+
+    assert cache.get("b" * 64) is None
+    assert cache.get("a" * 64) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_in_memory_handle():
+    handle = DocumentHandle.from_text("abcdef", page_chars=[0, 3])
+
+    assert handle.read_chars(2, 5) == "cde"
+    assert handle.page_of(4) == 1
+
+
+@pytest.fixture
+def toolkit(tmp_path, monkeypatch):
+    # The image analysis toolkit needs a key even with a scripted model
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    return DocumentProcessingToolkit(cache_dir=str(tmp_path / "toolkit"))
+
+
+def test_extraction_evicted_while_open_is_extracted_again(toolkit, script):
+    assert toolkit.extract_document_content(str(script))[0]
+    cache = toolkit.extraction_cache
+    open_entry = cache.open
+
+    def _open_then_evict(key):
+        handle = open_entry(key)
+        if handle is not None:
+            handle.content_path.unlink()
+        return handle
+
+    cache.open = _open_then_evict
+    success, content = toolkit.extract_document_content(str(script))
+
+    assert success and "print('hello')" in content
+    assert toolkit.search_document(str(script), "hello")[0]
+    assert toolkit.get_document_outline(str(script))[0]
+
+
+def test_image_captions_are_cached_per_model(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    image = tmp_path / "image.png"
+    Image.new("RGB", (4, 4)).save(image)
+
+    captions = []
+    for name, caption in [
+        ("captioner-a", "An image by a."),
+        ("captioner-b", "An image by b."),
+        # Served from the cache, not captioned again
+        ("captioner-a", "Captioned again."),
+    ]:
+        toolkit = DocumentProcessingToolkit(
+            cache_dir=str(tmp_path / "toolkit"),
+            model=ScriptedModelBackend(name, script=[caption]),
+        )
+        captions.append(toolkit.extract_document_content(str(image))[1])
+
+    assert captions == ["An image by a.", "An image by b.", "An image by a."]
+
+
+@pytest.mark.parametrize("etag", ["v1", None])
+def test_webpages_are_checked_with_one_head_request(toolkit, monkeypatch, etag):
+    monkeypatch.setenv("FIRECRAWL_API_URL", "https://firecrawl.test")
+    requests = []
+
+    def _handler(request):
+        requests.append(request.method)
+        if request.method == "HEAD":
+            headers = {"Content-Type": "text/html"}
+            if etag:
+                headers["ETag"] = etag
+            return httpx.Response(200, headers=headers)
+        return httpx.Response(
+            200, json={"success": True, "data": {"markdown": "# A page"}}
+        )
+
+    async def _extract():
+        loop = asyncio.get_running_loop()
+        document_toolkit._http_clients[loop] = httpx.AsyncClient(
+            transport=httpx.MockTransport(_handler)
+        )
+        async with http_client_scope():
+            return [
+                await toolkit.aextract_document_content("https://example.test/page")
+                for _ in range(2)
+            ]
+
+    assert asyncio.run(_extract()) == [(True, "# A page")] * 2
+    # The HEAD request of the cache key also tells that the URL is a webpage,
+    # and a cached page is not crawled again
+    if etag:
+        assert requests == ["HEAD", "POST", "HEAD"]
+    else:
+        assert requests == ["HEAD", "POST", "HEAD", "POST"]
@@ -0,0 +1,236 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import json
+import time
+
+from owl.utils import GAIABenchmark, ScriptedModelBackend
+from owl.utils.gaia import task_shard
+from owl.utils.result_store import load_results
+
+
+def _benchmark(gaia_dir, tmp_path, **kwargs):
+    return GAIABenchmark(
+        data_dir=str(gaia_dir), save_to=str(tmp_path / "results.json"), **kwargs
+    ).load()
+
+
+def test_concurrent_run_keeps_task_order(gaia_dir, gaia_agent_kwargs, tmp_path):
+    benchmark = _benchmark(gaia_dir, tmp_path)
+    agent_kwargs = gaia_agent_kwargs(latency=0.05)
+
+    start = time.perf_counter()
+    summary = benchmark.run(
+        "user", "assistant", **agent_kwargs, on="valid", level="all", concurrency=6
+    )
+    elapsed = time.perf_counter() - start
+
+    assert summary["total"] == 6 and summary["correct"] == 6
+    assert [r["task_id"] for r in benchmark._results] == [f"task-{i}" for i in range(6)]
+    # Each task makes two model calls, run sequentially this takes 0.6s
+    assert elapsed < 0.45
+
+
+def test_shared_agent_kwargs_are_not_modified(gaia_dir, gaia_agent_kwargs, tmp_path):
+    benchmark = _benchmark(gaia_dir, tmp_path)
+    agent_kwargs = gaia_agent_kwargs()
+    expected = {role: dict(kwargs) for role, kwargs in agent_kwargs.items()}
+
+    benchmark.run(
+        "user", "assistant", **agent_kwargs, on="valid", level=1, concurrency=2
+    )
+
+    assert agent_kwargs == expected
+
+
+def test_agent_kwargs_factory_is_called_per_task(gaia_dir, gaia_agent_kwargs, tmp_path):
+    benchmark = _benchmark(gaia_dir, tmp_path)
+    calls = []
+
+    def _assistant_kwargs():
+        calls.append(1)
+        return gaia_agent_kwargs()["assistant_agent_kwargs"]
+
+    summary = benchmark.run(
+        "user",
+        "assistant",
+        user_agent_kwargs=gaia_agent_kwargs()["user_agent_kwargs"],
+        assistant_agent_kwargs=_assistant_kwargs,
+        on="valid",
+        level="all",
+        concurrency=3,
+    )
+
+    assert summary["correct"] == 6
+    assert len(calls) == 6
+
+
+def test_failed_tasks_are_recorded_and_retried(gaia_dir, gaia_agent_kwargs, tmp_path):
+    save_to = str(tmp_path / "results.jsonl")
+
+    def _fail_on_task_1(messages):
+        if any("What is 1 + 1?" in (m.get("content") or "") for m in messages):
+            raise RuntimeError("model unavailable")
+        return "TASK_DONE"
+
+    benchmark = GAIABenchmark(data_dir=str(gaia_dir), save_to=save_to).load()
+    summary = benchmark.run(
+        "user",
+        "assistant",
+        user_agent_kwargs={"model": ScriptedModelBackend(script=[_fail_on_task_1])},
+        assistant_agent_kwargs=gaia_agent_kwargs()["assistant_agent_kwargs"],
+        on="valid",
+        level="all",
+        save_result=True,
+    )
+
+    assert summary["total"] == 6 and summary["correct"] == 5
+    assert summary["failed"] == 1
+    (failed,) = [r for r in benchmark._results if r["status"] == "failed"]
+    assert failed["task_id"] == "task-1" and failed["score"] is False
+    assert "model unavailable" in failed["error"] and failed["duration"] >= 0
+    assert summary["performance"]["overall"]["outcomes"]["failed"] == 1
+
+    # A resumed run only reruns the failed task
+    resumed = GAIABenchmark(data_dir=str(gaia_dir), save_to=save_to).load()
+    summary = resumed.run(
+        "user",
+        "assistant",
+        **gaia_agent_kwargs(),
+        on="valid",
+        level="all",
+        save_result=True,
+    )
+    assert summary["total"] == 6 and summary["correct"] == 6
+    assert summary["failed"] == 0
+    assert [r["task_id"] for r in resumed._results][-1] == "task-1"
+
+
+def test_shards_partition_the_tasks(gaia_dir, gaia_agent_kwargs, tmp_path):
+    paths = []
+    for shard_index in range(3):
+        path = tmp_path / f"shard-{shard_index}.jsonl"
+        benchmark = GAIABenchmark(data_dir=str(gaia_dir), save_to=str(path)).load()
+        benchmark.run(
+            "user",
+            "assistant",
+            **gaia_agent_kwargs(),
+            on="valid",
+            level="all",
+            save_result=True,
+            shard_index=shard_index,
+            shard_count=3,
+        )
+        assert all(
+            task_shard(r["task_id"], 3) == shard_index for r in benchmark._results
+        )
+        paths.append(str(path))
+
+    merged = _benchmark(gaia_dir, tmp_path)
+    summary = merged.merge_results(paths)
+    assert summary["total"] == 6 and summary["correct"] == 6
+    assert sorted(r["task_id"] for r in merged._results) == [
+        f"task-{i}" for i in range(6)
+    ]
+
+
+def test_merge_prefers_completed_results(gaia_dir, tmp_path):
+    completed = {
+        "task_id": "task-0",
+        "model_answer": "1",
+        "ground_truth": "1",
+        "status": "completed",
+    }
+    timeout = {**completed, "model_answer": None, "status": "timeout"}
+    first, second = tmp_path / "first.json", tmp_path / "second.json"
+    first.write_text(json.dumps([completed]), encoding="utf-8")
+    second.write_text(json.dumps([timeout]), encoding="utf-8")
+
+    benchmark = _benchmark(gaia_dir, tmp_path)
+    summary = benchmark.merge_results([str(first), str(second)], save_result=False)
+
+    assert summary["correct"] == 1
+    assert benchmark._results[0]["status"] == "completed"
+
+
+def test_merge_replaces_the_output_and_reextracts_answers(
+    gaia_dir, gaia_agent_kwargs, tmp_path
+):
+    paths = []
+    for shard_index in range(2):
+        path = tmp_path / f"shard-{shard_index}.jsonl"
+        benchmark = GAIABenchmark(data_dir=str(gaia_dir), save_to=str(path)).load()
+        benchmark.run(
+            "user",
+            "assistant",
+            **gaia_agent_kwargs(),
+            on="valid",
+            level="all",
+            save_result=True,
+            shard_index=shard_index,
+            shard_count=2,
+        )
+        paths.append(str(path))
+    # A stale answer, e.g. from an older extraction, is extracted again
+    other = tmp_path / "other.json"
+    stale = {
+        "task_id": "task-0",
+        "model_answer": "wrong",
+        "raw_answer": "Solution: <final_answer>1</final_answer>",
+        "ground_truth": "1",
+        "status": "completed",
+        "history": [],
+    }
+    other.write_text(json.dumps([stale]), encoding="utf-8")
+
+    # Merging into the first shard twice leaves one result per task
+    for _ in range(2):
+        merged = GAIABenchmark(data_dir=str(gaia_dir), save_to=paths[0]).load()
+        summary = merged.merge_results([*paths, str(other)])
+    assert summary["total"] == 6 and summary["correct"] == 6
+
+    with open(paths[0], encoding="utf-8") as f:
+        task_ids = [json.loads(line)["task_id"] for line in f]
+    assert sorted(task_ids) == [f"task-{i}" for i in range(6)]
+    (task_0,) = [r for r in load_results(paths[0]) if r["task_id"] == "task-0"]
+    assert task_0["model_answer"] == "1" and task_0["score"] is True
+    assert all(r["history"] is not None for r in load_results(paths[0]))
+
+
+def test_task_shard_is_stable():
+    assert task_shard("task-0", 4) == task_shard("task-0", 4)
+    assert {task_shard(f"task-{i}", 4) for i in range(100)} == {0, 1, 2, 3}
+
+
+def test_attachment_notes_stay_short(gaia_dir, tmp_path, monkeypatch):
+    # The image analysis toolkit of the document toolkit needs a key
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    benchmark = _benchmark(gaia_dir, tmp_path)
+
+    stats = benchmark.preextract_attachments(cache_dir=str(tmp_path / "cache"))
+    assert stats["extracted"] == 2
+
+    tasks = {task["task_id"]: task for task in benchmark._data["valid"]}
+    assert benchmark._prepare_task(tasks["task-4"]) == (True, None)
+    assert tasks["task-4"]["Question"].endswith(
+        "has already been extracted:\n# A short note."
+    )
+    benchmark._prepare_task(tasks["task-5"])
+    note = tasks["task-5"]["Question"]
+    assert "17000 characters" in note and "search_document" in note
+    assert "A long report." not in note
+    assert len(note) < 500
+
+    again = benchmark.preextract_attachments(cache_dir=str(tmp_path / "cache"))
+    assert again["cached"] == 2
@@ -0,0 +1,53 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import pytest
+
+from owl.utils.gaia_dataset import GAIADataset
+
+
+@pytest.fixture
+def dataset(gaia_dir):
+    return GAIADataset(gaia_dir / "2023" / "validation" / "metadata.jsonl")
+
+
+def test_index_skips_the_placeholder(dataset):
+    assert len(dataset) == 6
+    assert "0-0-0-0-0" not in dataset
+    assert dataset.task_ids() == [f"task-{i}" for i in range(6)]
+    assert dataset.task_ids([1]) == ["task-0", "task-3"]
+    assert dataset.level("task-5") == 3
+
+
+def test_tasks_are_read_on_demand(dataset):
+    task = dataset["task-4"]
+
+    assert task["Question"] == "What is 4 + 1?"
+    assert task["file_name"] == dataset.metadata_path.parent / "short.py"
+    with pytest.raises(KeyError):
+        dataset["missing"]
+
+
+def test_select_keeps_the_order_and_returns_copies(dataset):
+    tasks = list(dataset.select(["task-2", "task-0"]))
+    assert [task["task_id"] for task in tasks] == ["task-2", "task-0"]
+
+    tasks[0]["Question"] += " Changed."
+    assert dataset["task-2"]["Question"] == "What is 2 + 1?"
+    with pytest.raises(KeyError, match="missing"):
+        dataset.select(["task-0", "missing"])
+
+
+def test_iteration_streams_all_tasks(dataset):
+    assert [task["task_id"] for task in dataset] == dataset.task_ids()
@@ -0,0 +1,114 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import json
+
+import pytest
+
+from owl.utils import ResultStore
+from owl.utils.gaia_scoring import (
+    answer_key,
+    question_scorer,
+    rescore_file,
+    score_result,
+)
+
+
+@pytest.mark.parametrize(
+    "model_answer, ground_truth, expected",
+    [
+        ("$1,000", "1000", True),
+        ("12%", "12", True),
+        ("3.5", "4", False),
+        ("Paris, London", "paris,london", True),
+        ("1; 2", "1,2", True),
+        ("1, 2, 3", "1,2", False),
+        ("The Eiffel Tower!", "the eiffel tower", True),
+        ("Tower", "the eiffel tower", False),
+    ],
+)
+def test_question_scorer(model_answer, ground_truth, expected):
+    assert question_scorer(model_answer, ground_truth) is expected
+
+
+def test_answer_key_groups_equivalent_answers():
+    assert answer_key("$1,000") == answer_key("1000")
+    assert answer_key("A, b") == answer_key("a,B")
+    assert answer_key("The End.") == answer_key("the end")
+    assert answer_key("1") != answer_key("2")
+
+
+def test_score_result_falls_back_to_the_history():
+    result = {
+        "model_answer": None,
+        "ground_truth": "42",
+        "history": [{"assistant": "Solution: <final_answer>42</final_answer>"}],
+    }
+    assert score_result(result) == ("42", True)
+    assert score_result({"model_answer": "41", "ground_truth": "42"}) == (
+        "41",
+        False,
+    )
+
+
+def _results():
+    return [
+        {
+            "task_id": "a",
+            "model_answer": None,
+            "raw_answer": "<final_answer>42</final_answer>",
+            "ground_truth": "42",
+            "score": False,
+            "history": [{"assistant": "a"}],
+        },
+        {
+            "task_id": "b",
+            "model_answer": "x",
+            "raw_answer": "<final_answer>x</final_answer>",
+            "ground_truth": "x",
+            "score": True,
+            "history": [{"assistant": "b"}],
+        },
+    ]
+
+
+def test_rescore_json_file(tmp_path):
+    path = tmp_path / "results.json"
+    path.write_text(json.dumps(_results()), encoding="utf-8")
+
+    summary = rescore_file(path, tmp_path / "out.json", tmp_path / "diff.jsonl")
+
+    assert (summary["total"], summary["correct"], summary["fixed"]) == (2, 2, 1)
+    rescored = json.loads((tmp_path / "out.json").read_text(encoding="utf-8"))
+    assert rescored[0]["model_answer"] == "42" and rescored[0]["score"]
+    (change,) = (tmp_path / "diff.jsonl").read_text(encoding="utf-8").splitlines()
+    assert json.loads(change)["task_id"] == "a"
+
+
+def test_rescore_store_in_place(tmp_path):
+    path = tmp_path / "results.jsonl"
+    store = ResultStore(path)
+    for result in _results():
+        store.append(result)
+    history_size = store.history_path.stat().st_size
+
+    summary = rescore_file(path, path)
+
+    assert summary["correct"] == 2
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 2
+    assert store.history_path.stat().st_size == history_size
+    assert not (tmp_path / "results.jsonl.tmp").exists()
+    rescored = ResultStore(path)
+    assert rescored.get("a")["score"] is True
+    assert rescored.get("b")["history"] == [{"assistant": "b"}]
@@ -0,0 +1,99 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from owl.utils import CachedModelBackend, ResponseCache, ScriptedModelBackend
+
+MESSAGES = [{"role": "user", "content": "What is the answer?"}]
+
+
+def test_record_then_replay(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"))
+    backend = ScriptedModelBackend(script=["42"])
+    model = CachedModelBackend(backend, cache)
+
+    first = model.run(MESSAGES)
+    second = model.run(MESSAGES)
+    assert backend.num_calls == 1
+    assert second.choices[0].message.content == "42"
+    assert second.id == first.id
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # A new process replays from disk, without calling the backend
+    replay = CachedModelBackend(
+        ScriptedModelBackend(script=["other"]),
+        ResponseCache(str(tmp_path / "cache.db")),
+        mode="replay",
+    )
+    assert replay.run(MESSAGES).choices[0].message.content == "42"
+    assert replay.backend.num_calls == 0
+
+
+def test_replay_miss_raises(tmp_path):
+    model = CachedModelBackend(
+        ScriptedModelBackend(),
+        ResponseCache(str(tmp_path / "cache.db")),
+        mode="replay",
+    )
+    with pytest.raises(RuntimeError, match="No cached response"):
+        model.run(MESSAGES)
+
+
+def test_passthrough_and_arun(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"))
+    backend = ScriptedModelBackend(script=["a", "b"])
+    model = CachedModelBackend(backend, cache, mode="passthrough")
+
+    assert model.run(MESSAGES).choices[0].message.content == "a"
+    assert asyncio.run(model.arun(MESSAGES)).choices[0].message.content == "b"
+    assert len(cache) == 0
+
+
+def test_different_messages_are_different_entries(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"))
+    model = CachedModelBackend(ScriptedModelBackend(script=["a", "b"]), cache)
+
+    model.run(MESSAGES)
+    other = model.run([{"role": "user", "content": "Something else?"}])
+    assert other.choices[0].message.content == "b"
+    assert len(cache) == 2
+
+
+def test_eviction_keeps_recently_used(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"), max_bytes=25)
+    cache.put("a", "x" * 10)
+    cache.put("b", "x" * 10)
+    assert cache.get("a") is not None
+    cache.put("c", "x" * 10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+
+def test_stats_of_concurrent_lookups(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"))
+    cache.put("hit", "value")
+
+    def _lookup(i):
+        return cache.get("hit" if i % 2 else "miss")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        values = list(executor.map(_lookup, range(200)))
+
+    assert values.count("value") == 100
+    assert (cache.hits, cache.misses) == (100, 100)
@@ -0,0 +1,53 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import pytest
+
+from owl.utils.document_toolkit import (
+    DocumentProcessingToolkit,
+    extract_pdf_text,
+    iter_pdf_pages,
+)
+
+
+def test_parallel_extraction_keeps_the_page_order(make_pdf):
+    path = str(make_pdf(20))
+
+    sequential = extract_pdf_text(path, max_workers=1)
+    parallel = extract_pdf_text(path, max_workers=2)
+
+    assert parallel == sequential
+    assert len(parallel) == 20
+    assert [page.strip() for page in parallel[:2]] == ["page 1 alpha1", "page 2 alpha2"]
+    assert sorted(i for i, _ in iter_pdf_pages(path, 2, pages_per_task=3)) == list(
+        range(20)
+    )
+
+
+@pytest.fixture
+def toolkit(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    # Chunkr must not be needed for PDFs with a text layer
+    monkeypatch.delenv("CHUNKR_API_KEY", raising=False)
+    return DocumentProcessingToolkit(cache_dir=str(tmp_path / "toolkit"))
+
+
+def test_pdfs_are_extracted_locally(toolkit, make_pdf):
+    path = make_pdf(3, bookmarks=[("Introduction", 0), ("Results", 2)])
+
+    success, content = toolkit.extract_document_content(str(path))
+
+    assert success
+    assert "page 1 alpha1" in content and "page 3 alpha3" in content
+    assert content.index("alpha1") < content.index("alpha2") < content.index("alpha3")
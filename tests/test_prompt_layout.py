@@ -0,0 +1,89 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import pytest
+
+from owl.utils import run_society
+
+
+def _scripts():
+    return (
+        ["Instruction: step one.", "Instruction: step two.", "TASK_DONE"],
+        [
+            "Solution: one.",
+            "Solution: two.",
+            "Solution: <final_answer>42</final_answer>",
+        ],
+    )
+
+
+def _run(make_society, prompt_layout):
+    society = make_society(
+        *_scripts(),
+        task_prompt="What is the answer? " * 50,
+        prompt_layout=prompt_layout,
+    )
+    return society, run_society(society, 5)
+
+
+def test_compact_layout_sends_the_task_once(make_society):
+    _, (_, full_history, full_info) = _run(make_society, "full")
+    _, (_, compact_history, compact_info) = _run(make_society, "compact")
+
+    assert full_info["prompt_layout"] == "full"
+    assert full_info["saved_prompt_token_count"] == 0
+    assert compact_info["saved_prompt_token_count"] > 0
+    assert compact_info["prompt_token_count"] < full_info["prompt_token_count"]
+    assert len(compact_history) == len(full_history)
+    assert "What is the answer?" in full_history[0]["user"]
+    assert "What is the answer?" not in compact_history[0]["user"]
+
+
+def test_saved_tokens_are_counted_once_per_message(make_society):
+    society, _ = _run(make_society, "compact")
+    saved = dict(society._saved_tokens_in_history)
+
+    # Building a suffix again, e.g. to re-render a message, saves nothing
+    society._instruction_suffix()
+    society._reminder_suffix()
+    assert society._saved_tokens_in_history == saved
+
+    fresh = make_society(
+        *_scripts(), task_prompt="What is the answer? " * 50, prompt_layout="compact"
+    )
+    fresh._record_saved_tokens("assistant")
+    fresh._record_saved_tokens("user")
+    per_message = fresh._saved_tokens_in_history
+    assert per_message["assistant"] > 0 and per_message["user"] > 0
+    # Two instructions and two replies were sent before TASK_DONE
+    assert saved == {role: 2 * tokens for role, tokens in per_message.items()}
+
+
+def test_system_prompts_share_a_prefix_across_tasks(make_society):
+    first = make_society(*_scripts(), task_prompt="First task.")
+    second = make_society(*_scripts(), task_prompt="Second task.")
+
+    for a, b in (
+        (first.user_sys_msg.content, second.user_sys_msg.content),
+        (first.assistant_sys_msg.content, second.assistant_sys_msg.content),
+    ):
+        # Everything before the task is byte-identical, so it can be cached
+        prefix = a[: a.index("First task.")]
+        assert len(prefix) > len(a) // 2
+        assert b.startswith(prefix)
+
+
+def test_invalid_prompt_layout(make_society):
+    with pytest.raises(ValueError, match="prompt_layout"):
+        make_society(*_scripts(), prompt_layout="tiny")
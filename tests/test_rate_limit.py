@@ -0,0 +1,82 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import asyncio
+
+import pytest
+
+from owl.utils import RateLimiter, get_rate_limiter, run_society, set_rate_limit
+from owl.utils.rate_limit import clear_rate_limits
+
+
+@pytest.fixture(autouse=True)
+def _clear_limits():
+    yield
+    clear_rate_limits()
+
+
+def test_token_limit_queues_calls_beyond_the_quota():
+    limiter = RateLimiter(tokens_per_minute=600)
+
+    assert limiter.acquire(600) == 0
+    assert limiter.acquire(1) == pytest.approx(0.1, abs=0.02)
+    stats = limiter.stats()
+    assert stats["requests"] == 2 and stats["queued_requests"] == 1
+
+
+def test_settle_returns_unused_tokens():
+    limiter = RateLimiter(tokens_per_minute=600)
+
+    limiter.acquire(600)
+    limiter.settle(600, 0)
+    assert limiter.acquire(600) == 0
+
+
+def test_cancelled_wait_gives_the_reservation_back():
+    limiter = RateLimiter(requests_per_minute=600)
+    for _ in range(600):
+        limiter.acquire()
+
+    async def _cancel_waiter():
+        waiter = asyncio.ensure_future(limiter.aacquire())
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+    asyncio.run(_cancel_waiter())
+    # Only the refill since the first call is owed, not the cancelled one
+    assert limiter.acquire() < 0.15
+
+
+def test_limiters_match_by_prefix():
+    gpt = set_rate_limit(["gpt-4o", "gpt-4.1"], requests_per_minute=500)
+    default = set_rate_limit("", requests_per_minute=100)
+
+    assert get_rate_limiter("gpt-4o-2024-08-06") is gpt
+    assert get_rate_limiter("gpt-4.1") is gpt
+    assert get_rate_limiter("other") is default
+
+
+def test_society_calls_wait_for_the_limiter(make_society):
+    limiter = set_rate_limit("scripted", requests_per_minute=1000)
+
+    run_society(
+        make_society(
+            ["Instruction: a.", "TASK_DONE"],
+            ["Solution: a.", "Solution: <final_answer>a</final_answer>"],
+        ),
+        5,
+    )
+
+    assert limiter.stats()["requests"] == 4
@@ -0,0 +1,97 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import json
+
+import pytest
+
+from owl.utils import ResultStore
+from owl.utils.result_store import load_results
+
+
+def _result(task_id, score=1, history=None):
+    return {
+        "task_id": task_id,
+        "model_answer": "a",
+        "score": score,
+        "history": history if history is not None else [{"user": task_id}],
+    }
+
+
+def test_append_and_read_back(tmp_path):
+    store = ResultStore(tmp_path / "results.jsonl")
+    store.append(_result("a"))
+    store.append(_result("b", history=[]))
+
+    assert len(store) == 2 and "a" in store
+    assert store.get("a")["history"] == [{"user": "a"}]
+    assert "history" not in store.get("a", with_history=False)
+    assert store.get("missing") is None
+    assert [r["task_id"] for r in store.results()] == ["a", "b"]
+
+
+def test_latest_result_wins_and_compact_drops_the_rest(tmp_path):
+    store = ResultStore(tmp_path / "results.jsonl")
+    store.append(_result("a", score=0))
+    store.append(_result("b"))
+    store.append(_result("a", score=1, history=[{"user": "rerun"}]))
+
+    reopened = ResultStore(tmp_path / "results.jsonl")
+    assert [r["task_id"] for r in reopened.results()] == ["b", "a"]
+    assert reopened.get("a")["score"] == 1
+
+    reopened.compact()
+    lines = (tmp_path / "results.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    assert ResultStore(tmp_path / "results.jsonl").get("a")["history"] == [
+        {"user": "rerun"}
+    ]
+
+
+@pytest.mark.parametrize(
+    "garbage",
+    [
+        b'{"task_id": "c", "sco',
+        b'{"task_id": "c", "answer": "\xe4\xb8',
+        b"42",
+        b'["task_id"]',
+        b'{"answer": "no task id"}',
+    ],
+)
+def test_corrupt_last_line_is_skipped(tmp_path, garbage):
+    path = tmp_path / "results.jsonl"
+    store = ResultStore(path)
+    store.append(_result("a"))
+    store.append(_result("b"))
+    # A crash in the middle of writing the last line
+    with open(path, "ab") as f:
+        f.write(garbage)
+
+    store = ResultStore(path)
+    assert [r["task_id"] for r in store.results()] == ["a", "b"]
+
+    # Later results are still appended on a line of their own
+    store.append(_result("c"))
+    assert [r["task_id"] for r in ResultStore(path).results()] == ["a", "b", "c"]
+
+
+def test_export_and_load_results(tmp_path):
+    store = ResultStore(tmp_path / "results.jsonl")
+    store.append(_result("a"))
+    store.export_json(tmp_path / "results.json")
+
+    exported = json.loads((tmp_path / "results.json").read_text(encoding="utf-8"))
+    assert exported == [_result("a")]
+    assert load_results(tmp_path / "results.json") == exported
+    assert load_results(tmp_path / "results.jsonl") == exported
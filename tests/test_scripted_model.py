@@ -0,0 +1,112 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import asyncio
+import json
+
+from owl.utils import ScriptedModelBackend, run_society_benchmark
+from owl.utils.scripted_model import ApproxTokenCounter
+
+MESSAGES = [{"role": "user", "content": "Hello"}]
+
+
+def test_script_is_replayed_in_order_then_repeats():
+    model = ScriptedModelBackend(script=["one", "two"])
+
+    contents = [model.run(MESSAGES).choices[0].message.content for _ in range(3)]
+    assert contents == ["one", "two", "two"]
+    assert model.num_calls == 3
+    assert len(model.call_seconds) == 3
+
+
+def test_tool_calls_and_callables():
+    model = ScriptedModelBackend(
+        script=[
+            {"content": "", "tool_calls": [{"name": "f", "arguments": {"x": 1}}]},
+            lambda messages: f"saw {len(messages)} messages",
+        ]
+    )
+
+    response = model.run(MESSAGES)
+    assert response.choices[0].finish_reason == "tool_calls"
+    call = response.choices[0].message.tool_calls[0]
+    assert call.function.name == "f"
+    assert json.loads(call.function.arguments) == {"x": 1}
+    assert model.run(MESSAGES).choices[0].message.content == "saw 1 messages"
+
+
+def test_from_jsonl(tmp_path):
+    path = tmp_path / "script.jsonl"
+    path.write_text('"first"\n\n{"content": "second"}\n', encoding="utf-8")
+    model = ScriptedModelBackend.from_jsonl(str(path), latency=0.0)
+
+    assert model.script == ["first", {"content": "second"}]
+
+
+def test_usage_uses_the_approximate_counter():
+    model = ScriptedModelBackend(script=["abcdefgh"])
+
+    usage = model.run(MESSAGES).usage
+    assert isinstance(model.token_counter, ApproxTokenCounter)
+    assert usage.prompt_tokens == model.token_counter.count_tokens_from_messages(
+        MESSAGES
+    )
+    assert usage.completion_tokens == 3
+
+
+def test_async_stream_yields_word_chunks():
+    model = ScriptedModelBackend(
+        model_config_dict={"stream": True}, script=["a b c"], latency=0.01
+    )
+
+    async def _collect():
+        stream = await model.arun(MESSAGES)
+        return [chunk.choices[0].delta.content async for chunk in stream]
+
+    assert asyncio.run(_collect()) == ["a ", "b ", "c"]
+    assert "".join(chunk.choices[0].delta.content for chunk in model.run(MESSAGES)) == (
+        "a b c"
+    )
+
+
+def lookup_tags(query: str) -> set:
+    r"""Look up the tags of a query.
+
+    Args:
+        query (str): The query.
+
+    Returns:
+        set: The tags.
+    """
+    return {query, "tag"}
+
+
+def test_society_benchmark_checkpoints_any_tool_result(make_society):
+    society = make_society(
+        ["Instruction: look up a.", "TASK_DONE"],
+        [
+            {
+                "content": "",
+                "tool_calls": [{"name": "lookup_tags", "arguments": {"query": "a"}}],
+            },
+            "Solution: <final_answer>a</final_answer>",
+        ],
+        tools=[lookup_tags],
+    )
+
+    # The tool result is not JSON serializable, as checkpoints allow
+    result = run_society_benchmark(society, 5)
+
+    assert result.rounds == 2
+    assert result.checkpoint_seconds > 0 and result.deepcopy_seconds > 0
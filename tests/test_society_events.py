@@ -0,0 +1,125 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import asyncio
+
+from owl.utils import aiter_society, arun_society, iter_society, run_society
+from owl.utils.society_events import (
+    AssistantMessageEvent,
+    RoundEndEvent,
+    SocietyEndEvent,
+    ToolCallEvent,
+    UserMessageEvent,
+)
+
+
+def lookup(query: str) -> str:
+    r"""Look up a query.
+
+    Args:
+        query (str): The query.
+
+    Returns:
+        str: The entry.
+    """
+    return f"entry of {query}"
+
+
+def _scripts():
+    return (
+        ["Instruction: look up a.", "Instruction: answer.", "TASK_DONE"],
+        [
+            {
+                "content": "",
+                "tool_calls": [{"name": "lookup", "arguments": {"query": "a"}}],
+            },
+            "Solution: found a.",
+            "Solution: <final_answer>a</final_answer>",
+        ],
+    )
+
+
+def _kinds(events):
+    return [type(event).__name__ for event in events]
+
+
+EXPECTED_KINDS = [
+    "UserMessageEvent",
+    "ToolCallEvent",
+    "AssistantMessageEvent",
+    "RoundEndEvent",
+    "UserMessageEvent",
+    "AssistantMessageEvent",
+    "RoundEndEvent",
+    "UserMessageEvent",
+    "AssistantMessageEvent",
+    "RoundEndEvent",
+    "SocietyEndEvent",
+]
+
+
+def test_iter_society_yields_rounds_in_order(make_society):
+    events = list(iter_society(make_society(*_scripts(), tools=[lookup]), 5))
+
+    assert _kinds(events) == EXPECTED_KINDS
+    assert isinstance(events[0], UserMessageEvent)
+    assert isinstance(events[1], ToolCallEvent)
+    assert events[1].tool_name == "lookup" and events[1].result == "entry of a"
+    assert isinstance(events[2], AssistantMessageEvent)
+    assert [e.round_idx for e in events if isinstance(e, RoundEndEvent)] == [0, 1, 2]
+    assert [e.terminated for e in events if isinstance(e, RoundEndEvent)] == [
+        False,
+        False,
+        True,
+    ]
+    end = events[-1]
+    assert isinstance(end, SocietyEndEvent)
+    assert end.answer == "Solution: <final_answer>a</final_answer>"
+    assert end.token_info["stop_reason"] == "task_done"
+
+
+def test_aiter_society_matches_iter_society(make_society):
+    async def _collect():
+        return [
+            event
+            async for event in aiter_society(
+                make_society(*_scripts(), tools=[lookup]), 5
+            )
+        ]
+
+    events = asyncio.run(_collect())
+
+    assert _kinds(events) == EXPECTED_KINDS
+
+
+def test_run_society_returns_the_end_event(make_society):
+    answer, history, token_info = run_society(
+        make_society(*_scripts(), tools=[lookup]), 5
+    )
+    async_answer, async_history, _ = asyncio.run(
+        arun_society(make_society(*_scripts(), tools=[lookup]), 5)
+    )
+
+    assert answer == async_answer
+    assert len(history) == len(async_history) == 3
+    assert token_info["stop_reason"] == "task_done"
+
+
+def test_round_limit_stops_the_run(make_society):
+    answer, history, token_info = run_society(
+        make_society(["Instruction: go on."], ["Solution: going on."]), 2
+    )
+
+    assert len(history) == 2
+    assert token_info["stop_reason"] == "round_limit"
@@ -0,0 +1,66 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import asyncio
+import time
+
+from owl.utils import aiter_society, arun_society, run_society
+from owl.utils.society_events import SocietyEndEvent, TokenDeltaEvent
+
+
+def _scripts():
+    return (
+        ["Instruction: step one.", "TASK_DONE"],
+        ["Solution: one.", "Solution: <final_answer>42</final_answer>"],
+    )
+
+
+def test_run_society_stops_at_the_deadline(make_society):
+    start = time.perf_counter()
+    answer, history, token_info = run_society(
+        make_society(*_scripts(), latency=1.0), 5, timeout=0.2
+    )
+
+    assert time.perf_counter() - start < 0.9
+    assert token_info["stop_reason"] == "timeout"
+    assert history == [] and answer == ""
+
+
+def test_arun_society_stops_at_the_deadline(make_society):
+    _, _, token_info = asyncio.run(
+        arun_society(make_society(*_scripts(), latency=1.0), 5, timeout=0.2)
+    )
+
+    assert token_info["stop_reason"] == "timeout"
+
+
+def test_streaming_past_the_deadline(make_society):
+    # Every reply streams one word chunk after another for a second
+    society = make_society(*_scripts(), latency=1.0, stream=True)
+
+    async def _collect():
+        return [
+            event
+            async for event in aiter_society(
+                society, 5, stream_tokens=True, timeout=0.3
+            )
+        ]
+
+    start = time.perf_counter()
+    events = asyncio.run(_collect())
+
+    assert time.perf_counter() - start < 0.9
+    assert isinstance(events[-1], SocietyEndEvent)
+    assert events[-1].token_info["stop_reason"] == "timeout"
+    assert all(isinstance(event, TokenDeltaEvent) for event in events[:-1])
@@ -0,0 +1,74 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import asyncio
+
+from owl.utils import TokenAccounting, arun_society, run_society
+
+
+def lookup(query: str) -> str:
+    r"""Look up a query.
+
+    Args:
+        query (str): The query.
+
+    Returns:
+        str: The entry.
+    """
+    return f"entry of {query}"
+
+
+def _scripts():
+    return (
+        ["Instruction: look up a.", "TASK_DONE"],
+        [
+            {
+                "content": "",
+                "tool_calls": [{"name": "lookup", "arguments": {"query": "a"}}],
+            },
+            "Solution: <final_answer>a</final_answer>",
+        ],
+    )
+
+
+def test_sync_and_async_runs_account_the_same(make_society):
+    _, _, sync_info = run_society(make_society(*_scripts(), tools=[lookup]), 5)
+    _, _, async_info = asyncio.run(
+        arun_society(make_society(*_scripts(), tools=[lookup]), 5)
+    )
+
+    for info in (sync_info, async_info):
+        usage = info["usage"]
+        assert info["prompt_token_count"] == usage["total"]["prompt_tokens"] > 0
+        assert info["tool_call_count"] == 1
+        assert set(usage["agents"]) == {"user", "assistant"}
+        assert "scripted" in usage["models"]
+        assert usage["tools"]["lookup"]["calls"] == 1
+        assert [entry["round"] for entry in usage["rounds"]] == [0, 1]
+
+    # The async step words its prompts differently, so only the calls and
+    # completions are comparable
+    for key in ("completion_tokens", "model_calls", "tool_calls"):
+        assert sync_info["usage"]["total"][key] == async_info["usage"]["total"][key]
+
+
+def test_round_trip_through_dict(make_society):
+    _, _, token_info = run_society(make_society(*_scripts(), tools=[lookup]), 5)
+
+    restored = TokenAccounting.from_dict(token_info["usage"])
+    assert restored.total == token_info["usage"]["total"]
+    assert (
+        restored.token_counts()["prompt_token_count"]
+        == (token_info["prompt_token_count"])
+    )
@@ -0,0 +1,90 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import json
+
+from owl.utils import (
+    ChromeTraceSink,
+    InMemorySink,
+    JSONLSink,
+    Tracer,
+    benchmark_society,
+    run_society,
+)
+
+
+def lookup(query: str) -> str:
+    r"""Look up a query.
+
+    Args:
+        query (str): The query.
+
+    Returns:
+        str: The entry.
+    """
+    return f"entry of {query}"
+
+
+def _scripts():
+    return (
+        ["Instruction: look up a.", "TASK_DONE"],
+        [
+            {
+                "content": "",
+                "tool_calls": [{"name": "lookup", "arguments": {"query": "a"}}],
+            },
+            "Solution: <final_answer>a</final_answer>",
+        ],
+    )
+
+
+def test_society_spans(make_society):
+    sink = InMemorySink()
+    tracer = Tracer([sink])
+    run_society(make_society(*_scripts(), tools=[lookup], tracer=tracer), 5)
+
+    categories = {span.category for span in sink.spans}
+    assert {"round", "llm", "tool", "orchestration"} <= categories
+    rounds = [span for span in sink.spans if span.category == "round"]
+    assert [span.attrs["round_idx"] for span in rounds] == [0, 1]
+    assert [s.name for s in sink.spans if s.category == "tool"] == ["lookup"]
+    assert all(span.duration >= 0 for span in sink.spans)
+    assert set(sink.totals()) == categories
+
+
+def test_file_sinks(tmp_path):
+    jsonl_path, chrome_path = tmp_path / "spans.jsonl", tmp_path / "trace.json"
+    tracer = Tracer([JSONLSink(jsonl_path), ChromeTraceSink(chrome_path)])
+    with tracer.span("outer", "round", round_idx=0) as attrs:
+        attrs["extra"] = 1
+    tracer.close()
+
+    (line,) = jsonl_path.read_text(encoding="utf-8").splitlines()
+    assert json.loads(line)["attrs"] == {"round_idx": 0, "extra": 1}
+    (event,) = json.loads(chrome_path.read_text(encoding="utf-8"))["traceEvents"]
+    assert (event["name"], event["cat"], event["ph"]) == ("outer", "round", "X")
+
+
+def test_benchmark_society_subtracts_model_time(make_society):
+    summary = benchmark_society(
+        lambda: make_society(*_scripts(), tools=[lookup], latency=0.01),
+        round_limit=5,
+        repeat=2,
+    )
+
+    assert len(summary["runs"]) == 2
+    assert summary["rounds"] == 2
+    assert summary["model_seconds"] >= 0.05
+    assert summary["wall_seconds"] >= summary["model_seconds"]
+    assert 0 <= summary["overhead_per_round_seconds"] < summary["wall_seconds"]